@@ -1,7 +1,14 @@
 # api/main.py
+import json
+import os
 import time
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, List
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 
 from src.schemas import (
     FuncionSaludInput,
@@ -14,22 +21,121 @@ from src.schemas import (
     FuncionAlmacenInput
 )
 from src.model_loader import (
-    predict_salud_with_confidence,
-    predict_encuentro_with_confidence,
-    predict_hospedaje_with_confidence,
-    predict_educacion_with_confidence,
-    predict_industrial_with_confidence,
-    predict_oficinas_with_confidence,
-    predict_comercio_with_confidence,
-    predict_almacen_with_confidence
-) 
+    predict_with_version,
+    predict_batch_with_version,
+    recargar_modelo,
+    cargar_modelo,
+    predict_matrix_indices,
+    clases_modelo,
+    cache_stats,
+    estado_modelos
+)
+from src.model_registry import ModeloNoDisponible, FuncionNoHabilitada
+from src.config import (
+    MICROBATCH_ACTIVO, MICROBATCH_ESPERA_MS, MICROBATCH_MAX_ITEMS, STREAM_LOTE, PERFIL_TOKEN, CALENTAR
+)
+from src.coalescer import MicroBatcher
+from src.ndjson_stream import MEDIA_TYPE as NDJSON, RespuestaNDJSON, clasificar_stream
+from src.matrix_protocol import MEDIA_TYPE as BINARIO, MatrizInvalida, decodificar, codificar_respuesta
+from src.feature_spec import CODIFICADORES
+from src.arrow_io import (
+    MEDIA_TYPE as ARROW, ArrowInvalido, ArrowNoDisponible, RutaBatchArrow, leer_columnas, escribir_resultados
+)
+from src.schemas import ESQUEMAS
+from src.batch_validation import VALIDADORES, detalle_errores
+from src.process_memory import reporte_memoria
+from src.profiler import PERFILADOR, PerfilHTTP, SesionInvalida
+from src.slow_log import LENTAS, LentasHTTP
+from src.warmup import CALENTAMIENTO
+from src.metrics import CONTENT_TYPE as PROMETHEUS, METRICAS, MetricasHTTP, RutaMedida, etapa, medicion_actual
+
+
+@asynccontextmanager
+async def _ciclo_de_vida(app: FastAPI):
+    # El puerto abre enseguida (/health/live); /health/ready espera al calentamiento.
+    # Bajo src/prefork.py el maestro ya calentó: el worker nace listo.
+    if CALENTAR and not CALENTAMIENTO.listo:
+        CALENTAMIENTO.iniciar_en_segundo_plano()
+    else:
+        CALENTAMIENTO.marcar_listo()
+    yield
 
 
 app = FastAPI(
     title="ML Matriz de Riesgos - Clasificación de Funciones",
     description="Devuelve subfunción, confianza (%) y tiempo de predicción (ms)",
-    version="1.2"
+    version="1.2",
+    lifespan=_ciclo_de_vida
 )
+# Métricas (GET /metrics): las rutas declaradas desde aquí marcan inicio y fin
+# del endpoint; el middleware mide la petición completa. LentasHTTP va por
+# dentro (usa esa medición) y RutaBatchArrow por fuera, para que /batch con
+# Arrow cuente como tipo "arrow".
+app.router.route_class = RutaMedida
+app.add_middleware(LentasHTTP)
+app.add_middleware(MetricasHTTP, funciones=ESQUEMAS)
+app.add_middleware(PerfilHTTP, token=PERFIL_TOKEN)
+app.add_middleware(RutaBatchArrow)
+
+# === Salud: vivo / listo ===
+# El balanceador debe enviar tráfico solo cuando /health/ready responde 200.
+@app.get("/health/live")
+def health_live():
+    """El proceso atiende peticiones (no dice nada de los modelos)."""
+    return {"estado": "vivo"}
+
+@app.get("/health/ready")
+def health_ready():
+    """200 cuando terminó el calentamiento (src/warmup.py); 503 mientras tanto."""
+    return JSONResponse(status_code=200 if CALENTAMIENTO.listo else 503, content=CALENTAMIENTO.informe())
+
+# === Modelos no disponibles ===
+@app.exception_handler(FuncionNoHabilitada)
+def funcion_no_habilitada(request: Request, exc: FuncionNoHabilitada):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+@app.exception_handler(ModeloNoDisponible)
+def modelo_no_disponible(request: Request, exc: ModeloNoDisponible):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+# === Micro-batching (opcional, ML_MICROBATCH=1) ===
+FUNCIONES = ["salud", "encuentro", "hospedaje", "educacion", "industrial", "oficinas", "comercio", "almacen"]
+
+def _lote_con_version(funcion: str, datos: list) -> list:
+    resultados, version = predict_batch_with_version(funcion, datos)
+    return [(resultado, confianza, version) for resultado, confianza in resultados]
+
+BATCHERS = {}
+if MICROBATCH_ACTIVO:
+    BATCHERS = {
+        funcion: MicroBatcher(partial(_lote_con_version, funcion), MICROBATCH_ESPERA_MS, MICROBATCH_MAX_ITEMS)
+        for funcion in FUNCIONES
+    }
+
+async def _predecir(funcion: str, datos):
+    """
+    Predicción individual: vía coalescedor si está activo, si no en el pool de hilos.
+    Devuelve (subfunción, confianza, versión del modelo).
+    """
+    batcher = BATCHERS.get(funcion)
+    if batcher is not None:
+        # El lote corre fuera del contexto de la petición: su tiempo (cola,
+        # codificación y modelo compartidos) va como una sola etapa.
+        inicio = time.perf_counter_ns()
+        resultado = await batcher.predecir(datos)
+        medicion = medicion_actual()
+        if medicion is not None:
+            medicion.sumar("microbatch", time.perf_counter_ns() - inicio)
+            medicion.version = resultado[2]
+        return resultado
+    return await run_in_threadpool(predict_with_version, funcion, datos)
+
+def _con_tiempos(respuesta: dict) -> dict:
+    """Agrega "tiempos_ns" (desglose por etapa) si la petición trae X-Detalle-Tiempos."""
+    medicion = medicion_actual()
+    if medicion is not None and medicion.detalle:
+        respuesta["tiempos_ns"] = medicion.desglose(time.perf_counter_ns())
+    return respuesta
 
 @app.get("/", response_class=HTMLResponse)
 def home():
@@ -45,7 +151,7 @@ def home():
     """
 
 @app.post("/funcion-salud")
-def clasificar_funcion_salud(entrada: FuncionSaludInput):
+async def clasificar_funcion_salud(entrada: FuncionSaludInput):
     """
     Recibe datos del establecimiento y devuelve:
     - Subfunción de salud
@@ -54,97 +160,367 @@ def clasificar_funcion_salud(entrada: FuncionSaludInput):
     """
     # Medir tiempo de predicción
     start_time = time.perf_counter()
-    resultado, confianza = predict_salud_with_confidence(entrada.dict())
+    resultado, confianza, version = await _predecir("salud", entrada)
     end_time = time.perf_counter()
     
     tiempo_s = round(end_time - start_time, 4) # Convertir a milisegundos
 
-    return {
+    return _con_tiempos({
         "subfuncion_salud": resultado,
         "confianza": round(confianza * 100),
+        "version_modelo": version,
         "tiempo_s": tiempo_s
-    }
+    })
 
 # === Endpoint ENCUENTRO ===
 @app.post("/funcion-encuentro")
-def clasificar_encuentro(entrada: FuncionEncuentroInput):
+async def clasificar_encuentro(entrada: FuncionEncuentroInput):
     start = time.perf_counter()
-    resultado, confianza = predict_encuentro_with_confidence(entrada.dict())
+    resultado, confianza, version = await _predecir("encuentro", entrada)
     tiempo_s = round(time.perf_counter() - start, 4)
-    return {
+    return _con_tiempos({
         "subfuncion_encuentro": resultado,
         "confianza": round(confianza * 100),
+        "version_modelo": version,
         "tiempo_s": tiempo_s
-    }
+    })
 
 # === Endpoint HOSPEDAJE ===
 @app.post("/funcion-hospedaje")
-def clasificar_hospedaje(entrada: FuncionHospedajeInput):
+async def clasificar_hospedaje(entrada: FuncionHospedajeInput):
     start = time.perf_counter()
-    resultado, confianza = predict_hospedaje_with_confidence(entrada.dict())
+    resultado, confianza, version = await _predecir("hospedaje", entrada)
     tiempo_s = round(time.perf_counter() - start, 4)
-    return {
+    return _con_tiempos({
         "subfuncion_hospedaje": resultado,
         "confianza": round(confianza * 100),
+        "version_modelo": version,
         "tiempo_s": tiempo_s
-    }
+    })
 
 # === Endpoint EDUCACION ===
 @app.post("/funcion-educacion")
-def clasificar_educacion(entrada: FuncionEducacionInput):
+async def clasificar_educacion(entrada: FuncionEducacionInput):
     start = time.perf_counter()
-    resultado, confianza = predict_educacion_with_confidence(entrada.dict())
+    resultado, confianza, version = await _predecir("educacion", entrada)
     tiempo_s = round(time.perf_counter() - start, 4)
-    return {
+    return _con_tiempos({
         "subfuncion_educacion": resultado,
         "confianza": round(confianza * 100),
+        "version_modelo": version,
         "tiempo_s": tiempo_s
-    }
+    })
 
 # === Endpoint INDUSTRIAL ===
 @app.post("/funcion-industrial")
-def clasificar_industrial(entrada: FuncionIndustrialInput):
+async def clasificar_industrial(entrada: FuncionIndustrialInput):
     start = time.perf_counter()
-    resultado, confianza = predict_industrial_with_confidence(entrada.dict())
+    resultado, confianza, version = await _predecir("industrial", entrada)
     tiempo_s = round(time.perf_counter() - start, 4)
-    return {
+    return _con_tiempos({
         "subfuncion_industrial": resultado,
         "confianza": round(confianza * 100),
+        "version_modelo": version,
         "tiempo_s": tiempo_s
-    }
+    })
 
 # === Endpoint OFICINAS ADMINISTRATIVAS ===
 @app.post("/funcion-oficinas")
-def clasificar_oficinas(entrada: FuncionOficinasInput):
+async def clasificar_oficinas(entrada: FuncionOficinasInput):
     start = time.perf_counter()
-    resultado, confianza = predict_oficinas_with_confidence(entrada.dict())
+    resultado, confianza, version = await _predecir("oficinas", entrada)
     tiempo_s = round(time.perf_counter() - start, 4)
-    return {
+    return _con_tiempos({
         "subfuncion_oficinas": resultado,
         "confianza": round(confianza * 100),
+        "version_modelo": version,
         "tiempo_s": tiempo_s
-    }
+    })
 
 # === Endpoint COMERCIO ===
 @app.post("/funcion-comercio")
-def clasificar_comercio(entrada: FuncionComercioInput):
+async def clasificar_comercio(entrada: FuncionComercioInput):
     start = time.perf_counter()
-    resultado, confianza = predict_comercio_with_confidence(entrada.dict())
+    resultado, confianza, version = await _predecir("comercio", entrada)
     tiempo_s = round(time.perf_counter() - start, 4)
-    return {
+    return _con_tiempos({
         "subfuncion_comercio": resultado,
         "confianza": round(confianza * 100),
+        "version_modelo": version,
         "tiempo_s": tiempo_s
-    }
+    })
 
 # === Endpoint ALMACEN ===
 @app.post("/funcion-almacen")
-def clasificar_almacen(entrada: FuncionAlmacenInput):
+async def clasificar_almacen(entrada: FuncionAlmacenInput):
     start = time.perf_counter()
-    resultado, confianza = predict_almacen_with_confidence(entrada.dict())
+    resultado, confianza, version = await _predecir("almacen", entrada)
     tiempo_s = round(time.perf_counter() - start, 4)
-    return {
+    return _con_tiempos({
         "subfuncion_almacen": resultado,
         "confianza": round(confianza * 100),
+        "version_modelo": version,
         "tiempo_s": tiempo_s
-    }
\ No newline at end of file
+    })
+
+
+# === Endpoints POR LOTES ===
+# Cada endpoint /batch recibe una lista de registros, los codifica en una sola
+# matriz y hace una única llamada a predict_proba por modelo. Los registros se
+# validan por columnas (src/batch_validation.py), sin un BaseModel por
+# registro; los errores salen en el mismo 422 de FastAPI, con índice y campo.
+def _doc_lote(esquema) -> dict:
+    # La documentación OpenAPI sigue mostrando List[Funcion*Input]
+    return {"requestBody": {"content": {"application/json": {"schema": {
+        "type": "array", "items": {"$ref": f"#/components/schemas/{esquema.__name__}"}
+    }}}}}
+
+def _validar_lote(funcion: str, entradas: List[Any]) -> dict:
+    # Corre dentro del endpoint: se suma a la etapa "validacion" de la petición
+    with etapa("validacion"):
+        columnas, _, errores = VALIDADORES[funcion].validar(entradas)
+    if errores:
+        raise RequestValidationError(detalle_errores(errores, ("body",)))
+    return columnas
+
+def _respuesta_batch(clave: str, resultados, version: str, start: float) -> dict:
+    tiempo_s = round(time.perf_counter() - start, 4)
+    return {
+        "resultados": [
+            {clave: resultado, "confianza": round(confianza * 100)}
+            for resultado, confianza in resultados
+        ],
+        "version_modelo": version,
+        "tiempo_s": tiempo_s
+    }
+
+@app.post("/funcion-salud/batch", openapi_extra=_doc_lote(FuncionSaludInput))
+def clasificar_salud_batch(entradas: List[Any]):
+    start = time.perf_counter()
+    resultados, version = predict_batch_with_version("salud", _validar_lote("salud", entradas))
+    return _respuesta_batch("subfuncion_salud", resultados, version, start)
+
+@app.post("/funcion-encuentro/batch", openapi_extra=_doc_lote(FuncionEncuentroInput))
+def clasificar_encuentro_batch(entradas: List[Any]):
+    start = time.perf_counter()
+    resultados, version = predict_batch_with_version("encuentro", _validar_lote("encuentro", entradas))
+    return _respuesta_batch("subfuncion_encuentro", resultados, version, start)
+
+@app.post("/funcion-hospedaje/batch", openapi_extra=_doc_lote(FuncionHospedajeInput))
+def clasificar_hospedaje_batch(entradas: List[Any]):
+    start = time.perf_counter()
+    resultados, version = predict_batch_with_version("hospedaje", _validar_lote("hospedaje", entradas))
+    return _respuesta_batch("subfuncion_hospedaje", resultados, version, start)
+
+@app.post("/funcion-educacion/batch", openapi_extra=_doc_lote(FuncionEducacionInput))
+def clasificar_educacion_batch(entradas: List[Any]):
+    start = time.perf_counter()
+    resultados, version = predict_batch_with_version("educacion", _validar_lote("educacion", entradas))
+    return _respuesta_batch("subfuncion_educacion", resultados, version, start)
+
+@app.post("/funcion-industrial/batch", openapi_extra=_doc_lote(FuncionIndustrialInput))
+def clasificar_industrial_batch(entradas: List[Any]):
+    start = time.perf_counter()
+    resultados, version = predict_batch_with_version("industrial", _validar_lote("industrial", entradas))
+    return _respuesta_batch("subfuncion_industrial", resultados, version, start)
+
+@app.post("/funcion-oficinas/batch", openapi_extra=_doc_lote(FuncionOficinasInput))
+def clasificar_oficinas_batch(entradas: List[Any]):
+    start = time.perf_counter()
+    resultados, version = predict_batch_with_version("oficinas", _validar_lote("oficinas", entradas))
+    return _respuesta_batch("subfuncion_oficinas", resultados, version, start)
+
+@app.post("/funcion-comercio/batch", openapi_extra=_doc_lote(FuncionComercioInput))
+def clasificar_comercio_batch(entradas: List[Any]):
+    start = time.perf_counter()
+    resultados, version = predict_batch_with_version("comercio", _validar_lote("comercio", entradas))
+    return _respuesta_batch("subfuncion_comercio", resultados, version, start)
+
+@app.post("/funcion-almacen/batch", openapi_extra=_doc_lote(FuncionAlmacenInput))
+def clasificar_almacen_batch(entradas: List[Any]):
+    start = time.perf_counter()
+    resultados, version = predict_batch_with_version("almacen", _validar_lote("almacen", entradas))
+    return _respuesta_batch("subfuncion_almacen", resultados, version, start)
+
+
+# === Endpoint STREAMING NDJSON (cualquier función) ===
+@app.post("/funcion-{funcion}/stream", response_class=RespuestaNDJSON)
+async def clasificar_stream_ndjson(funcion: str, request: Request):
+    """
+    Cuerpo application/x-ndjson (un registro por línea, puede llegar por
+    trozos) → una línea de resultado por registro, enviada apenas se calcula.
+    Ver src/ndjson_stream.py.
+    """
+    # Función desconocida o modelo caído: 404/503 antes de empezar el stream
+    await run_in_threadpool(cargar_modelo, funcion)
+    return RespuestaNDJSON(
+        clasificar_stream(funcion, request.stream(), predict_batch_with_version, STREAM_LOTE),
+        media_type=NDJSON
+    )
+
+
+# === Endpoint POR LOTES en formato ARROW ===
+# POST /funcion-{funcion}/batch con Content-Type application/vnd.apache.arrow.stream
+# llega aquí (ver src/arrow_io.py); también se puede llamar directamente.
+def _batch_arrow(funcion: str, cuerpo: bytes) -> tuple:
+    # Lectura y validación de las columnas contra el esquema, como en /batch
+    with etapa("validacion"):
+        columnas = leer_columnas(cuerpo, ESQUEMAS[funcion])
+    t0 = time.perf_counter_ns()
+    X = CODIFICADORES[funcion].lote(columnas)
+    indices, confianzas, clases, version = predict_matrix_indices(funcion, X, time.perf_counter_ns() - t0)
+    return escribir_resultados(indices, confianzas, clases, version), version
+
+@app.post("/funcion-{funcion}/batch/arrow")
+async def clasificar_batch_arrow(funcion: str, request: Request):
+    await run_in_threadpool(cargar_modelo, funcion)
+    cuerpo = await request.body()
+    start = time.perf_counter()
+    try:
+        salida, version = await run_in_threadpool(_batch_arrow, funcion, cuerpo)
+    except ArrowNoDisponible as exc:
+        raise HTTPException(status_code=415, detail=str(exc))
+    except ArrowInvalido as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return Response(
+        salida,
+        media_type=ARROW,
+        headers={"X-Version-Modelo": version, "X-Tiempo-S": f"{time.perf_counter() - start:.4f}"}
+    )
+
+
+# === Endpoints MATRIZ BINARIA (features ya codificadas) ===
+# Cuerpo .npy o crudo float32 con cabecera MTZ1; respuesta binaria con
+# confianzas e índices de clase. Ver src/matrix_protocol.py.
+@app.get("/funcion-{funcion}/matriz")
+def describir_matriz(funcion: str):
+    """Orden de las columnas que espera POST /funcion-{funcion}/matriz y clases de la respuesta."""
+    clases, version = clases_modelo(funcion)
+    return {
+        "columnas": CODIFICADORES[funcion].salida,
+        "dtype": "float32",
+        "clases": clases,
+        "version_modelo": version
+    }
+
+@app.post("/funcion-{funcion}/matriz")
+async def clasificar_matriz(funcion: str, request: Request):
+    await run_in_threadpool(cargar_modelo, funcion)  # 404/503 antes de leer el cuerpo
+    cuerpo = await request.body()
+    try:
+        X = decodificar(cuerpo, CODIFICADORES[funcion].n_features)
+    except MatrizInvalida as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    start = time.perf_counter()
+    indices, confianzas, clases, version = await run_in_threadpool(predict_matrix_indices, funcion, X)
+    return Response(
+        codificar_respuesta(indices, confianzas),
+        media_type=BINARIO,
+        headers={
+            "X-Clases": json.dumps(clases),
+            "X-Version-Modelo": version,
+            "X-Tiempo-S": f"{time.perf_counter() - start:.4f}"
+        }
+    )
+
+
+# === Estadísticas del micro-batching ===
+@app.get("/microbatch/stats")
+def microbatch_stats():
+    """Histogramas de tamaño de lote y espera en cola por función."""
+    return {
+        "activo": MICROBATCH_ACTIVO,
+        "espera_ms": MICROBATCH_ESPERA_MS,
+        "max_items": MICROBATCH_MAX_ITEMS,
+        "funciones": {funcion: batcher.stats() for funcion, batcher in BATCHERS.items()}
+    }
+
+
+# === Estadísticas de la caché de predicciones ===
+@app.get("/cache/stats")
+def estadisticas_cache():
+    """Aciertos, fallos y expulsiones de la caché LRU de cada modelo."""
+    return cache_stats()
+
+
+# === Estado de los modelos ===
+@app.get("/modelos")
+def modelos():
+    """Funciones habilitadas, modelos cargados, versión (hash), tiempo de carga y memoria de cada uno."""
+    return estado_modelos()
+
+@app.post("/modelos/{funcion}/recargar")
+def recargar(funcion: str):
+    """Recarga el artefacto de una función sin reiniciar; si falla sigue el modelo anterior."""
+    return recargar_modelo(funcion)
+
+
+# === Memoria por proceso ===
+@app.get("/memoria")
+def memoria():
+    """RSS/PSS/USS de este worker y, bajo src/prefork.py, de todos los workers."""
+    maestro = os.getenv("ML_PREFORK_MAESTRO")
+    return reporte_memoria(int(maestro) if maestro else None)
+
+
+# === Métricas Prometheus ===
+@app.get("/metrics")
+def metrics():
+    """Peticiones, errores y latencias por etapa; caché y carga de modelos (ver src/metrics.py)."""
+    microbatch = {funcion: batcher.histogramas() for funcion, batcher in BATCHERS.items()}
+    return Response(METRICAS.exponer(cache_stats(), estado_modelos(), microbatch), media_type=PROMETHEUS)
+
+
+# === Perfilado por muestreo (ver src/profiler.py) ===
+def _verificar_token(request: Request) -> None:
+    if PERFIL_TOKEN and request.headers.get("x-token-admin") != PERFIL_TOKEN:
+        raise HTTPException(status_code=403, detail="X-Token-Admin inválido")
+
+@app.get("/perfil")
+def perfil_estado(request: Request):
+    """Sesión de perfilado activa (si hay) y perfiles escritos por este worker."""
+    _verificar_token(request)
+    return PERFILADOR.estado()
+
+@app.post("/perfil/iniciar")
+def perfil_iniciar(request: Request, fraccion: float = 0.01, funciones: str = "",
+                   intervalo_ms: float = 5.0, duracion_s: float = 60.0):
+    """
+    Perfila una fracción de las peticiones a las funciones dadas (separadas
+    por comas; vacío = todas) durante `duracion_s` o hasta /perfil/detener.
+    """
+    _verificar_token(request)
+    elegidas = [f.strip() for f in funciones.split(",") if f.strip()] or FUNCIONES
+    desconocidas = [f for f in elegidas if f not in ESQUEMAS]
+    if desconocidas:
+        raise HTTPException(status_code=400, detail=f"Funciones desconocidas: {desconocidas}")
+    try:
+        return PERFILADOR.iniciar(fraccion, elegidas, intervalo_ms, duracion_s)
+    except SesionInvalida as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.post("/perfil/detener")
+def perfil_detener(request: Request):
+    """Termina la sesión y escribe el perfil (pilas colapsadas) en ML_PERFIL_DIR."""
+    _verificar_token(request)
+    try:
+        return PERFILADOR.detener()
+    except SesionInvalida as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
+# === Peticiones lentas (ver src/slow_log.py) ===
+@app.get("/lentas")
+def lentas(request: Request):
+    """Peticiones que superaron ML_LENTAS_UMBRAL_MS: cuerpo, matriz codificada, versión y tiempos."""
+    _verificar_token(request)
+    return LENTAS.volcar()
+
+@app.delete("/lentas")
+def limpiar_lentas(request: Request):
+    """Vacía el buffer en memoria (el archivo ML_LENTAS_ARCHIVO no se toca)."""
+    _verificar_token(request)
+    LENTAS.limpiar()
+    return {"ok": True}
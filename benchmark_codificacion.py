@@ -0,0 +1,42 @@
+# benchmark_codificacion.py
+# Costo de codificar un registro (µs), antes y después de los codificadores
+# compilados de src/feature_spec.py, para cada función:
+#   antes     -> preprocess_<funcion>(entrada.dict()) de preprocesamiento_original.py:
+#                el camino anterior de la API (copia a dict y mapas armados en cada llamada)
+#   dict      -> fila(entrada.dict()): codificador compilado sobre una copia a dict
+#   atributos -> fila(entrada): lee los campos directamente del modelo pydantic (camino actual)
+#   lote      -> lote(entradas) / n, con n = 10 000
+# Uso: python benchmark_codificacion.py
+import time
+import warnings
+
+import preprocesamiento_original
+from src.feature_spec import CODIFICADORES
+from src.sample_payloads import generar_modelos
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+N_FILA = 5_000
+N_LOTE = 10_000
+
+def _por_registro(funcion, registros) -> float:
+    inicio = time.perf_counter()
+    for registro in registros:
+        funcion(registro)
+    return (time.perf_counter() - inicio) / len(registros) * 1e6
+
+print(f"{'función':<11} {'antes':>8} {'dict':>8} {'atributos':>10} {'lote':>8}   (µs por registro)")
+for nombre, codificador in CODIFICADORES.items():
+    entradas = generar_modelos(nombre, N_LOTE)
+    muestra = entradas[:N_FILA]
+    codificador.fila(muestra[0])  # memo y caches en caliente
+    original = getattr(preprocesamiento_original, f"preprocess_{nombre}")
+
+    t_antes = _por_registro(lambda e: original(e.dict()), muestra)
+    t_dict = _por_registro(lambda e: codificador.fila(e.dict()), muestra)
+    t_atributos = _por_registro(codificador.fila, muestra)
+    inicio = time.perf_counter()
+    codificador.lote(entradas)
+    t_lote = (time.perf_counter() - inicio) / N_LOTE * 1e6
+
+    print(f"{nombre:<11} {t_antes:8.2f} {t_dict:8.2f} {t_atributos:10.2f} {t_lote:8.2f}")
@@ -0,0 +1,222 @@
+# benchmark_servicio.py
+# Benchmarks del camino de servicio completo, por función y tamaño de lote.
+#
+# Etapas, para cada función y cada tamaño de lote (por defecto 1, 16, 256, 4096):
+#   preprocess     lote 1: preprocess_<funcion>(registro); lotes mayores: la
+#                  codificación de /batch (columnas validadas -> matriz)
+#   predict_proba  predict_proba(X) del modelo cargado (backend según ML_BACKEND)
+#   api            POST en proceso a la app FastAPI (httpx + ASGITransport, sin
+#                  red): /funcion-<f> con lote 1, /funcion-<f>/batch con más
+#
+# Por celda informa latencia p50/p95/p99 por llamada (ms) y throughput
+# (registros/s). Los registros siguen las distribuciones de entrenar_*.py
+# (src/sample_payloads.generar_entrenamiento); cada llamada usa un lote
+# distinto mientras alcancen los registros generados.
+#
+# La caché LRU y las tablas precalculadas se desactivan para toda la corrida
+# (ML_CACHE_CAPACIDAD=0, ML_TABLAS=0): así `api` recorre el mismo camino de
+# predicción que `predict_proba` y las etapas se pueden comparar. El efecto de
+# la caché con tráfico repetido se mide con prueba_carga.py.
+#
+# El resultado se escribe en JSON con metadatos del entorno (commit, versiones,
+# configuración ML_*, versión de cada modelo) para comparar entre commits:
+#   python benchmark_servicio.py --salida base.json
+#   python benchmark_servicio.py --salida nuevo.json --comparar base.json
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import time
+import warnings
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version as version_paquete
+from typing import Callable, Dict, List
+
+import numpy as np
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+# Antes de importar la app: src.config lee el entorno al importarse
+os.environ["ML_CACHE_CAPACIDAD"] = "0"
+os.environ["ML_TABLAS"] = "0"
+
+import httpx
+
+from api.main import app
+from src import config, model_loader
+from src.batch_validation import VALIDADORES
+from src.sample_payloads import generar_entrenamiento
+
+FUNCIONES = list(model_loader.RUTAS_MODELOS)
+ETAPAS = ["preprocess", "predict_proba", "api"]
+LOTES = [1, 16, 256, 4096]
+PAQUETES = ["numpy", "pandas", "scikit-learn", "fastapi", "starlette", "pydantic", "httpx"]
+
+# Lotes distintos por celda como mínimo; con lotes chicos hay uno por llamada
+VARIANTES = 8
+
+
+# === Entorno ===
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def _version(paquete: str) -> str:
+    try:
+        return version_paquete(paquete)
+    except PackageNotFoundError:
+        return None
+
+def metadatos(funciones: List[str]) -> Dict:
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git("rev-parse", "HEAD") or None,
+        "cambios_sin_commit": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "paquetes": {p: _version(p) for p in PAQUETES},
+        "config": {
+            "backend": config.BACKEND,
+            "tablas": config.TABLAS_ACTIVAS,
+            "cache_capacidad": config.CACHE_CAPACIDAD,
+            "microbatch": config.MICROBATCH_ACTIVO,
+            "artefacto": config.FORMATO_ARTEFACTO
+        },
+        "modelos": {f: model_loader.REGISTRY.obtener(f).version for f in funciones}
+    }
+
+
+# === Medición ===
+def _percentil(muestras: np.ndarray, q: float) -> float:
+    return float(np.percentile(muestras, q))
+
+def medir(llamada: Callable[[int], object], tamaño: int, segundos: float, minimo: int) -> Dict:
+    """
+    Repite `llamada(i)` (i = número de repetición) hasta cumplir `segundos`
+    y al menos `minimo` repeticiones; las 3 primeras son de calentamiento.
+    """
+    for i in range(3):
+        llamada(i)
+    tiempos = []
+    inicio = time.perf_counter()
+    while len(tiempos) < minimo or time.perf_counter() - inicio < segundos:
+        t = time.perf_counter()
+        llamada(len(tiempos))
+        tiempos.append(time.perf_counter() - t)
+    ms = np.array(tiempos) * 1000
+    return {
+        "repeticiones": len(tiempos),
+        "p50_ms": _percentil(ms, 50),
+        "p95_ms": _percentil(ms, 95),
+        "p99_ms": _percentil(ms, 99),
+        "media_ms": float(ms.mean()),
+        "registros_por_s": tamaño * len(tiempos) / float(np.sum(tiempos))
+    }
+
+
+def _celdas(funcion: str, registros: List[Dict], tamaño: int, cliente: httpx.AsyncClient,
+            loop: asyncio.AbstractEventLoop) -> Dict[str, Callable[[int], object]]:
+    """Llamada de cada etapa para este tamaño de lote; todo lo demás se prepara antes."""
+    variantes = max(VARIANTES, len(registros) // tamaño)
+    paso = max(1, (len(registros) - tamaño) // variantes)
+    lotes = [registros[k * paso:k * paso + tamaño] for k in range(variantes)]
+    predictor = model_loader.REGISTRY.obtener(funcion).predictor
+
+    if tamaño == 1:
+        preprocess = getattr(model_loader, f"preprocess_{funcion}")
+        modelos = [VALIDADORES[funcion].esquema.model_validate(lote[0]) for lote in lotes]
+        matrices = [preprocess(m) for m in modelos]
+        codificar = lambda i: preprocess(modelos[i % variantes])
+        ruta = f"/funcion-{funcion}"
+        cuerpos = [json.dumps(lote[0]).encode() for lote in lotes]
+    else:
+        columnas = [VALIDADORES[funcion].validar(lote)[0] for lote in lotes]
+        matrices = [model_loader._encode_batch(funcion, c) for c in columnas]
+        codificar = lambda i: model_loader._encode_batch(funcion, columnas[i % variantes])
+        ruta = f"/funcion-{funcion}/batch"
+        cuerpos = [json.dumps(lote).encode() for lote in lotes]
+
+    def api(i: int):
+        respuesta = loop.run_until_complete(cliente.post(
+            ruta, content=cuerpos[i % variantes], headers={"content-type": "application/json"}
+        ))
+        if respuesta.status_code != 200:
+            raise RuntimeError(f"{ruta}: HTTP {respuesta.status_code} {respuesta.text[:200]}")
+
+    return {
+        "preprocess": codificar,
+        "predict_proba": lambda i: predictor.predict_proba(matrices[i % variantes]),
+        "api": api
+    }
+
+
+def ejecutar(funciones: List[str], lotes: List[int], segundos: float, minimo: int, semilla: int) -> Dict:
+    loop = asyncio.new_event_loop()
+    cliente = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    resultados = []
+    try:
+        for funcion in funciones:
+            registros = generar_entrenamiento(funcion, max(lotes) * 2, semilla)
+            for tamaño in lotes:
+                for etapa, llamada in _celdas(funcion, registros, tamaño, cliente, loop).items():
+                    celda = {"funcion": funcion, "etapa": etapa, "tamaño_lote": tamaño}
+                    celda.update(medir(llamada, tamaño, segundos, minimo))
+                    resultados.append(celda)
+                    print(
+                        f"{funcion:<11} {etapa:<14} {tamaño:>5}  p50 {celda['p50_ms']:9.3f}  "
+                        f"p95 {celda['p95_ms']:9.3f}  p99 {celda['p99_ms']:9.3f} ms  "
+                        f"{celda['registros_por_s']:>12,.0f} reg/s"
+                    )
+    finally:
+        loop.run_until_complete(cliente.aclose())
+        loop.close()
+    return {"metadatos": metadatos(funciones), "resultados": resultados}
+
+
+# === Comparación con una corrida anterior ===
+def comparar(actual: Dict, base: Dict) -> None:
+    clave = lambda r: (r["funcion"], r["etapa"], r["tamaño_lote"])
+    anteriores = {clave(r): r for r in base["resultados"]}
+    print(f"\n🔄 Comparado con {base['metadatos'].get('commit') or '?'} (p50; + es más lento)")
+    for r in actual["resultados"]:
+        b = anteriores.get(clave(r))
+        if b is None:
+            continue
+        cambio = (r["p50_ms"] / b["p50_ms"] - 1) * 100 if b["p50_ms"] > 0 else 0.0
+        marca = "⚠️ " if cambio > 10 else "  "
+        print(
+            f"{marca}{r['funcion']:<11} {r['etapa']:<14} {r['tamaño_lote']:>5}  "
+            f"{b['p50_ms']:9.3f} -> {r['p50_ms']:9.3f} ms  ({cambio:+.1f}%)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks del camino de servicio por función")
+    parser.add_argument("--funciones", nargs="+", default=FUNCIONES, choices=FUNCIONES)
+    parser.add_argument("--lotes", nargs="+", type=int, default=LOTES)
+    parser.add_argument("--segundos", type=float, default=1.0, help="tiempo mínimo por celda")
+    parser.add_argument("--minimo", type=int, default=10, help="repeticiones mínimas por celda")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default="benchmark_servicio.json")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    args = parser.parse_args()
+
+    print(f"🚀 {len(args.funciones)} funciones × {len(ETAPAS)} etapas × lotes {args.lotes}")
+    reporte = ejecutar(args.funciones, args.lotes, args.segundos, args.minimo, args.semilla)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+    print(f"✅ Resultados en {args.salida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(reporte, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
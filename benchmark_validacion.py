@@ -0,0 +1,43 @@
+# benchmark_validacion.py
+# Validar y codificar un lote de 100 000 registros (dicts, como llegan del JSON)
+# para cada función, en segundos:
+#   modelos   -> un Funcion*Input por registro (model_validate) y lote(modelos)
+#   columnas  -> ValidadorLote.validar (src/batch_validation.py) y lote(columnas)
+# y, en cada caso, cuánto de eso es solo validación. Al final se comprueba que
+# las dos matrices sean idénticas.
+# Uso: python benchmark_validacion.py
+import time
+import warnings
+
+import numpy as np
+
+from src.batch_validation import VALIDADORES
+from src.feature_spec import CODIFICADORES
+from src.sample_payloads import generar
+from src.schemas import ESQUEMAS
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+N = 100_000
+
+def _medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+print(f"{'función':<11} {'modelos':>16} {'columnas':>16} {'mejora':>7}   (s: validar / total)")
+for nombre, codificador in CODIFICADORES.items():
+    registros = generar(nombre, N)
+    esquema, validador = ESQUEMAS[nombre], VALIDADORES[nombre]
+
+    modelos, v_modelos = _medir(lambda: [esquema.model_validate(r) for r in registros])
+    X_modelos, c_modelos = _medir(lambda: codificador.lote(modelos))
+    (columnas, _, errores), v_columnas = _medir(lambda: validador.validar(registros))
+    X_columnas, c_columnas = _medir(lambda: codificador.lote(columnas))
+
+    assert not errores and np.array_equal(X_modelos, X_columnas), nombre
+    t_modelos, t_columnas = v_modelos + c_modelos, v_columnas + c_columnas
+    print(
+        f"{nombre:<11} {v_modelos:7.2f} / {t_modelos:6.2f} {v_columnas:7.2f} / {t_columnas:6.2f} "
+        f"{t_modelos / t_columnas:6.1f}x"
+    )
@@ -5,12 +5,20 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 
+from src.keyword_matcher import PalabrasClave
+from src.model_manifest import actualizar_manifiesto
+
 np.random.seed(42)
 data = []
 
 # Palabras clave para 8.3 (explosivos/pirotécnicos)
 palabras_8_3 = {"explosivo", "pirotécnico", "municion", "fuegos artificiales", "pólvora"}
 
+# Banderas de palabras clave por campo, en una pasada por texto
+PRODUCTOS = PalabrasClave({"es_8_3": palabras_8_3})
+USO = PalabrasClave({"estacionamiento": ["estacionamiento"]})
+ESTABLECIMIENTO = PalabrasClave({"vehicular": ["vehicular"]})
+
 for _ in range(1500):
     # Generar datos realistas con valores nuevos
     tipo_cobertura = np.random.choice(
@@ -62,7 +70,7 @@ for _ in range(1500):
     )
 
     # === Aplicar reglas NORMATIVAS (en orden de prioridad) ===
-    if almacena_explosivos or any(p in tipo_productos.lower() for p in palabras_8_3):
+    if almacena_explosivos or PRODUCTOS(tipo_productos).es_8_3:
         subfuncion = "8.3"
     elif tipo_cobertura == "No Techado" or porcentaje_techado == "0%":
         subfuncion = "8.1"
@@ -75,7 +83,7 @@ for _ in range(1500):
 
     # === CARACTERÍSTICAS ESCALABLES ===
     # 1. Es 8.3: productos peligrosos
-    es_8_3 = 1 if (almacena_explosivos or any(p in tipo_productos.lower() for p in palabras_8_3)) else 0
+    es_8_3 = 1 if (almacena_explosivos or PRODUCTOS(tipo_productos).es_8_3) else 0
     
     # 2. Es 8.1: no techado
     es_8_1 = 1 if (tipo_cobertura == "No Techado" or porcentaje_techado == "0%") else 0
@@ -120,7 +128,7 @@ for _ in range(1500):
     area_admin_num = area_admin_map.get(area_admin, 30)
     
     # 9. Es estacionamiento
-    es_estacionamiento = 1 if ("estacionamiento" in uso_principal.lower() or "vehicular" in tipo_establecimiento.lower()) else 0
+    es_estacionamiento = 1 if (USO(uso_principal).estacionamiento or ESTABLECIMIENTO(tipo_establecimiento).vehicular) else 0
 
     data.append([
         es_8_3,
@@ -159,4 +167,5 @@ modelo.fit(X, y)
 
 os.makedirs("models", exist_ok=True)
 joblib.dump(modelo, "models/rf_almacen.pkl")
+actualizar_manifiesto("models/rf_almacen.pkl")
 print("✅ Modelo ALMACÉN ESCALABLE guardado en models/rf_almacen.pkl")
\ No newline at end of file
@@ -5,12 +5,21 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 
+from src.keyword_matcher import PalabrasClave
+from src.model_manifest import actualizar_manifiesto
+
 np.random.seed(42)
 data = []
 
 # Palabras clave para 7.6 (explosivos/pirotécnicos)
 palabras_7_6 = {"explosivo", "pirotécnico", "municion", "fuegos artificiales", "pólvora"}
 
+# Banderas de palabras clave por campo, en una pasada por texto
+PRODUCTOS = PalabrasClave({"es_7_6": palabras_7_6})
+ESTABLECIMIENTO = PalabrasClave({"modulo": ["módulo", "stand", "puesto"]})
+USO = PalabrasClave({"es_7_4": ["mixto", "áreas comunes"]})
+MODALIDAD = PalabrasClave({"independiente": ["independiente"], "modulo": ["módulo"]})
+
 for _ in range(1700):
     # Generar datos realistas con valores nuevos
     numero_pisos = np.random.choice(
@@ -97,7 +106,7 @@ for _ in range(1700):
         area_total_num = 15000
     
     # === Aplicar reglas NORMATIVAS (en orden de prioridad) ===
-    if comercializa_explosivos or any(p in tipo_productos.lower() for p in palabras_7_6):
+    if comercializa_explosivos or PRODUCTOS(tipo_productos).es_7_6:
         subfuncion = "7.6"
     elif ("Módulo" in tipo_establecimiento or "Stand" in tipo_establecimiento or "Puesto" in tipo_establecimiento) and tipo_licencia == "Corporativa (galería/mercado)":
         subfuncion = "7.2"
@@ -123,12 +132,12 @@ for _ in range(1700):
     
     # 3. Es 7.2: módulo con licencia corporativa
     es_7_2 = 1 if (
-        ("módulo" in tipo_establecimiento.lower() or "stand" in tipo_establecimiento.lower() or "puesto" in tipo_establecimiento.lower()) and
+        ESTABLECIMIENTO(tipo_establecimiento).modulo and
         tipo_licencia == "Corporativa (galería/mercado)"
     ) else 0
     
     # 4. Es 7.4: uso mixto o áreas comunes
-    es_7_4 = 1 if ("mixto" in uso_edificacion.lower() or "áreas comunes" in uso_edificacion.lower()) else 0
+    es_7_4 = 1 if USO(uso_edificacion).es_7_4 else 0
     
     # 5. Es 7.5: establecimientos comerciales grandes
     es_7_5 = 1 if any(est in tipo_establecimiento for est in [
@@ -137,7 +146,7 @@ for _ in range(1700):
     ]) else 0
     
     # 6. Es 7.6: productos peligrosos
-    es_7_6 = 1 if comercializa_explosivos or any(p in tipo_productos.lower() for p in palabras_7_6) else 0
+    es_7_6 = 1 if comercializa_explosivos or PRODUCTOS(tipo_productos).es_7_6 else 0
     
     # 7. Área total numérica
     area_total_num_final = area_total_num
@@ -154,9 +163,10 @@ for _ in range(1700):
     locales_num = locales_map.get(numero_locales, 1)
     
     # 11. Modalidad operación (0=independiente, 1=módulo, 2=áreas comunes)
-    if "independiente" in modalidad_operacion.lower():
+    modalidad = MODALIDAD(modalidad_operacion)
+    if modalidad.independiente:
         modalidad_num = 0
-    elif "módulo" in modalidad_operacion.lower():
+    elif modalidad.modulo:
         modalidad_num = 1
     else:
         modalidad_num = 2
@@ -200,4 +210,5 @@ modelo.fit(X, y)
 
 os.makedirs("models", exist_ok=True)
 joblib.dump(modelo, "models/rf_comercio.pkl")
+actualizar_manifiesto("models/rf_comercio.pkl")
 print("✅ Modelo COMERCIO ESCALABLE guardado en models/rf_comercio.pkl")
\ No newline at end of file
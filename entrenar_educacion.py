@@ -5,9 +5,15 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 
+from src.keyword_matcher import PalabrasClave
+from src.model_manifest import actualizar_manifiesto
+
 np.random.seed(42)
 data = []
 
+# Edificación remodelada/acondicionada (4.4), en una pasada por texto
+EDIFICACION = PalabrasClave({"remodelada": ["remodelada", "acondicionada"]})
+
 for _ in range(1800):
     # === Generar datos realistas con valores nuevos ===
     nivel_educativo = np.random.choice(
@@ -49,7 +55,7 @@ for _ in range(1800):
     )
 
     # === Aplicar reglas NORMATIVAS para la etiqueta ===
-    if "remodelada" in tipo_edificacion.lower() or "acondicionada" in tipo_edificacion.lower():
+    if EDIFICACION(tipo_edificacion).remodelada:
         subfuncion = "4.4"
     elif num_pisos_real > 3:
         subfuncion = "4.2"
@@ -86,7 +92,7 @@ for _ in range(1800):
     # 6. cap_num: ya es numérico
     # 7. aulas: ya es numérico
     # 8. es_remoldeada: 1 si es remodelada
-    es_remoldeada = 1 if "remodelada" in tipo_edificacion.lower() or "acondicionada" in tipo_edificacion.lower() else 0
+    es_remoldeada = 1 if EDIFICACION(tipo_edificacion).remodelada else 0
 
     # Añadir a datos
     data.append([
@@ -135,4 +141,5 @@ modelo.fit(X, y)
 # === Guardar modelo ===
 os.makedirs("models", exist_ok=True)
 joblib.dump(modelo, "models/rf_educacion.pkl")
+actualizar_manifiesto("models/rf_educacion.pkl")
 print("✅ Modelo EDUCACIÓN ESCALABLE guardado en models/rf_educacion.pkl")
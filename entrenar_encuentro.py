@@ -5,6 +5,8 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 
+from src.model_manifest import actualizar_manifiesto
+
 np.random.seed(42)
 data = []
 
@@ -96,4 +98,5 @@ modelo.fit(X, y)
 
 os.makedirs("models", exist_ok=True)
 joblib.dump(modelo, "models/rf_encuentro.pkl")
+actualizar_manifiesto("models/rf_encuentro.pkl")
 print("✅ Modelo ENCUENTRO escalable guardado.")
\ No newline at end of file
@@ -5,6 +5,8 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 
+from src.model_manifest import actualizar_manifiesto
+
 np.random.seed(42)
 data = []
 
@@ -91,4 +93,5 @@ modelo.fit(X, y)
 
 os.makedirs("models", exist_ok=True)
 joblib.dump(modelo, "models/rf_hospedaje.pkl")
+actualizar_manifiesto("models/rf_hospedaje.pkl")
 print("✅ Modelo HOSPEDAJE guardado en models/rf_hospedaje.pkl")
\ No newline at end of file
@@ -5,6 +5,9 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 
+from src.keyword_matcher import PalabrasClave
+from src.model_manifest import actualizar_manifiesto
+
 np.random.seed(42)
 data = []
 
@@ -14,6 +17,17 @@ palabras_5_3 = {
     "dinamita", "pólvora", "detonador", "cohetes", "artificios"
 }
 
+# Banderas de palabras clave por campo, en una pasada por texto
+PRODUCTO = PalabrasClave({
+    "explosivo_pirotecnico": ["explosivo", "pirotécnico"],
+    "regla_5_3": ["explosivo", "pirotécnico", "municion"],
+    "es_explosivo": ["explosivo", "pirotécnico", "municion", "fuegos"],
+    "artesania": ["artesanía"]
+})
+ESTABLECIMIENTO = PalabrasClave({"explosivo_pirotecnico": ["explosivo", "pirotécnico"], "artesanal": ["artesanal"]})
+PROCESO = PalabrasClave({"artesanal": ["artesanal"], "manual": ["manual"]})
+MAQUINARIA = PalabrasClave({"manual": ["manual"], "herramienta": ["herramienta"]})
+
 for _ in range(1600):
     # Generar datos realistas con valores nuevos
     tipo_proceso = np.random.choice(
@@ -35,9 +49,9 @@ for _ in range(1600):
         p=[0.25, 0.3, 0.1, 0.1, 0.08, 0.07, 0.05, 0.05]
     )
     
+    producto = PRODUCTO(tipo_producto)
     trabaja_materiales_explosivos = (
-        "explosivo" in tipo_producto.lower() or 
-        "pirotécnico" in tipo_producto.lower() or
+        producto.explosivo_pirotecnico or
         np.random.rand() > 0.9
     )
     
@@ -56,9 +70,11 @@ for _ in range(1600):
         p=[0.3, 0.25, 0.25, 0.15, 0.05]
     )
     
+    proceso = PROCESO(tipo_proceso)
+    maquinaria = MAQUINARIA(tipo_maquinaria)
     tiene_area_comercializacion = (
-        "artesanal" in tipo_proceso.lower() or 
-        "manual" in tipo_maquinaria.lower() or
+        proceso.artesanal or
+        maquinaria.manual or
         np.random.rand() > 0.7
     )
     
@@ -66,12 +82,12 @@ for _ in range(1600):
         ["Taller Artesanal", "Taller Industrial", "Planta Industrial", "Fábrica", "Fábrica de Explosivos", "Fábrica de Pirotécnicos", "Centro de fabricación", "Laboratorio de producción"],
         p=[0.25, 0.2, 0.2, 0.15, 0.08, 0.07, 0.03, 0.02]
     )
+    establecimiento = ESTABLECIMIENTO(tipo_establecimiento)
 
     # === Aplicar reglas NORMATIVAS ===
     if (trabaja_materiales_explosivos or 
-        any(palabra in tipo_producto.lower() for palabra in ["explosivo", "pirotécnico", "municion"]) or
-        "explosivo" in tipo_establecimiento.lower() or
-        "pirotécnico" in tipo_establecimiento.lower() or
+        producto.regla_5_3 or
+        establecimiento.explosivo_pirotecnico or
         "Muy Alto" in nivel_peligrosidad):
         subfuncion = "5.3"
     elif ("Manual/Artesanal" in tipo_proceso or 
@@ -89,18 +105,18 @@ for _ in range(1600):
     # === CARACTERÍSTICAS ESCALABLES ===
     # 1. es_artesanal: basado en palabras clave
     es_artesanal = 1 if (
-        "manual" in tipo_proceso.lower() or
-        "herramienta" in tipo_maquinaria.lower() or
-        "artesanal" in tipo_establecimiento.lower() or
-        "artesanía" in tipo_producto.lower()
+        proceso.manual or
+        maquinaria.herramienta or
+        establecimiento.artesanal or
+        producto.artesania
     ) else 0
     
     # 2. es_explosivo: basado en palabras clave
     es_explosivo = 1 if (
         trabaja_materiales_explosivos or
-        any(p in tipo_producto.lower() for p in ["explosivo", "pirotécnico", "municion", "fuegos"]) or
+        producto.es_explosivo or
         "Muy Alto" in nivel_peligrosidad or
-        any(p in tipo_establecimiento.lower() for p in ["explosivo", "pirotécnico"])
+        establecimiento.explosivo_pirotecnico
     ) else 0
     
     # 3. escala_produccion numérica
@@ -165,4 +181,5 @@ modelo.fit(X, y)
 
 os.makedirs("models", exist_ok=True)
 joblib.dump(modelo, "models/rf_industrial.pkl")
+actualizar_manifiesto("models/rf_industrial.pkl")
 print("✅ Modelo INDUSTRIAL ESCALABLE guardado en models/rf_industrial.pkl")
\ No newline at end of file
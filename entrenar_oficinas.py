@@ -6,6 +6,8 @@ import joblib
 import os
 from datetime import datetime
 
+from src.model_manifest import actualizar_manifiesto
+
 np.random.seed(42)
 data = []
 año_actual = 2025  # Ajusta según el año actual
@@ -195,4 +197,5 @@ modelo.fit(X, y)
 
 os.makedirs("models", exist_ok=True)
 joblib.dump(modelo, "models/rf_oficinas.pkl")
+actualizar_manifiesto("models/rf_oficinas.pkl")
 print("✅ Modelo OFICINAS ADMINISTRATIVAS ESCALABLE guardado en models/rf_oficinas.pkl")
\ No newline at end of file
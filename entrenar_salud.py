@@ -5,6 +5,8 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 
+from src.model_manifest import actualizar_manifiesto
+
 np.random.seed(42)
 data = []
 
@@ -145,4 +147,5 @@ modelo.fit(X, y)
 # Guardar modelo
 os.makedirs("models", exist_ok=True)
 joblib.dump(modelo, "models/rf_salud.pkl")
+actualizar_manifiesto("models/rf_salud.pkl")
 print("✅ Modelo escalable guardado. Ahora acepta nuevos tipos de establecimiento.")
\ No newline at end of file
@@ -0,0 +1,77 @@
+# exportar_modelos.py
+# Exporta cada models/rf_*.pkl a un artefacto compacto models/rf_*.npz
+# (ver src/forest_artifact.py) y compara tamaño y tiempo de carga con el .pkl.
+# Uso: python exportar_modelos.py [float64|float32|uint16]
+#   float64 (por defecto): probabilidades idénticas a predict_proba
+#   float32 / uint16: hojas cuantizadas, artefacto más chico
+# El valor por defecto es float64 a propósito: la cuantización de hojas
+# cambia las probabilidades en los últimos decimales y queda como opción.
+import glob
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.forest_artifact import VALORES, exportar_npz, cargar_npz, ruta_npz
+from src.model_manifest import actualizar_manifiesto
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+valores = sys.argv[1] if len(sys.argv) > 1 else "float64"
+if valores not in VALORES:
+    raise SystemExit(f"❌ Formato de valores desconocido: {valores!r} (opciones: {', '.join(VALORES)})")
+
+def _medir(cargar, repeticiones: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        cargar()
+    return (time.perf_counter() - inicio) / repeticiones
+
+todo_ok = True
+total_pkl = total_npz = 0
+for ruta_modelo in sorted(glob.glob(os.path.join("models", "rf_*.pkl"))):
+    funcion = os.path.basename(ruta_modelo)[len("rf_"):-len(".pkl")]
+    modelo = joblib.load(ruta_modelo)
+    ruta_artefacto = ruta_npz(ruta_modelo)
+    exportar_npz(modelo, ruta_artefacto, valores)
+    actualizar_manifiesto(ruta_artefacto)
+
+    tam_pkl = os.path.getsize(ruta_modelo)
+    tam_npz = os.path.getsize(ruta_artefacto)
+    total_pkl += tam_pkl
+    total_npz += tam_npz
+    t_pkl = _medir(lambda: joblib.load(ruta_modelo), 3)
+    t_npz = _medir(lambda: cargar_npz(ruta_artefacto), 50)
+
+    # Coincidencia con el modelo original sobre su dataset de entrenamiento
+    motor = cargar_npz(ruta_artefacto)
+    ruta_dataset = os.path.join("data", "raw", f"dataset_{funcion}.csv")
+    if os.path.exists(ruta_dataset):
+        X = pd.read_csv(ruta_dataset).drop(columns="subfuncion").to_numpy()
+        esperado = modelo.predict_proba(X)
+        obtenido = motor.predict_proba(X)
+        if valores == "float64":
+            ok = np.array_equal(esperado, obtenido)
+            detalle = "idéntico" if ok else "DISTINTO"
+        else:
+            acuerdo = np.mean(np.argmax(esperado, axis=1) == np.argmax(obtenido, axis=1))
+            ok = True
+            detalle = f"clase igual {acuerdo:.2%}, |Δp| máx {np.abs(esperado - obtenido).max():.1e}"
+        todo_ok &= ok
+    else:
+        ok = True
+        detalle = "sin dataset"
+
+    estado = "✅" if ok else "❌"
+    print(
+        f"{estado} {funcion:<11} pkl {tam_pkl / 1024:7.0f} KB → npz {tam_npz / 1024:6.0f} KB | "
+        f"carga: pkl {t_pkl * 1000:6.1f} ms, npz {t_npz * 1000:.2f} ms | {detalle}"
+    )
+
+print(f"📦 Total: pkl {total_pkl / 1e6:.2f} MB → npz ({valores}) {total_npz / 1e6:.2f} MB")
+if not todo_ok:
+    raise SystemExit("❌ Algún artefacto .npz NO coincide con predict_proba")
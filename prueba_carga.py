@@ -0,0 +1,492 @@
+# prueba_carga.py
+"""
+Prueba de carga HTTP contra un uvicorn real de api.main:app en localhost.
+
+Levanta el servidor (uvicorn con --workers N, o el pre-fork de src/prefork.py),
+espera a que responda y le envía una mezcla de los ocho endpoints individuales
+/funcion-<f> con pesos configurables. Los registros siguen las distribuciones
+de entrenar_*.py y las peticiones HTTP se arman antes de empezar; el cliente es
+un HTTP/1.1 mínimo sobre asyncio con conexiones keep-alive, para que el
+generador consuma la menor CPU posible.
+
+Modos:
+- abierto: llegadas a tasa constante (--rps; --poisson para llegadas
+  exponenciales). La latencia se mide desde el momento en que la petición
+  debía salir, así que incluye la espera por conexión: sin omisión coordinada.
+- cerrado: --concurrencia clientes que envían la siguiente petición apenas
+  reciben la respuesta.
+
+Varios valores de --rps o --concurrencia son escalones sucesivos (cada uno con
+--calentamiento y --duracion segundos). Por escalón informa latencias
+p50/p90/p95/p99, tasa de error y throughput, más una serie cada --intervalo
+segundos. Con --slo-ms, la capacidad del proceso es el mayor throughput de los
+escalones que cumplen el SLO (p99 y menos de 1% de errores); con --objetivo-rps
+estima además cuántos workers hacen falta (escala lineal: confirmar corriendo
+con ese número de workers).
+
+Ejemplos:
+    python prueba_carga.py --modo abierto --rps 50 100 200 400 --duracion 20 --slo-ms 50 --objetivo-rps 1500
+    python prueba_carga.py --modo cerrado --concurrencia 1 4 16 64 --workers 2 --mezcla salud=3 comercio=2
+    python prueba_carga.py --url http://127.0.0.1:8000 --rps 100 --salida carga.json
+
+El servidor hereda el entorno (ML_BACKEND, ML_TABLAS, ML_MICROBATCH, ...). En
+una misma máquina cliente y servidor compiten por la CPU: para medir el
+servidor solo, fijarlos a núcleos distintos (taskset) o usar --url contra otra
+máquina.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from src.sample_payloads import generar_entrenamiento
+from src.schemas import ESQUEMAS
+
+FUNCIONES = list(ESQUEMAS)
+REGISTROS_POR_FUNCION = 1000
+ERRORES_MAXIMOS_SLO = 0.01
+
+
+# === Servidor ===
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class Servidor:
+    """uvicorn (o src.prefork) en un subproceso, mientras dure el `with`."""
+
+    def __init__(self, tipo: str, workers: int, log: str, espera_s: float = 120):
+        self.tipo, self.workers, self.log, self.espera_s = tipo, workers, log, espera_s
+        self.puerto = _puerto_libre()
+        self.url = f"http://127.0.0.1:{self.puerto}"
+        self.proceso = None
+
+    def _comando(self) -> List[str]:
+        if self.tipo == "prefork":
+            return [sys.executable, "-m", "src.prefork", "--host", "127.0.0.1", "--port", str(self.puerto)]
+        comando = [
+            sys.executable, "-m", "uvicorn", "api.main:app", "--host", "127.0.0.1", "--port", str(self.puerto),
+            "--log-level", "warning", "--no-access-log"
+        ]
+        if self.workers > 1:
+            comando += ["--workers", str(self.workers)]
+        return comando
+
+    def __enter__(self) -> "Servidor":
+        entorno = dict(os.environ, ML_WORKERS=str(self.workers))
+        # La salida del servidor va a un archivo: la consola queda para la serie
+        with open(self.log, "wb") as log:
+            self.proceso = subprocess.Popen(self._comando(), env=entorno, stdout=log, stderr=subprocess.STDOUT)
+        limite = time.monotonic() + self.espera_s
+        while time.monotonic() < limite:
+            if self.proceso.poll() is not None:
+                raise SystemExit(f"❌ El servidor terminó al arrancar (código {self.proceso.returncode}, ver {self.log})")
+            try:
+                # 503 (HTTPError) mientras calienta: se sigue esperando
+                with urllib.request.urlopen(self.url + "/health/ready", timeout=1):
+                    print(f"🚀 {self.tipo} con {self.workers} worker(s) escuchando en {self.url} (log: {self.log})")
+                    return self
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise SystemExit(f"❌ El servidor no respondió en {self.espera_s:.0f} s (ver {self.log})")
+
+    def __exit__(self, *exc) -> None:
+        if self.proceso is None or self.proceso.poll() is not None:
+            return
+        self.proceso.send_signal(signal.SIGTERM)
+        try:
+            self.proceso.wait(15)
+        except subprocess.TimeoutExpired:
+            self.proceso.kill()
+            self.proceso.wait()
+
+
+# === Cliente HTTP/1.1 mínimo ===
+class _Conexion:
+    def __init__(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self.lector, self.escritor = lector, escritor
+        self.abierta = True
+
+    async def pedir(self, peticion: bytes) -> int:
+        """Envía una petición ya armada y lee la respuesta completa; devuelve el estado HTTP."""
+        self.escritor.write(peticion)
+        cabecera = await self.lector.readuntil(b"\r\n\r\n")
+        lineas = cabecera.decode("latin1").split("\r\n")
+        estado = int(lineas[0].split(" ", 2)[1])
+        campos = {}
+        for linea in lineas[1:]:
+            nombre, _, valor = linea.partition(":")
+            campos[nombre.strip().lower()] = valor.strip().lower()
+        if "content-length" in campos:
+            await self.lector.readexactly(int(campos["content-length"]))
+        elif campos.get("transfer-encoding") == "chunked":
+            while True:
+                tamaño = int((await self.lector.readuntil(b"\r\n")).split(b";")[0], 16)
+                if tamaño == 0:
+                    await self.lector.readuntil(b"\r\n")
+                    break
+                await self.lector.readexactly(tamaño + 2)
+        if campos.get("connection") == "close":
+            self.cerrar()
+        return estado
+
+    def cerrar(self) -> None:
+        self.abierta = False
+        self.escritor.close()
+
+class PoolConexiones:
+    """Conexiones keep-alive reutilizables, como máximo `maximo` a la vez."""
+
+    def __init__(self, host: str, puerto: int, maximo: int):
+        self.host, self.puerto = host, puerto
+        self._libres: List[_Conexion] = []
+        self._cupo = asyncio.Semaphore(maximo)
+        self._todas: List[_Conexion] = []
+
+    async def pedir(self, peticion: bytes) -> int:
+        async with self._cupo:
+            conexion = self._libres.pop() if self._libres else None
+            if conexion is None:
+                conexion = _Conexion(*await asyncio.open_connection(self.host, self.puerto))
+                self._todas.append(conexion)
+            try:
+                estado = await conexion.pedir(peticion)
+            except BaseException:
+                # Respuesta a medias (error, timeout o cancelación): la conexión no se reutiliza
+                conexion.cerrar()
+                raise
+            if conexion.abierta:
+                self._libres.append(conexion)
+            return estado
+
+    def cerrar(self) -> None:
+        for conexion in self._todas:
+            if conexion.abierta:
+                conexion.cerrar()
+
+
+def _peticiones(host: str, funciones: List[str], semilla: int) -> Dict[str, List[bytes]]:
+    """Peticiones HTTP completas por función, armadas de antemano."""
+    peticiones = {}
+    for funcion in funciones:
+        lista = []
+        for registro in generar_entrenamiento(funcion, REGISTROS_POR_FUNCION, semilla):
+            cuerpo = json.dumps(registro, ensure_ascii=False).encode("utf-8")
+            lista.append(
+                f"POST /funcion-{funcion} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin1") + cuerpo
+            )
+        peticiones[funcion] = lista
+    return peticiones
+
+
+# === Registro de resultados ===
+class Registro:
+    """Una fila por petición terminada, en orden de finalización."""
+
+    def __init__(self):
+        self.funciones: List[str] = []
+        self.fines: List[float] = []
+        self.latencias: List[float] = []
+        self.errores: List[Optional[str]] = []
+        self.descartadas = 0
+
+    def anotar(self, funcion: str, inicio: float, fin: float, error: Optional[str]) -> None:
+        self.funciones.append(funcion)
+        self.fines.append(fin)
+        self.latencias.append(fin - inicio)
+        self.errores.append(error)
+
+
+def _latencias_ms(latencias: List[float]) -> Dict[str, float]:
+    if not latencias:
+        return {"p50": None, "p90": None, "p95": None, "p99": None, "max": None}
+    ms = np.array(latencias) * 1000
+    p50, p90, p95, p99 = np.percentile(ms, [50, 90, 95, 99])
+    return {"p50": float(p50), "p90": float(p90), "p95": float(p95), "p99": float(p99), "max": float(ms.max())}
+
+
+async def _una(pool: PoolConexiones, funcion: str, peticion: bytes, inicio: float, registro: Registro,
+               timeout: float) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        estado = await asyncio.wait_for(pool.pedir(peticion), timeout)
+        error = None if 200 <= estado < 300 else f"HTTP {estado}"
+    except asyncio.TimeoutError:
+        error = "timeout"
+    except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as exc:
+        error = type(exc).__name__
+    registro.anotar(funcion, inicio, loop.time(), error)
+
+
+class Mezcla:
+    """Elige función y petición según los pesos, reproducible con `semilla`."""
+
+    def __init__(self, peticiones: Dict[str, List[bytes]], pesos: Dict[str, float], semilla: int):
+        self.peticiones = peticiones
+        self.funciones = [f for f in peticiones if pesos.get(f, 0) > 0]
+        self.pesos = [pesos[f] for f in self.funciones]
+        self.rng = random.Random(semilla)
+
+    def siguiente(self):
+        funcion = self.rng.choices(self.funciones, self.pesos)[0]
+        return funcion, self.rng.choice(self.peticiones[funcion])
+
+
+# === Modos de carga ===
+async def _abierto(pool, mezcla: Mezcla, rps: float, segundos: float, registro: Registro, timeout: float,
+                   poisson: bool, max_pendientes: int) -> None:
+    loop = asyncio.get_running_loop()
+    pendientes = set()
+    programada = loop.time()
+    fin = programada + segundos
+    while True:
+        programada += mezcla.rng.expovariate(rps) if poisson else 1 / rps
+        if programada >= fin:
+            break
+        espera = programada - loop.time()
+        if espera > 0:
+            await asyncio.sleep(espera)
+        if len(pendientes) >= max_pendientes:
+            registro.descartadas += 1
+            continue
+        funcion, peticion = mezcla.siguiente()
+        tarea = asyncio.ensure_future(_una(pool, funcion, peticion, programada, registro, timeout))
+        pendientes.add(tarea)
+        tarea.add_done_callback(pendientes.discard)
+    if pendientes:
+        await asyncio.gather(*pendientes)
+
+async def _cerrado(pool, mezcla: Mezcla, concurrencia: int, segundos: float, registro: Registro,
+                   timeout: float) -> None:
+    loop = asyncio.get_running_loop()
+    fin = loop.time() + segundos
+
+    async def cliente():
+        while loop.time() < fin:
+            funcion, peticion = mezcla.siguiente()
+            await _una(pool, funcion, peticion, loop.time(), registro, timeout)
+
+    await asyncio.gather(*(cliente() for _ in range(concurrencia)))
+
+
+async def _reportar(registro: Registro, inicio: float, intervalo: float, serie: List[Dict]) -> None:
+    """Cada `intervalo` segundos imprime y guarda lo terminado en ese intervalo."""
+    loop = asyncio.get_running_loop()
+    desde, siguiente = 0, inicio + intervalo
+    while True:
+        await asyncio.sleep(max(0.0, siguiente - loop.time()))
+        hasta = len(registro.fines)
+        errores = sum(e is not None for e in registro.errores[desde:hasta])
+        lat = _latencias_ms(registro.latencias[desde:hasta])
+        punto = {
+            "t_s": round(siguiente - inicio, 3),
+            "rps": (hasta - desde) / intervalo,
+            "errores": errores,
+            "p50_ms": lat["p50"],
+            "p99_ms": lat["p99"]
+        }
+        serie.append(punto)
+        if lat["p50"] is not None:
+            print(
+                f"   t={punto['t_s']:6.1f}s  {punto['rps']:8.1f} req/s  errores {errores:4d}  "
+                f"p50 {lat['p50']:8.2f}  p99 {lat['p99']:8.2f} ms"
+            )
+        desde, siguiente = hasta, siguiente + intervalo
+
+
+async def escalon(url: str, modo: str, objetivo: float, args, peticiones, pesos) -> Dict:
+    partes = urlsplit(url)
+    pool = PoolConexiones(partes.hostname, partes.port or 80, args.conexiones)
+    mezcla = Mezcla(peticiones, pesos, args.semilla)
+    loop = asyncio.get_running_loop()
+
+    async def correr(segundos: float, registro: Registro) -> None:
+        if modo == "abierto":
+            await _abierto(pool, mezcla, objetivo, segundos, registro, args.timeout, args.poisson, args.max_pendientes)
+        else:
+            await _cerrado(pool, mezcla, int(objetivo), segundos, registro, args.timeout)
+
+    try:
+        if args.calentamiento > 0:
+            await correr(args.calentamiento, Registro())
+        registro, serie = Registro(), []
+        inicio = loop.time()
+        reporte = asyncio.ensure_future(_reportar(registro, inicio, args.intervalo, serie))
+        await correr(args.duracion, registro)
+        duracion = loop.time() - inicio
+        reporte.cancel()
+    finally:
+        pool.cerrar()
+
+    ok = [lat for lat, e in zip(registro.latencias, registro.errores) if e is None]
+    n = len(registro.latencias)
+    errores = n - len(ok) + registro.descartadas
+    por_tipo: Dict[str, int] = {}
+    for e in registro.errores:
+        if e is not None:
+            por_tipo[e] = por_tipo.get(e, 0) + 1
+    por_endpoint = {}
+    for funcion in mezcla.funciones:
+        latencias = [
+            lat for f, lat, e in zip(registro.funciones, registro.latencias, registro.errores) if f == funcion and e is None
+        ]
+        fallidas = sum(1 for f, e in zip(registro.funciones, registro.errores) if f == funcion and e is not None)
+        por_endpoint[funcion] = {"completadas": len(latencias), "errores": fallidas, "latencia_ms": _latencias_ms(latencias)}
+    return {
+        "modo": modo,
+        "objetivo": objetivo,
+        "duracion_s": duracion,
+        "enviadas": n + registro.descartadas,
+        "completadas_ok": len(ok),
+        "errores": errores,
+        "descartadas": registro.descartadas,
+        "errores_por_tipo": por_tipo,
+        "tasa_error": errores / (n + registro.descartadas) if n + registro.descartadas else 0.0,
+        "throughput_rps": len(ok) / duracion if duracion > 0 else 0.0,
+        "latencia_ms": _latencias_ms(ok),
+        "por_endpoint": por_endpoint,
+        "serie": serie
+    }
+
+
+# === Análisis de saturación ===
+def saturacion(escalones: List[Dict], slo_ms: Optional[float], workers: int, objetivo_rps: Optional[float]) -> Dict:
+    def cumple(e):
+        p99 = e["latencia_ms"]["p99"]
+        return (
+            e["tasa_error"] <= ERRORES_MAXIMOS_SLO and p99 is not None and (slo_ms is None or p99 <= slo_ms)
+            and (e["modo"] != "abierto" or e["throughput_rps"] >= 0.95 * e["objetivo"])
+        )
+
+    validos = [e for e in escalones if cumple(e)]
+    resultado = {"slo_p99_ms": slo_ms, "workers": workers, "capacidad_rps": None, "capacidad_por_worker_rps": None,
+                 "escalon_saturado": next((e["objetivo"] for e in escalones if not cumple(e)), None)}
+    if validos:
+        capacidad = max(e["throughput_rps"] for e in validos)
+        resultado["capacidad_rps"] = capacidad
+        resultado["capacidad_por_worker_rps"] = capacidad / workers
+        if objetivo_rps:
+            resultado["objetivo_rps"] = objetivo_rps
+            resultado["workers_necesarios"] = math.ceil(objetivo_rps / (capacidad / workers))
+    return resultado
+
+
+def _pesos(texto: List[str]) -> Dict[str, float]:
+    pesos = {f: 1.0 for f in FUNCIONES}
+    if texto:
+        pesos = {f: 0.0 for f in FUNCIONES}
+        for item in texto:
+            funcion, _, peso = item.partition("=")
+            if funcion not in pesos:
+                raise SystemExit(f"❌ Función desconocida en --mezcla: {funcion!r}")
+            pesos[funcion] = float(peso or 1)
+    return pesos
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _ejecutar(url: str, args, pesos) -> List[Dict]:
+    host = urlsplit(url).netloc
+    peticiones = _peticiones(host, [f for f in FUNCIONES if pesos[f] > 0], args.semilla)
+    objetivos = args.rps if args.modo == "abierto" else args.concurrencia
+    escalones = []
+    for objetivo in objetivos:
+        unidad = "req/s" if args.modo == "abierto" else "clientes"
+        print(f"📋 Escalón {args.modo}: {objetivo:g} {unidad}, {args.duracion:g} s")
+        e = await escalon(url, args.modo, objetivo, args, peticiones, pesos)
+        lat = e["latencia_ms"]
+        estado = "✅" if e["tasa_error"] <= ERRORES_MAXIMOS_SLO else "⚠️ "
+        print(
+            f"{estado} {e['throughput_rps']:.1f} req/s ok | errores {e['tasa_error']:.2%} | "
+            + (f"p50 {lat['p50']:.2f}  p95 {lat['p95']:.2f}  p99 {lat['p99']:.2f} ms" if lat["p50"] is not None else "sin respuestas")
+        )
+        escalones.append(e)
+    return escalones
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga HTTP de la API de clasificación")
+    parser.add_argument("--modo", choices=["abierto", "cerrado"], default="abierto")
+    parser.add_argument("--rps", nargs="+", type=float, default=[50.0], help="tasa de llegada por escalón (abierto)")
+    parser.add_argument("--poisson", action="store_true", help="llegadas exponenciales en vez de equiespaciadas")
+    parser.add_argument("--concurrencia", nargs="+", type=int, default=[8], help="clientes por escalón (cerrado)")
+    parser.add_argument("--duracion", type=float, default=10.0, help="segundos medidos por escalón")
+    parser.add_argument("--calentamiento", type=float, default=2.0, help="segundos sin medir antes de cada escalón")
+    parser.add_argument("--intervalo", type=float, default=1.0, help="segundos por punto de la serie")
+    parser.add_argument("--mezcla", nargs="*", help="pesos funcion=peso (las no nombradas no se envían)")
+    parser.add_argument("--conexiones", type=int, default=64, help="conexiones keep-alive como máximo")
+    parser.add_argument("--max-pendientes", type=int, default=10_000, help="peticiones en vuelo antes de descartar (abierto)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="segundos por petición")
+    parser.add_argument("--url", help="servidor ya levantado; si no, se levanta uno")
+    parser.add_argument("--servidor", choices=["uvicorn", "prefork"], default="uvicorn")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--log-servidor", default="prueba_carga_servidor.log", help="salida del servidor levantado")
+    parser.add_argument("--slo-ms", type=float, help="p99 máximo aceptable para la capacidad")
+    parser.add_argument("--objetivo-rps", type=float, help="estima los workers necesarios para esta tasa")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON con los resultados")
+    args = parser.parse_args()
+    pesos = _pesos(args.mezcla)
+
+    if args.url:
+        escalones = asyncio.run(_ejecutar(args.url, args, pesos))
+    else:
+        with Servidor(args.servidor, args.workers, args.log_servidor) as servidor:
+            escalones = asyncio.run(_ejecutar(servidor.url, args, pesos))
+
+    analisis = saturacion(escalones, args.slo_ms, args.workers, args.objetivo_rps)
+    if analisis["capacidad_rps"] is None:
+        print("⚠️  Ningún escalón cumple el SLO: no se puede estimar la capacidad")
+    else:
+        print(
+            f"📦 Capacidad: {analisis['capacidad_rps']:.1f} req/s con {args.workers} worker(s) "
+            f"({analisis['capacidad_por_worker_rps']:.1f} por worker)"
+            + (f"; satura en el escalón {analisis['escalon_saturado']:g}" if analisis["escalon_saturado"] is not None
+               else "; ningún escalón saturó, la capacidad real es mayor")
+        )
+        if "workers_necesarios" in analisis:
+            print(f"📦 Para {args.objetivo_rps:g} req/s: ~{analisis['workers_necesarios']} workers (estimación lineal)")
+
+    if args.salida:
+        reporte = {
+            "metadatos": {
+                "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": _commit(),
+                "cpus": os.cpu_count(),
+                "servidor": args.url or args.servidor,
+                "workers": args.workers,
+                "mezcla": {f: p for f, p in pesos.items() if p > 0},
+                "argumentos": vars(args),
+                "entorno_ml": {k: v for k, v in os.environ.items() if k.startswith("ML_")}
+            },
+            "escalones": escalones,
+            "saturacion": analisis
+        }
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# src/arrow_io.py
+"""
+Entrada y salida Apache Arrow (IPC stream) para la clasificación por lotes.
+
+POST /funcion-{funcion}/batch con Content-Type
+application/vnd.apache.arrow.stream recibe una tabla Arrow con una columna
+por campo del Funcion*Input de la función, y responde otro stream Arrow con
+una fila por registro:
+
+- subfuncion: dictionary<int32, string>
+- confianza: float64 (probabilidad 0-1, sin redondear)
+- version_modelo: dictionary<int32, string>, también en la metadata del esquema
+
+Las columnas van directo al codificador por lotes (src/feature_spec.py), sin
+pasar por JSON ni por un modelo pydantic por registro. El tipo de cada columna
+se comprueba contra el esquema y se normaliza (int -> int64, float -> float64)
+para que la matriz sea idéntica a la del camino JSON.
+
+pyarrow está en requirements.txt, así que el despliegue lo instala. En un
+entorno sin él este formato responde 415 y el resto de la API funciona igual
+(pip install pyarrow para habilitarlo).
+"""
+import typing
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class ArrowInvalido(ValueError):
+    """El stream Arrow no se puede leer o no coincide con el esquema de la función."""
+
+
+class ArrowNoDisponible(RuntimeError):
+    """pyarrow no está instalado."""
+
+
+def disponible() -> bool:
+    return pa is not None
+
+
+def _tipo_campo(anotacion) -> str:
+    if typing.get_origin(anotacion) in (list, List):
+        return "lista"
+    return {str: "str", int: "int", float: "float", bool: "bool"}[anotacion]
+
+def _normalizar(columna, tipo: str, campo: str):
+    """Columna con el tipo canónico del campo, o ArrowInvalido si no es compatible."""
+    t = columna.type
+    if pa.types.is_dictionary(t):
+        columna = columna.cast(t.value_type)
+        t = columna.type
+    if tipo == "str" and (pa.types.is_string(t) or pa.types.is_large_string(t)):
+        return columna
+    if tipo == "bool" and pa.types.is_boolean(t):
+        return columna
+    if tipo == "int" and pa.types.is_integer(t):
+        return columna.cast(pa.int64())
+    if tipo == "float" and (pa.types.is_floating(t) or pa.types.is_integer(t)):
+        return columna.cast(pa.float64())
+    if tipo == "lista" and (pa.types.is_list(t) or pa.types.is_large_list(t)) and (
+            pa.types.is_string(t.value_type) or pa.types.is_large_string(t.value_type)):
+        return columna
+    raise ArrowInvalido(f"{campo}: tipo Arrow {t} incompatible con {tipo}")
+
+def _primer_nulo(columna) -> int:
+    return int(np.flatnonzero(columna.is_null().to_numpy(zero_copy_only=False))[0])
+
+
+def leer_columnas(cuerpo: bytes, esquema) -> Dict[str, object]:
+    """Stream Arrow -> {campo: columna} validadas, listas para CODIFICADORES[...].lote."""
+    if pa is None:
+        raise ArrowNoDisponible("pyarrow no está instalado: el formato Arrow no está disponible")
+    try:
+        tabla = pa.ipc.open_stream(pa.py_buffer(cuerpo)).read_all()
+    except (pa.ArrowInvalid, OSError) as exc:
+        raise ArrowInvalido(f"stream Arrow ilegible: {exc}") from exc
+
+    faltan = [campo for campo in esquema.model_fields if campo not in tabla.column_names]
+    if faltan:
+        raise ArrowInvalido(f"faltan columnas del esquema: {faltan}")
+
+    columnas = {}
+    for campo, info in esquema.model_fields.items():
+        tipo = _tipo_campo(info.annotation)
+        columna = _normalizar(tabla.column(campo), tipo, campo)
+        if columna.null_count:
+            raise ArrowInvalido(f"registro {_primer_nulo(columna)}, {campo}: valor nulo")
+        if tipo == "lista":
+            valores = columna.to_pylist()
+            if any(None in v for v in valores):
+                fila = next(i for i, v in enumerate(valores) if None in v)
+                raise ArrowInvalido(f"registro {fila}, {campo}: elemento nulo en la lista")
+            columnas[campo] = valores
+        else:
+            columnas[campo] = columna.to_numpy()
+    return columnas
+
+
+def escribir_resultados(indices: np.ndarray, confianzas: np.ndarray, clases: List[str], version: str) -> bytes:
+    """Resultados -> stream Arrow de un record batch."""
+    n = len(indices)
+    lote = pa.record_batch(
+        [
+            pa.DictionaryArray.from_arrays(pa.array(np.asarray(indices, dtype=np.int32)), pa.array(clases)),
+            pa.array(np.asarray(confianzas, dtype=np.float64)),
+            pa.DictionaryArray.from_arrays(pa.array(np.zeros(n, dtype=np.int32)), pa.array([version]))
+        ],
+        names=["subfuncion", "confianza", "version_modelo"]
+    )
+    lote = lote.replace_schema_metadata({"version_modelo": version})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, lote.schema) as escritor:
+        escritor.write_batch(lote)
+    return sink.getvalue().to_pybytes()
+
+
+class RutaBatchArrow:
+    """
+    Middleware ASGI: un POST a /funcion-{funcion}/batch con Content-Type
+    Arrow se atiende en /funcion-{funcion}/batch/arrow. Así el mismo URL
+    sirve JSON y Arrow sin que FastAPI intente leer el stream como JSON.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST" and scope["path"].endswith("/batch"):
+            for nombre, valor in scope["headers"]:
+                if nombre == b"content-type" and valor.split(b";")[0].strip().lower() == MEDIA_TYPE.encode():
+                    scope = dict(scope, path=scope["path"] + "/arrow")
+                    if "raw_path" in scope:
+                        scope["raw_path"] = scope["raw_path"] + b"/arrow"
+                    break
+        await self.app(scope, receive, send)
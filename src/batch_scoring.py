@@ -0,0 +1,266 @@
+# src/batch_scoring.py
+"""
+Clasificación masiva fuera de línea de un archivo CSV o JSON Lines.
+
+El proceso principal lee el archivo en bloques de tamaño fijo y los reparte
+entre un pool de procesos. Cada worker carga el modelo una sola vez; por
+bloque valida los registros por columnas contra el Funcion*Input de la
+función (src/batch_validation.py), los codifica con el codificador por lotes
+(src/feature_spec.py), predice y devuelve el
+texto de salida ya formateado. El principal escribe los bloques en orden a
+medida que terminan y nunca tiene más de 2 × workers bloques en vuelo, así
+que la memoria no depende del tamaño del archivo.
+
+Entrada:
+- .csv: una columna por campo del esquema. Los valores se leen como texto y
+  los convierte pydantic; una celda vacía es un valor faltante. Las listas
+  (servicios_disponibles) van como JSON (["UCI", "Farmacia"]) o separadas por
+  "|"; en ellas una celda vacía es la lista vacía.
+- .jsonl / .ndjson: un objeto por línea, como el cuerpo de /funcion-*.
+
+Salida (.csv o .jsonl según la extensión): fila, subfuncion, confianza,
+version_modelo y error. Los registros inválidos no detienen el proceso: salen
+con su error (índice de fila, campo y mensaje) y sin predicción.
+
+Uso:
+    python -m src.batch_scoring comercio locales.csv resultados.csv --workers 4
+"""
+import argparse
+import json
+import os
+import resource
+import time
+import typing
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import ValidationError
+
+from src.batch_validation import VALIDADORES
+from src.feature_spec import CODIFICADORES
+from src.schemas import ESQUEMAS
+
+FORMATOS_JSONL = (".jsonl", ".ndjson")
+COLUMNAS_SALIDA = ["fila", "subfuncion", "confianza", "version_modelo", "error"]
+
+
+def _formato(ruta: str) -> str:
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in FORMATOS_JSONL:
+        return "jsonl"
+    raise SystemExit(f"❌ Formato no soportado: {ruta!r} (use .csv, .jsonl o .ndjson)")
+
+
+def _campos_lista(funcion: str) -> List[str]:
+    esquema = ESQUEMAS[funcion]
+    return [
+        campo for campo, info in esquema.model_fields.items()
+        if typing.get_origin(info.annotation) in (list, List)
+    ]
+
+
+# === Lectura por bloques (proceso principal) ===
+def _bloques_csv(ruta: str, tamaño: int, campos: List[str]) -> Iterator[Tuple[int, object]]:
+    encabezado = pd.read_csv(ruta, nrows=0).columns
+    faltan = [c for c in campos if c not in encabezado]
+    if faltan:
+        raise SystemExit(f"❌ {ruta}: faltan columnas del esquema: {faltan}")
+    inicio = 0
+    # Todo como texto: pydantic convierte "12" -> 12 o "true" -> True igual
+    # que con JSON, y "1" sigue siendo "1" en los campos de tipo str.
+    lector = pd.read_csv(
+        ruta, usecols=campos, dtype=str, keep_default_na=False, na_values=[""], chunksize=tamaño
+    )
+    for df in lector:
+        yield inicio, df
+        inicio += len(df)
+
+def _bloques_jsonl(ruta: str, tamaño: int) -> Iterator[Tuple[int, object]]:
+    # Líneas crudas: el parseo JSON también se reparte entre los workers
+    inicio, lineas = 0, []
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            lineas.append(linea)
+            if len(lineas) == tamaño:
+                yield inicio, lineas
+                inicio, lineas = inicio + len(lineas), []
+    if lineas:
+        yield inicio, lineas
+
+
+# === Worker ===
+_FUNCION = None
+_LISTAS: List[str] = []
+
+def _iniciar_worker(funcion: str) -> None:
+    global _FUNCION, _LISTAS
+    from src import config
+    # Solo el modelo de esta función, sin hilos de carga ni de recarga
+    config.MODO_CARGA = "lazy"
+    config.RECARGA_AUTOMATICA = False
+    from src.model_loader import REGISTRY
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    REGISTRY.obtener(funcion)
+    _FUNCION = funcion
+    _LISTAS = _campos_lista(funcion)
+
+def _lista(valor):
+    if isinstance(valor, str):
+        valor = valor.strip()
+        if valor.startswith("["):
+            return json.loads(valor)
+        return [v.strip() for v in valor.split("|") if v.strip()]
+    return valor
+
+def _registros(datos) -> List:
+    if isinstance(datos, pd.DataFrame):
+        campos = list(datos.columns)
+        # NaN (celda vacía) -> None; NaN es el único valor distinto de sí mismo
+        columnas = [[None if v != v else v for v in datos[c].tolist()] for c in campos]
+        registros = [dict(zip(campos, valores)) for valores in zip(*columnas)]
+        for i, registro in enumerate(registros):
+            for campo in _LISTAS:
+                # Celda vacía = lista vacía ("|".join([]) también da "")
+                try:
+                    registro[campo] = [] if registro[campo] is None else _lista(registro[campo])
+                except json.JSONDecodeError as e:
+                    # Como en JSONL: el error queda en lugar del registro
+                    registros[i] = ValueError(f"{campo}: JSON inválido ({e})")
+                    break
+        return registros
+    registros = []
+    for linea in datos:
+        try:
+            registros.append(json.loads(linea))
+        except json.JSONDecodeError as e:
+            registros.append(e)
+    return registros
+
+def _error(fila: int, error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        detalles = "; ".join(
+            f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()
+        )
+        return f"fila {fila}: {detalles}"
+    return f"fila {fila}: {error}"
+
+def _puntuar_bloque(inicio: int, datos, formato: str) -> Tuple[str, int, int]:
+    """Valida, codifica y predice un bloque; devuelve (texto de salida, filas, errores)."""
+    from src.model_loader import predict_matrix_with_version
+
+    registros = _registros(datos)
+    n = len(registros)
+    # Los registros con JSON inválido (línea o celda de lista) no llegan al validador
+    errores = {inicio + i: _error(inicio + i, r) for i, r in enumerate(registros) if isinstance(r, Exception)}
+    posiciones = [i for i, r in enumerate(registros) if not isinstance(r, Exception)]
+    columnas, validas, invalidos = VALIDADORES[_FUNCION].validar([registros[i] for i in posiciones])
+    for j, error in invalidos.items():
+        errores[inicio + posiciones[j]] = _error(inicio + posiciones[j], error)
+    filas_validas = [inicio + posiciones[j] for j in validas]
+
+    X = CODIFICADORES[_FUNCION].lote(columnas)
+    clases, confianzas, version = predict_matrix_with_version(_FUNCION, X)
+
+    subfunciones, confianzas_fila = [None] * n, [None] * n
+    for i, clase, confianza in zip(filas_validas, clases.tolist(), confianzas.tolist()):
+        subfunciones[i - inicio], confianzas_fila[i - inicio] = str(clase), confianza
+    mensajes = [None] * n
+    for i, mensaje in errores.items():
+        mensajes[i - inicio] = mensaje
+    columnas = [range(inicio, inicio + n), subfunciones, confianzas_fila, [version] * n, mensajes]
+
+    if formato == "csv":
+        texto = pd.DataFrame(dict(zip(COLUMNAS_SALIDA, columnas))).to_csv(header=False, index=False)
+    else:
+        # json.dumps y no DataFrame.to_json, que redondea los float
+        texto = "".join(
+            json.dumps(dict(zip(COLUMNAS_SALIDA, fila)), ensure_ascii=False) + "\n" for fila in zip(*columnas)
+        )
+    return texto, n, len(errores)
+
+
+# === Proceso principal ===
+def _rss_pico_mb(quien: int) -> float:
+    # ru_maxrss en KB (Linux); para RUSAGE_CHILDREN es el del worker más grande
+    return resource.getrusage(quien).ru_maxrss / 1024
+
+def puntuar_archivo(funcion: str, entrada: str, salida: str, tamaño_bloque: int, workers: int) -> Dict:
+    if funcion not in ESQUEMAS:
+        raise SystemExit(f"❌ Función desconocida: {funcion!r} (opciones: {', '.join(ESQUEMAS)})")
+    formato_salida = _formato(salida)
+    if _formato(entrada) == "csv":
+        bloques = _bloques_csv(entrada, tamaño_bloque, list(ESQUEMAS[funcion].model_fields))
+    else:
+        bloques = _bloques_jsonl(entrada, tamaño_bloque)
+
+    inicio = time.perf_counter()
+    filas = errores = 0
+    temporal = salida + ".tmp"
+    try:
+        with ProcessPoolExecutor(workers, initializer=_iniciar_worker, initargs=(funcion,)) as pool, \
+                open(temporal, "w", encoding="utf-8", newline="") as f:
+            if formato_salida == "csv":
+                f.write(",".join(COLUMNAS_SALIDA) + "\n")
+            en_vuelo = deque()
+            for desde, datos in bloques:
+                en_vuelo.append(pool.submit(_puntuar_bloque, desde, datos, formato_salida))
+                # Se espera al bloque más antiguo: la salida queda en orden y la
+                # lectura no se adelanta más de 2 × workers bloques.
+                while len(en_vuelo) >= 2 * workers:
+                    texto, n, e = en_vuelo.popleft().result()
+                    f.write(texto)
+                    filas, errores = filas + n, errores + e
+            while en_vuelo:
+                texto, n, e = en_vuelo.popleft().result()
+                f.write(texto)
+                filas, errores = filas + n, errores + e
+    except BaseException:
+        # Sin resultados a medias con el nombre final
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    os.replace(temporal, salida)
+
+    duracion = time.perf_counter() - inicio
+    return {
+        "filas": filas,
+        "errores": errores,
+        "segundos": duracion,
+        "filas_por_segundo": filas / duracion if duracion > 0 else 0.0,
+        "rss_pico_principal_mb": _rss_pico_mb(resource.RUSAGE_SELF),
+        "rss_pico_worker_mb": _rss_pico_mb(resource.RUSAGE_CHILDREN)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Clasifica un archivo CSV/JSONL de establecimientos")
+    parser.add_argument("funcion", help=f"una de: {', '.join(ESQUEMAS)}")
+    parser.add_argument("entrada", help="archivo .csv, .jsonl o .ndjson")
+    parser.add_argument("salida", help="archivo .csv, .jsonl o .ndjson")
+    parser.add_argument("--bloque", type=int, default=50_000, help="registros por bloque")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    reporte = puntuar_archivo(args.funcion, args.entrada, args.salida, args.bloque, args.workers)
+    estado = "✅" if reporte["errores"] == 0 else "⚠️ "
+    print(
+        f"{estado} {reporte['filas']:,} filas ({reporte['errores']:,} con error) en "
+        f"{reporte['segundos']:.1f} s → {reporte['filas_por_segundo']:,.0f} filas/s"
+    )
+    print(
+        f"📋 RSS pico: principal {reporte['rss_pico_principal_mb']:.0f} MB | "
+        f"worker {reporte['rss_pico_worker_mb']:.0f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
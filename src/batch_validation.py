@@ -0,0 +1,83 @@
+# src/batch_validation.py
+"""
+Validación por columnas para lotes grandes.
+
+Validar un lote como List[Funcion*Input] construye un BaseModel por registro
+y después el codificador vuelve a leer cada campo de cada modelo: con decenas
+de miles de registros eso cuesta más que codificar y predecir. ValidadorLote
+traspone los registros (dicts, tal como llegan del JSON) a una lista por
+campo y valida cada columna de una sola vez con TypeAdapter(List[tipo]), con
+el mismo tipo que declara el esquema. Las conversiones son las mismas que
+las del modelo ("12" -> 12, "true" -> True, ...) y las columnas validadas van
+directo a CODIFICADORES[funcion].lote.
+
+Los registros que fallan en alguna columna (tipo incorrecto, campo faltante,
+no es un objeto) se validan otra vez, uno por uno, con el esquema completo y
+solo para armar el error: los mensajes son exactamente los de pydantic, con
+el índice del registro y el campo. Los demás registros siguen su camino.
+"""
+from typing import Dict, List, Sequence, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from src.schemas import ESQUEMAS
+
+# Valor de un campo que el registro no trae: ningún tipo del esquema lo acepta
+_FALTA = object()
+
+
+class ValidadorLote:
+    """Valida una lista de registros del esquema dado, columna por columna."""
+
+    def __init__(self, esquema: Type[BaseModel]):
+        self.esquema = esquema
+        self._adaptadores = {
+            campo: TypeAdapter(List[info.annotation]) for campo, info in esquema.model_fields.items()
+        }
+
+    def validar(self, registros: Sequence) -> Tuple[Dict[str, list], List[int], Dict[int, ValidationError]]:
+        """
+        (columnas de los registros válidos, índices de esos registros, error
+        de cada registro inválido por índice).
+        """
+        filas = [r if isinstance(r, dict) else {} for r in registros]
+        columnas, fallidas, malos = {}, [], set()
+        for campo, adaptador in self._adaptadores.items():
+            valores = [r.get(campo, _FALTA) for r in filas]
+            try:
+                columnas[campo] = adaptador.validate_python(valores)
+            except ValidationError as exc:
+                malos.update(e["loc"][0] for e in exc.errors(include_url=False))
+                columnas[campo] = valores
+                fallidas.append(campo)
+
+        if not malos:
+            return columnas, list(range(len(filas))), {}
+
+        validas = [i for i in range(len(filas)) if i not in malos]
+        for campo in columnas:
+            columnas[campo] = [columnas[campo][i] for i in validas]
+        for campo in fallidas:
+            # Sin los registros malos la columna pasa; se valida de nuevo para
+            # quedarse con los valores convertidos.
+            columnas[campo] = self._adaptadores[campo].validate_python(columnas[campo])
+
+        errores = {}
+        for i in sorted(malos):
+            try:
+                self.esquema.model_validate(registros[i])
+            except ValidationError as exc:
+                errores[i] = exc
+        return columnas, validas, errores
+
+
+def detalle_errores(errores: Dict[int, ValidationError], prefijo: tuple = ()) -> List[dict]:
+    """Errores de pydantic con `loc` = (*prefijo, índice del registro, campo...)."""
+    return [
+        {**e, "loc": (*prefijo, i, *e["loc"])}
+        for i, exc in sorted(errores.items())
+        for e in exc.errors()
+    ]
+
+
+VALIDADORES = {funcion: ValidadorLote(esquema) for funcion, esquema in ESQUEMAS.items()}
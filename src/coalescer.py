@@ -0,0 +1,120 @@
+# src/coalescer.py
+"""
+Micro-batching asíncrono de peticiones individuales.
+
+Las peticiones concurrentes a un mismo /funcion-* se encolan durante una
+ventana corta (ML_MICROBATCH_ESPERA_MS) o hasta juntar ML_MICROBATCH_MAX_ITEMS,
+se puntúan juntas con una sola llamada a predict_proba (vía los
+predict_*_batch_with_confidence) y cada llamante recibe su propio resultado.
+"""
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from src.metrics import Histograma
+
+
+LIMITES_TAMAÑO_LOTE = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+LIMITES_ESPERA_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+def _fallar(lote, exc: BaseException) -> None:
+    for _, futuro, _ in lote:
+        if not futuro.done():
+            futuro.set_exception(exc)
+
+
+# === Coalescedor por función ===
+class MicroBatcher:
+    """
+    Agrupa llamadas individuales en lotes para `predict_batch`, una función
+    que recibe una lista de dicts y devuelve una lista de (clase, confianza).
+    """
+
+    def __init__(self, predict_batch: Callable[[List[Dict]], List[Tuple[str, float]]],
+                 espera_ms: float = 2.0, max_items: int = 64):
+        self.predict_batch = predict_batch
+        self.espera_s = espera_ms / 1000.0
+        self.max_items = max_items
+        self.hist_tamaño_lote = Histograma(LIMITES_TAMAÑO_LOTE)
+        self.hist_espera_ms = Histograma(LIMITES_ESPERA_MS)
+        self._lock_hist = threading.Lock()
+        self._cola: asyncio.Queue = None
+        self._tarea: asyncio.Task = None
+
+    def _asegurar_worker(self) -> None:
+        # La cola y la tarea se crean dentro del event loop de uvicorn. La cola
+        # es una sola: si la tarea terminó, la nueva atiende lo ya encolado.
+        if self._cola is None:
+            self._cola = asyncio.Queue()
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.get_running_loop().create_task(self._bucle())
+
+    async def predecir(self, datos: Dict) -> Tuple[str, float]:
+        self._asegurar_worker()
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((datos, futuro, time.perf_counter()))
+        return await futuro
+
+    async def _bucle(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = []
+            try:
+                lote.append(await self._cola.get())
+                limite = loop.time() + self.espera_s
+                while len(lote) < self.max_items:
+                    restante = limite - loop.time()
+                    if restante <= 0:
+                        break
+                    try:
+                        lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                    except asyncio.TimeoutError:
+                        break
+                await self._procesar(lote)
+            except asyncio.CancelledError:
+                # Los ya sacados de la cola no quedan esperando para siempre
+                _fallar(lote, RuntimeError("micro-batching detenido"))
+                raise
+            except Exception as exc:
+                # Un error inesperado falla solo este lote; el bucle sigue
+                print(f"❌ Micro-batch de {len(lote)} fallido: {exc!r}")
+                _fallar(lote, exc)
+
+    async def _procesar(self, lote) -> None:
+        inicio = time.perf_counter()
+        with self._lock_hist:
+            self.hist_tamaño_lote.observar(len(lote))
+            for _, _, encolado in lote:
+                self.hist_espera_ms.observar((inicio - encolado) * 1000.0)
+
+        try:
+            # predict_proba libera el loop: se ejecuta en el pool de hilos
+            resultados = await asyncio.get_running_loop().run_in_executor(
+                None, self.predict_batch, [datos for datos, _, _ in lote]
+            )
+        except Exception as exc:
+            _fallar(lote, exc)
+            return
+
+        for (_, futuro, _), resultado in zip(lote, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    def stats(self) -> Dict:
+        with self._lock_hist:
+            return {
+                "tamaño_lote": self.hist_tamaño_lote.snapshot(),
+                "espera_cola_ms": self.hist_espera_ms.snapshot()
+            }
+
+    def histogramas(self) -> Dict[str, tuple]:
+        """Para Metricas.exponer: la espera pasa a segundos, como las demás series."""
+        with self._lock_hist:
+            lote = self.hist_tamaño_lote.valores()
+            limites, cuentas, suma = self.hist_espera_ms.valores()
+        return {
+            "tamaño_lote": lote,
+            "espera_cola_s": (tuple(l / 1000 for l in limites), cuentas, suma / 1000)
+        }
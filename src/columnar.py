@@ -0,0 +1,22 @@
+# src/columnar.py
+"""
+Preprocesamiento columnar para puntuación masiva.
+
+Cada encode_*_columns recibe muchos registros a la vez (dict de listas,
+DataFrame de pandas, dict de arrays NumPy de tipo object, lista de dicts o
+de modelos pydantic) y devuelve la matriz (n, n_features) idéntica, fila por
+fila y en dtype, a la que produce el preprocess_* correspondiente.
+
+Son los codificadores por lotes compilados a partir de las especificaciones
+de src/feature_spec.py.
+"""
+from src.feature_spec import CODIFICADORES, Columnas
+
+encode_salud_columns = CODIFICADORES["salud"].lote
+encode_encuentro_columns = CODIFICADORES["encuentro"].lote
+encode_hospedaje_columns = CODIFICADORES["hospedaje"].lote
+encode_educacion_columns = CODIFICADORES["educacion"].lote
+encode_industrial_columns = CODIFICADORES["industrial"].lote
+encode_oficinas_columns = CODIFICADORES["oficinas"].lote
+encode_comercio_columns = CODIFICADORES["comercio"].lote
+encode_almacen_columns = CODIFICADORES["almacen"].lote
@@ -0,0 +1,88 @@
+# src/config.py
+"""Configuración del servicio por variables de entorno (ver Procfile)."""
+import os
+
+
+def _env_bool(nombre: str, default: bool = False) -> bool:
+    valor = os.getenv(nombre)
+    if valor is None:
+        return default
+    return valor.strip().lower() in {"1", "true", "sí", "si", "yes", "on"}
+
+
+# === Micro-batching de peticiones individuales ===
+# Agrupa peticiones concurrentes al mismo /funcion-* en una sola llamada a
+# predict_proba. Desactivado por defecto.
+MICROBATCH_ACTIVO = _env_bool("ML_MICROBATCH")
+MICROBATCH_ESPERA_MS = float(os.getenv("ML_MICROBATCH_ESPERA_MS", "2"))
+MICROBATCH_MAX_ITEMS = int(os.getenv("ML_MICROBATCH_MAX_ITEMS", "64"))
+
+# === Motor de inferencia ===
+# "sklearn": model.predict_proba; "flat": src/forest_engine.FlatForest
+# (mismas probabilidades, sin el overhead por llamada de sklearn).
+BACKEND = os.getenv("ML_BACKEND", "sklearn").strip().lower()
+
+# === Streaming NDJSON (/funcion-{funcion}/stream) ===
+# Registros por micro-lote al puntuar un cuerpo NDJSON mientras llega.
+STREAM_LOTE = int(os.getenv("ML_STREAM_LOTE", "256"))
+
+# === Tablas de predicción exhaustivas ===
+# INDUSTRIAL, ALMACÉN y COMERCIO tienen un espacio de features finito: se
+# precalculan todas sus predicciones al cargar (ver src/lookup_tables.py).
+TABLAS_ACTIVAS = _env_bool("ML_TABLAS", True)
+
+# === Caché LRU de predicciones (por modelo, clave = vector codificado) ===
+# 0 desactiva la caché.
+CACHE_CAPACIDAD = int(os.getenv("ML_CACHE_CAPACIDAD", "4096"))
+
+# === Formato de los artefactos ===
+# "pkl": models/rf_*.pkl (sklearn). "npz": models/rf_*.npz exportados con
+# exportar_modelos.py, abiertos con memoria mapeada y servidos con el motor plano.
+FORMATO_ARTEFACTO = os.getenv("ML_ARTEFACTO", "pkl").strip().lower()
+
+# === Registro de modelos ===
+# ML_CARGA: "lazy" (primer uso), "background" (hilo al arrancar) o "eager" (al importar).
+MODO_CARGA = os.getenv("ML_CARGA", "lazy").strip().lower()
+# ML_FUNCIONES: lista separada por comas de las funciones que sirve esta réplica
+# (p. ej. "comercio" o "salud,hospedaje"). Vacío = todas.
+FUNCIONES_HABILITADAS = [
+    f.strip().lower() for f in os.getenv("ML_FUNCIONES", "").split(",") if f.strip()
+] or None
+# ML_CARGA_HILOS: modelos que se cargan a la vez al cargarlos todos (eager,
+# background, calentamiento y maestro de prefork).
+CARGA_HILOS = int(os.getenv("ML_CARGA_HILOS", "4"))
+# ML_MANIFIESTO: tamaño y SHA-256 esperados de cada artefacto (ver
+# src/model_manifest.py); vacío desactiva la verificación.
+MANIFIESTO = os.getenv("ML_MANIFIESTO", os.path.join("models", "manifest.json"))
+
+# === Recarga en caliente ===
+# ML_RECARGA_AUTOMATICA=1 vigila models/rf_*.pkl y reinstala un modelo cuando
+# su artefacto cambia (se revisa cada ML_RECARGA_INTERVALO_S segundos).
+RECARGA_AUTOMATICA = _env_bool("ML_RECARGA_AUTOMATICA")
+RECARGA_INTERVALO_S = float(os.getenv("ML_RECARGA_INTERVALO_S", "5"))
+
+# === Perfilado por muestreo (POST /perfil/iniciar, ver src/profiler.py) ===
+# Directorio de los perfiles (pilas colapsadas). Si ML_PERFIL_TOKEN está
+# definido, /perfil/*, /lentas y la cabecera X-Perfilar exigen X-Token-Admin
+# con ese valor.
+PERFIL_DIRECTORIO = os.getenv("ML_PERFIL_DIR", "perfiles")
+PERFIL_TOKEN = os.getenv("ML_PERFIL_TOKEN", "")
+
+# === Registro de peticiones lentas (GET /lentas, ver src/slow_log.py) ===
+# Peticiones a /funcion-* que superan ML_LENTAS_UMBRAL_MS (0 lo desactiva); se
+# guardan las últimas ML_LENTAS_CAPACIDAD en memoria y, si ML_LENTAS_ARCHIVO
+# está definido, todas se agregan a ese archivo JSONL.
+LENTAS_UMBRAL_MS = float(os.getenv("ML_LENTAS_UMBRAL_MS", "250"))
+LENTAS_CAPACIDAD = int(os.getenv("ML_LENTAS_CAPACIDAD", "200"))
+LENTAS_ARCHIVO = os.getenv("ML_LENTAS_ARCHIVO", "")
+# Bytes del cuerpo y filas de la matriz codificada que se guardan por petición
+LENTAS_MAX_BYTES = int(os.getenv("ML_LENTAS_MAX_BYTES", "65536"))
+LENTAS_MAX_FILAS = int(os.getenv("ML_LENTAS_MAX_FILAS", "64"))
+
+# === Calentamiento al arrancar (ver src/warmup.py) ===
+# Con ML_CALENTAR=1 (por defecto) cada worker carga sus modelos al arrancar
+# y pasa ML_CALENTAR_FILAS registros por cada camino de predicción (bajo
+# src/prefork.py lo hace el maestro una vez). Mientras tanto GET
+# /health/ready responde 503.
+CALENTAR = _env_bool("ML_CALENTAR", True)
+CALENTAR_FILAS = int(os.getenv("ML_CALENTAR_FILAS", "64"))
@@ -0,0 +1,161 @@
+# src/feature_maps.py
+"""
+Tablas de codificación compartidas por el preprocesamiento fila a fila
+(src/model_loader.py) y el columnar (src/columnar.py).
+Cualquier cambio aquí afecta a ambos caminos por igual.
+"""
+
+# === SALUD ===
+SALUD_NIVEL_MAP = {"Primer": 1, "Segundo": 2, "Tercer": 3}
+SALUD_TIPO_MAP = {
+    "Puesto": 1, "Posta": 1,
+    "Consultorio": 2, "Consultorio médico": 2,
+    "Centro de salud": 3, "Centro médico": 3, "Policlínico": 3, "Centro médico especializado": 3,
+    "Hospital general": 4,
+    "Hospital especializado": 5,
+    "Instituto": 6
+}
+SALUD_CAMAS_MAP = {"0": 0, "1-10": 1, "11-50": 2, ">50": 3}
+SALUD_CAPACIDAD_MAP = {"Baja": 1, "Media": 2, "Alta": 3}
+SALUD_ESPECIALIDADES_MAP = {"0": 0, "1-5": 1, ">5": 2}
+SALUD_PISOS_MAP = {"1": 1, "2": 2, ">3": 3}
+SALUD_SERVICIOS_CLAVE = {"Urgencias", "Laboratorio", "Farmacia", "Radiología", "UCI"}
+
+# === ENCUENTRO ===
+# Lista normativa de usos que son 2.4
+ENCUENTRO_USOS_2_4 = {
+    "discoteca", "casino", "tragamonedas", "teatro", "cine", "sala_concierto",
+    "anfiteatro", "auditorio", "centro_convenciones", "club", "estadio",
+    "plaza_toro", "coliseo", "hipodromo", "velodromo", "autodromo",
+    "polideportivo", "parque_diversion", "zoologico", "templo", "iglesia"
+}
+ENCUENTRO_HORARIO_MAP = {"diurno": 1, "nocturno": 2, "mixto": 3}
+
+# === HOSPEDAJE ===
+# Tipos especiales mencionados en la normativa (3.1)
+HOSPEDAJE_TIPOS_ESPECIALES = {"ecolodge", "albergue"}
+
+# === EDUCACIÓN ===
+EDUCACION_NIVELES_BASICOS = {"inicial", "primaria", "secundaria"}
+EDUCACION_INSTITUCIONES_SUPERIOR = {
+    "instituto", "escuela superior", "centro superior",
+    "universidad", "superior técnico", "superior universitario"
+}
+EDUCACION_AREA_MAP = {
+    "<500": 300,
+    "500-1500": 1000,
+    "1500-5000": 3000,
+    "5000-15000": 10000,
+    ">15000": 20000
+}
+EDUCACION_CAP_MAP = {
+    "<100": 50,
+    "100-300": 200,
+    "300-800": 500,
+    "800-2000": 1500,
+    ">2000": 3000
+}
+
+def educacion_num_pisos(numero_pisos_str) -> int:
+    if numero_pisos_str == ">10":
+        return 11
+    if numero_pisos_str == "6-10":
+        return 8
+    try:
+        return int(numero_pisos_str)
+    except (ValueError, TypeError):
+        return 3
+
+# === INDUSTRIAL ===
+INDUSTRIAL_PALABRAS_PRODUCTO_EXPLOSIVO = ["explosivo", "pirotécnico", "municion", "fuegos", "pólvora"]
+INDUSTRIAL_PALABRAS_ESTABLECIMIENTO_EXPLOSIVO = ["explosivo", "pirotécnico"]
+INDUSTRIAL_ESCALA_MAP = {
+    "unitaria/por pedido": 1,
+    "pequeña serie": 2,
+    "mediana serie": 3,
+    "gran serie": 4,
+    "producción continua": 5
+}
+INDUSTRIAL_AREA_MAP = {"<50": 30, "50-200": 125, "200-1000": 600, "1000-5000": 3000, ">5000": 7500}
+INDUSTRIAL_TRAB_MAP = {"1-5": 3, "6-10": 8, "11-50": 30, "51-200": 125, ">200": 300}
+INDUSTRIAL_PELIGRO_MAP = {
+    "bajo (no inflamables)": 1,
+    "medio (inflamables clase iiia)": 2,
+    "alto (inflamables clase i-ii)": 3,
+    "muy alto (explosivos/reactivos)": 4
+}
+
+# === OFICINAS ===
+OFICINAS_AREA_POR_PISO_MAP = {
+    "<200": 100,
+    "200-400": 300,
+    "400-560": 480,
+    "560-1000": 780,
+    "1000-2500": 1750,
+    ">2500": 3000
+}
+OFICINAS_AREA_TOTAL_MAP = {"<500": 300, "500-2000": 1250, "2000-5000": 3500, "5000-15000": 10000, ">15000": 20000}
+OFICINAS_AÑO_ACTUAL = 2025
+
+def oficinas_num_pisos(pisos_str) -> int:
+    if pisos_str == "1":
+        return 1
+    elif pisos_str == "2":
+        return 2
+    elif pisos_str == "3":
+        return 3
+    elif pisos_str == "4":
+        return 4
+    return 6  # valor representativo para >4
+
+# === COMERCIO ===
+COMERCIO_AREA_TOTAL_MAP = {"<300": 200, "300-750": 525, "750-2000": 1375, "2000-10000": 6000, ">10000": 15000}
+COMERCIO_LICENCIA_CORPORATIVA = "Corporativa (galería/mercado)"
+COMERCIO_ESTABLECIMIENTOS_7_5 = {
+    "mercado minorista", "mercado mayorista", "supermercado", "tienda por departamentos",
+    "galería comercial", "centro comercial", "complejo comercial"
+}
+COMERCIO_PALABRAS_7_6 = {"explosivo", "pirotécnico", "municion", "fuegos", "pólvora"}
+COMERCIO_AREA_VENTA_MAP = {"<200": 100, "200-500": 350, "500-1500": 1000, "1500-5000": 3250, ">5000": 7500}
+COMERCIO_LOCALES_MAP = {"1": 1, "2-5": 3, "6-20": 13, "21-100": 60, ">100": 150}
+
+def comercio_num_pisos(pisos_str) -> int:
+    if pisos_str == "1":
+        return 1
+    elif pisos_str == "2":
+        return 2
+    elif pisos_str == "3":
+        return 3
+    return 5  # valor representativo para >3
+
+def comercio_modalidad_num(modalidad: str) -> int:
+    modalidad = modalidad.lower()
+    if "independiente" in modalidad:
+        return 0
+    elif "módulo" in modalidad:
+        return 1
+    return 2
+
+# === ALMACÉN ===
+ALMACEN_PALABRAS_8_3 = {"explosivo", "pirotécnico", "municion", "fuegos", "pólvora"}
+ALMACEN_PORCENTAJE_MAP = {"0%": 0, "1-25%": 15, "26-50%": 37, "51-75%": 62, "76-99%": 87, "100%": 100}
+ALMACEN_COBERTURA_MAP = {
+    "no techado": 0,
+    "parcialmente techado": 1,
+    "totalmente techado": 2,
+    "cerrado y techado": 3
+}
+ALMACEN_CERRAMIENTO_MAP = {
+    "abierto": 0,
+    "semi-abierto (muros parciales)": 1,
+    "cerrado (muros completos)": 2,
+    "con climatización": 3
+}
+ALMACEN_NFPA_MAP = {
+    "0 (mínimo)": 0,
+    "1 (ligero)": 1,
+    "2 (moderado)": 2,
+    "3 (serio)": 3,
+    "4 (severo)": 4
+}
+ALMACEN_AREA_ADMIN_MAP = {"0": 0, "1-50": 30, "51-200": 125, "201-500": 350, ">500": 750}
@@ -0,0 +1,430 @@
+# src/feature_spec.py
+"""
+Especificación declarativa de las features de las ocho funciones.
+
+Cada función se describe una sola vez como una lista de features con nombre
+(qué campo de entrada leen y qué regla aplican) más el orden de salida que
+espera el modelo. `compilar` convierte esa descripción, al importar el
+módulo, en dos codificadores que dan la misma matriz que los antiguos
+preprocess_* (valores y dtype):
+
+- fila(datos): un registro -> (1, n_features). Es código generado para
+  cada función (una asignación por feature) que lee los campos directamente
+  de un modelo pydantic (atributos) o de un dict, sin copiar a un dict.
+  Las reglas sobre un campo de texto se memorizan por valor distinto.
+- lote(columnas): muchos registros -> (n, n_features). Las reglas sobre un
+  campo se evalúan una vez por valor distinto (pd.factorize + take).
+
+Tipos de feature:
+- Columna: el valor tal cual, o convertido con int/float/bool.
+- PorValor: regla escalar sobre un solo campo (mapas, pertenencia, ...).
+- Contiene: banderas de palabras clave; las de un mismo campo se responden
+  con una sola regex precompilada (src/keyword_matcher.py).
+- Combinada: operación sobre otras features ya calculadas; debe escribirse
+  con & | < <= ... para que sirva igual con escalares y con arrays.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from src.keyword_matcher import PalabrasClave
+from src.feature_maps import (
+    SALUD_NIVEL_MAP, SALUD_TIPO_MAP, SALUD_CAMAS_MAP, SALUD_CAPACIDAD_MAP,
+    SALUD_ESPECIALIDADES_MAP, SALUD_PISOS_MAP, SALUD_SERVICIOS_CLAVE,
+    ENCUENTRO_USOS_2_4, ENCUENTRO_HORARIO_MAP,
+    HOSPEDAJE_TIPOS_ESPECIALES,
+    EDUCACION_NIVELES_BASICOS, EDUCACION_INSTITUCIONES_SUPERIOR,
+    EDUCACION_AREA_MAP, EDUCACION_CAP_MAP, educacion_num_pisos,
+    INDUSTRIAL_PALABRAS_PRODUCTO_EXPLOSIVO, INDUSTRIAL_PALABRAS_ESTABLECIMIENTO_EXPLOSIVO,
+    INDUSTRIAL_ESCALA_MAP, INDUSTRIAL_AREA_MAP, INDUSTRIAL_TRAB_MAP, INDUSTRIAL_PELIGRO_MAP,
+    OFICINAS_AREA_POR_PISO_MAP, OFICINAS_AREA_TOTAL_MAP, OFICINAS_AÑO_ACTUAL, oficinas_num_pisos,
+    COMERCIO_AREA_TOTAL_MAP, COMERCIO_LICENCIA_CORPORATIVA, COMERCIO_ESTABLECIMIENTOS_7_5,
+    COMERCIO_PALABRAS_7_6, COMERCIO_AREA_VENTA_MAP, COMERCIO_LOCALES_MAP,
+    comercio_num_pisos, comercio_modalidad_num,
+    ALMACEN_PALABRAS_8_3, ALMACEN_PORCENTAJE_MAP, ALMACEN_COBERTURA_MAP,
+    ALMACEN_CERRAMIENTO_MAP, ALMACEN_NFPA_MAP, ALMACEN_AREA_ADMIN_MAP
+)
+
+# Entradas del codificador por lotes: DataFrame, dict de columnas, lista de
+# dicts (como llegan los /batch) o lista de modelos pydantic.
+Columnas = Union[pd.DataFrame, Dict[str, object], List[Dict], List[BaseModel]]
+
+# Valores distintos que se memorizan por regla: los campos categóricos tienen
+# pocos, y el límite evita que texto libre haga crecer la memoria sin tope.
+LIMITE_MEMO = 1024
+
+
+# === Tipos de feature ===
+class Columna:
+    def __init__(self, nombre: str, campo: str, tipo: Optional[type] = None):
+        self.nombre, self.campo, self.tipo = nombre, campo, tipo
+
+class PorValor:
+    def __init__(self, nombre: str, campo: str, regla: Callable, memorizar: bool = True):
+        self.nombre, self.campo, self.regla, self.memorizar = nombre, campo, regla, memorizar
+
+class Combinada:
+    def __init__(self, nombre: str, entradas: Sequence[str], operacion: Callable):
+        self.nombre, self.entradas, self.operacion = nombre, list(entradas), operacion
+
+Feature = Union[Columna, PorValor, Combinada]
+
+
+def mapa(nombre: str, campo: str, tabla: Dict, default, normalizar: Optional[Callable] = None) -> PorValor:
+    """tabla.get(valor, default), opcionalmente tras normalizar el valor (p. ej. str.lower)."""
+    if normalizar is None:
+        return PorValor(nombre, campo, lambda v: tabla.get(v, default))
+    return PorValor(nombre, campo, lambda v: tabla.get(normalizar(v), default))
+
+class Contiene(PorValor):
+    """
+    1 si alguna palabra aparece en el valor en minúsculas. Al compilar, los
+    Contiene de un mismo campo comparten un PalabrasClave: una pasada por texto.
+    """
+
+    def __init__(self, nombre: str, campo: str, palabras: Sequence[str]):
+        super().__init__(nombre, campo, regla=None)
+        self.palabras = tuple(palabras)
+
+def contiene(nombre: str, campo: str, palabras: Sequence[str]) -> Contiene:
+    return Contiene(nombre, campo, palabras)
+
+def pertenece(nombre: str, campo: str, conjunto) -> PorValor:
+    """1 si el valor (en minúsculas y sin espacios extremos) está en el conjunto."""
+    return PorValor(nombre, campo, lambda v: 1 if v.lower().strip() in conjunto else 0)
+
+
+class Especificacion:
+    def __init__(self, funcion: str, features: Sequence[Feature], salida: Sequence[str], dtype_vacio):
+        self.funcion = funcion
+        self.features = list(features)
+        self.salida = list(salida)
+        # dtype de la matriz de un lote vacío (el de una fila normal)
+        self.dtype_vacio = dtype_vacio
+
+
+# === Compilación ===
+def _aprender(memo: Dict, regla: Callable) -> Callable:
+    """Evalúa la regla para un valor nuevo y lo guarda en el memo (hasta LIMITE_MEMO)."""
+    def evaluar(valor):
+        resultado = regla(valor)
+        if len(memo) < LIMITE_MEMO:
+            memo[valor] = resultado
+        return resultado
+
+    return evaluar
+
+
+def _reglas(features: Sequence[Feature]) -> List[Optional[Callable]]:
+    """Regla de cada feature; las Contiene salen de un PalabrasClave por campo."""
+    grupos = {}
+    for feature in features:
+        if isinstance(feature, Contiene):
+            grupos.setdefault(feature.campo, {})[feature.nombre] = feature.palabras
+    buscadores = {campo: PalabrasClave(banderas) for campo, banderas in grupos.items()}
+    return [
+        buscadores[f.campo].bandera(f.nombre) if isinstance(f, Contiene) else getattr(f, "regla", None)
+        for f in features
+    ]
+
+def _frame(columnas: Columnas, campos: Sequence[str]) -> pd.DataFrame:
+    if isinstance(columnas, pd.DataFrame):
+        return columnas.reset_index(drop=True)
+    if isinstance(columnas, list) and columnas and isinstance(columnas[0], BaseModel):
+        # Columnas leídas por atributo, sin pasar cada modelo por .dict()
+        return pd.DataFrame({campo: [getattr(m, campo) for m in columnas] for campo in campos})
+    return pd.DataFrame(columnas)
+
+def _lookup(col: pd.Series, regla: Callable) -> np.ndarray:
+    """Aplica `regla` una vez por valor distinto y expande con un take."""
+    codigos, unicos = pd.factorize(col, use_na_sentinel=False)
+    return np.array([regla(u) for u in unicos]).take(codigos)
+
+def _columna(col: pd.Series, tipo: Optional[type]) -> np.ndarray:
+    valores = col.to_numpy()
+    if tipo is int:
+        return valores.astype(np.int64)
+    if tipo is bool:
+        return valores.astype(bool)
+    if tipo is float:
+        return valores.astype(np.float64)
+    # Tal cual: el dtype final lo decide _matriz
+    if valores.dtype == object:
+        valores = np.array(valores.tolist())
+    return valores
+
+def _matriz(columnas: List[np.ndarray]) -> np.ndarray:
+    # Mismo dtype que np.array(features) en la versión fila a fila
+    dtype = np.result_type(*[c.dtype for c in columnas])
+    return np.column_stack(columnas).astype(dtype, copy=False)
+
+
+class Codificador:
+    """Forma compilada de una Especificacion."""
+
+    def __init__(self, spec: Especificacion):
+        self.funcion = spec.funcion
+        self.salida = spec.salida
+        self.n_features = len(spec.salida)
+        self.dtype_vacio = spec.dtype_vacio
+        self._features = spec.features
+        self._reglas = _reglas(spec.features)
+        self.campos = sorted({f.campo for f in spec.features if not isinstance(f, Combinada)})
+
+        nombres = [f.nombre for f in spec.features]
+        posicion = {nombre: i for i, nombre in enumerate(nombres)}
+        faltan = [n for n in spec.salida if n not in posicion]
+        if faltan:
+            raise ValueError(f"❌ {spec.funcion}: features de salida sin definir: {faltan}")
+
+        self._indices_salida = [posicion[n] for n in spec.salida]
+        self.fila = self._generar_fila(posicion)
+
+    def _generar_fila(self, posicion: Dict[str, int]) -> Callable:
+        """
+        Genera el código de fila(): una asignación por feature, sin bucles ni
+        diccionarios intermedios. Las reglas memorizadas consultan su memo en
+        línea y solo llaman a la regla con valores nuevos.
+        """
+        entorno = {"_array": np.array}
+
+        def cuerpo(leer: Callable[[str], str]) -> List[str]:
+            lineas = []
+            for i, feature in enumerate(self._features):
+                if isinstance(feature, Columna):
+                    valor = leer(feature.campo)
+                    if feature.tipo is not None:
+                        entorno[f"t{i}"] = feature.tipo
+                        valor = f"t{i}({valor})"
+                    lineas.append(f"v{i} = {valor}")
+                elif isinstance(feature, PorValor) and feature.memorizar:
+                    memo = {}
+                    entorno[f"m{i}"] = memo
+                    entorno[f"a{i}"] = _aprender(memo, self._reglas[i])
+                    lineas.append(f"x = {leer(feature.campo)}")
+                    lineas.append(f"v{i} = m{i}[x] if x in m{i} else a{i}(x)")
+                elif isinstance(feature, PorValor):
+                    entorno[f"r{i}"] = self._reglas[i]
+                    lineas.append(f"v{i} = r{i}({leer(feature.campo)})")
+                else:
+                    entorno[f"c{i}"] = feature.operacion
+                    args = ", ".join(f"v{posicion[e]}" for e in feature.entradas)
+                    lineas.append(f"v{i} = int(c{i}({args}))")
+            salida = ", ".join(f"v{i}" for i in self._indices_salida)
+            lineas.append(f"return _array([[{salida}]])")
+            return lineas
+
+        codigo = ["def fila(datos):", "    if type(datos) is dict:"]
+        codigo += ["        " + l for l in cuerpo(lambda campo: f"datos[{campo!r}]")]
+        codigo += ["    " + l for l in cuerpo(lambda campo: f"datos.{campo}")]
+        exec(compile("\n".join(codigo), f"<fila {self.funcion}>", "exec"), entorno)
+        fila = entorno["fila"]
+        fila.__doc__ = "Un registro (modelo pydantic o dict) -> matriz (1, n_features)."
+        return fila
+
+    def lote(self, columnas: Columnas) -> np.ndarray:
+        """Muchos registros -> matriz (n, n_features), idéntica a apilar fila()."""
+        df = _frame(columnas, self.campos)
+        if len(df) == 0:
+            return np.empty((0, self.n_features), dtype=self.dtype_vacio)
+        calculadas = {}
+        for feature, regla in zip(self._features, self._reglas):
+            if isinstance(feature, Columna):
+                calculadas[feature.nombre] = _columna(df[feature.campo], feature.tipo)
+            elif isinstance(feature, PorValor):
+                col = df[feature.campo]
+                if feature.memorizar:
+                    calculadas[feature.nombre] = _lookup(col, regla)
+                else:
+                    calculadas[feature.nombre] = np.array([regla(v) for v in col])
+            else:
+                entradas = [calculadas[e] for e in feature.entradas]
+                calculadas[feature.nombre] = np.asarray(feature.operacion(*entradas)).astype(np.int64)
+        return _matriz([calculadas[n] for n in self.salida])
+
+
+def compilar(spec: Especificacion) -> Codificador:
+    return Codificador(spec)
+
+
+def _alguna(*flags):
+    resultado = flags[0]
+    for flag in flags[1:]:
+        resultado = resultado | flag
+    return resultado
+
+
+# === SALUD ===
+SALUD = Especificacion("salud", [
+    mapa("nivel", "nivel_atencion", SALUD_NIVEL_MAP, 1),
+    mapa("tipo", "tipo_establecimiento", SALUD_TIPO_MAP, 7),
+    mapa("camas", "camas_internamiento", SALUD_CAMAS_MAP, 0),
+    Columna("no_autosuficientes", "usuarios_no_autosuficientes", int),
+    mapa("capacidad", "capacidad_atencion", SALUD_CAPACIDAD_MAP, 2),
+    PorValor("num_servicios", "servicios_disponibles",
+             lambda v: len(set(v) & SALUD_SERVICIOS_CLAVE), memorizar=False),
+    Columna("urgencias_24h", "urgencias_24h", int),
+    mapa("especialidades", "num_especialidades", SALUD_ESPECIALIDADES_MAP, 1),
+    mapa("pisos", "num_pisos", SALUD_PISOS_MAP, 2),
+    Columna("area_construida", "area_construida", float),
+    Columna("personal_medico", "personal_medico_total", int)
+], salida=[
+    "nivel", "tipo", "camas", "no_autosuficientes", "capacidad", "num_servicios",
+    "urgencias_24h", "especialidades", "pisos", "area_construida", "personal_medico"
+], dtype_vacio=np.float64)
+
+# === ENCUENTRO ===
+# Cualquier tipo_actividad es válido: los que no son de uso 2.4 → 0
+ENCUENTRO = Especificacion("encuentro", [
+    pertenece("es_2_4", "tipo_actividad", ENCUENTRO_USOS_2_4),
+    Columna("carga_ocupantes", "carga_ocupantes"),
+    Columna("sotano", "ubicado_en_sotano", int),
+    Columna("num_pisos", "num_pisos"),
+    Columna("area_total", "area_total_m2"),
+    Columna("recurrente", "evento_recurrente", int),
+    mapa("horario", "horario_funcionamiento", ENCUENTRO_HORARIO_MAP, 1)  # default: diurno
+], salida=[
+    "es_2_4", "carga_ocupantes", "sotano", "num_pisos", "area_total", "recurrente", "horario"
+], dtype_vacio=np.float64)
+
+# === HOSPEDAJE ===
+# Solo 'ecolodge' y 'albergue' son especiales; cualquier otro tipo → 0.
+# Con estacionamiento en sótano se asume un área de 600 m² (clave para 3.4).
+HOSPEDAJE = Especificacion("hospedaje", [
+    Columna("estrellas", "categoria_estrellas"),
+    pertenece("tipo_especial", "tipo_hospedaje", HOSPEDAJE_TIPOS_ESPECIALES),
+    Columna("num_pisos", "num_pisos"),
+    Columna("sotano", "tiene_sotano", int),
+    Columna("habitaciones", "num_habitaciones"),
+    Columna("capacidad", "capacidad_ocupantes"),
+    Columna("uso_mixto", "uso_mixto", int),
+    Columna("estacionamiento", "tiene_estacionamiento", int),
+    Columna("estacionamiento_sotano", "estacionamiento_en_sotano", int),
+    PorValor("area_estacionamiento", "estacionamiento_en_sotano", lambda v: 600.0 if v else 0.0)
+], salida=[
+    "estrellas", "tipo_especial", "num_pisos", "sotano", "habitaciones", "capacidad",
+    "uso_mixto", "estacionamiento", "estacionamiento_sotano", "area_estacionamiento"
+], dtype_vacio=np.float64)
+
+# === EDUCACIÓN ===
+EDUCACION = Especificacion("educacion", [
+    pertenece("es_basico", "nivel_educativo", EDUCACION_NIVELES_BASICOS),
+    PorValor("nivel_superior", "nivel_educativo", lambda v: "superior" in v.lower().strip()),
+    PorValor("institucion_superior", "tipo_institucion",
+             lambda v: v.lower().strip() in EDUCACION_INSTITUCIONES_SUPERIOR),
+    Combinada("es_superior", ["institucion_superior", "nivel_superior"], _alguna),
+    PorValor("num_pisos", "numero_pisos", educacion_num_pisos),
+    mapa("area", "area_construida_m2", EDUCACION_AREA_MAP, 1000),
+    Columna("discapacidad", "atiende_personas_discapacidad", int),
+    mapa("capacidad", "capacidad_alumnos", EDUCACION_CAP_MAP, 200),
+    Columna("aulas", "cantidad_aulas"),
+    contiene("es_remodelada", "tipo_edificacion", ("remodelada", "acondicionada"))
+], salida=[
+    "es_basico", "es_superior", "num_pisos", "area", "discapacidad", "capacidad", "aulas", "es_remodelada"
+], dtype_vacio=np.int64)
+
+# === INDUSTRIAL ===
+INDUSTRIAL = Especificacion("industrial", [
+    contiene("proceso_manual", "tipo_proceso_productivo", ("manual",)),
+    contiene("maquinaria_herramienta", "tipo_maquinaria_principal", ("herramienta",)),
+    contiene("establecimiento_artesanal", "tipo_establecimiento", ("artesanal",)),
+    contiene("producto_artesania", "tipo_producto_fabricado", ("artesanía",)),
+    Combinada("es_artesanal", [
+        "proceso_manual", "maquinaria_herramienta", "establecimiento_artesanal", "producto_artesania"
+    ], _alguna),
+    Columna("trabaja_explosivos", "trabaja_materiales_explosivos", bool),
+    contiene("producto_explosivo", "tipo_producto_fabricado", INDUSTRIAL_PALABRAS_PRODUCTO_EXPLOSIVO),
+    contiene("peligro_muy_alto", "nivel_peligrosidad_insumos", ("muy alto",)),
+    contiene("establecimiento_explosivo", "tipo_establecimiento", INDUSTRIAL_PALABRAS_ESTABLECIMIENTO_EXPLOSIVO),
+    Combinada("es_explosivo", [
+        "trabaja_explosivos", "producto_explosivo", "peligro_muy_alto", "establecimiento_explosivo"
+    ], _alguna),
+    mapa("escala", "escala_produccion", INDUSTRIAL_ESCALA_MAP, 2, str.lower),  # default: Pequeña Serie
+    mapa("area", "area_produccion_m2", INDUSTRIAL_AREA_MAP, 125),
+    mapa("trabajadores", "numero_trabajadores", INDUSTRIAL_TRAB_MAP, 8),
+    mapa("peligro", "nivel_peligrosidad_insumos", INDUSTRIAL_PELIGRO_MAP, 1, str.lower),
+    Columna("comercializacion", "tiene_area_comercializacion_integrada", int)
+], salida=[
+    "es_artesanal", "es_explosivo", "escala", "area", "trabajadores", "peligro", "comercializacion"
+], dtype_vacio=np.int64)
+
+# === OFICINAS ===
+OFICINAS = Especificacion("oficinas", [
+    mapa("area_por_piso", "area_techada_por_piso_m2", OFICINAS_AREA_POR_PISO_MAP, 300),
+    PorValor("pisos", "numero_pisos_edificacion", oficinas_num_pisos),
+    # Cumple 6.1: ≤4 pisos y ≤560 m² por piso; es 6.5: >560 m² por piso
+    Combinada("cumple_6_1", ["pisos", "area_por_piso"], lambda p, a: (p <= 4) & (a <= 560)),
+    Combinada("es_6_5", ["area_por_piso"], lambda a: a > 560),
+    # Conformidad reciente: vigente y ≤5 años en 2025
+    Columna("año_conformidad", "año_conformidad_obra"),
+    Columna("conformidad_vigente", "tiene_conformidad_obra_vigente", bool),
+    Combinada("conformidad_reciente", ["conformidad_vigente", "año_conformidad"],
+              lambda vigente, año: vigente & (OFICINAS_AÑO_ACTUAL - año <= 5)),
+    contiene("uso_compartido", "tipo_ocupacion_edificio", ("compartido",)),
+    PorValor("itse_vigente", "areas_comunes_tienen_itse_vigente", lambda v: 1 if v.lower() == "sí" else 0),
+    mapa("area_total", "area_techada_total_m2", OFICINAS_AREA_TOTAL_MAP, 1250),
+    Columna("ha_remodelado", "ha_tenido_remodelaciones_ampliaciones", int)
+], salida=[
+    "cumple_6_1", "es_6_5", "conformidad_reciente", "uso_compartido", "itse_vigente",
+    "area_por_piso", "pisos", "area_total", "año_conformidad", "ha_remodelado"
+], dtype_vacio=np.int64)
+
+# === COMERCIO ===
+COMERCIO = Especificacion("comercio", [
+    mapa("area_total", "area_techada_total_m2", COMERCIO_AREA_TOTAL_MAP, 525),
+    PorValor("pisos", "numero_pisos_edificacion", comercio_num_pisos),
+    # Cumple 7.1: ≤3 pisos y ≤750 m²; es 7.3: >3 pisos o >750 m²
+    Combinada("cumple_7_1", ["pisos", "area_total"], lambda p, a: (p <= 3) & (a <= 750)),
+    Combinada("es_7_3", ["pisos", "area_total"], lambda p, a: (p > 3) | (a > 750)),
+    # Es 7.2: módulo con licencia corporativa
+    contiene("es_modulo", "tipo_establecimiento_comercial", ("módulo", "stand", "puesto")),
+    PorValor("licencia_corporativa", "tipo_licencia_funcionamiento", lambda v: v == COMERCIO_LICENCIA_CORPORATIVA),
+    Combinada("es_7_2", ["es_modulo", "licencia_corporativa"], lambda m, l: m & l),
+    # Es 7.4: uso mixto o áreas comunes
+    contiene("es_7_4", "uso_edificacion", ("mixto", "áreas comunes")),
+    # Es 7.5: establecimientos comerciales grandes
+    contiene("es_7_5", "tipo_establecimiento_comercial", COMERCIO_ESTABLECIMIENTOS_7_5),
+    # Es 7.6: productos peligrosos
+    Columna("comercializa_explosivos", "comercializa_productos_explosivos_pirotecnicos", bool),
+    contiene("productos_peligrosos", "tipo_productos_peligrosos", COMERCIO_PALABRAS_7_6),
+    Combinada("es_7_6", ["comercializa_explosivos", "productos_peligrosos"], _alguna),
+    mapa("area_venta", "area_venta_m2", COMERCIO_AREA_VENTA_MAP, 350),
+    mapa("locales", "numero_locales_comerciales_edificio", COMERCIO_LOCALES_MAP, 1),
+    PorValor("modalidad", "modalidad_operacion", comercio_modalidad_num)
+], salida=[
+    "cumple_7_1", "es_7_3", "es_7_2", "es_7_4", "es_7_5", "es_7_6",
+    "area_total", "pisos", "area_venta", "locales", "modalidad"
+], dtype_vacio=np.int64)
+
+# === ALMACÉN ===
+ALMACEN = Especificacion("almacen", [
+    # Es 8.3: productos peligrosos
+    Columna("almacena_explosivos", "almacena_productos_explosivos_pirotecnicos", bool),
+    contiene("productos_peligrosos", "tipo_productos_almacenados", ALMACEN_PALABRAS_8_3),
+    Combinada("es_8_3", ["almacena_explosivos", "productos_peligrosos"], _alguna),
+    # Es 8.1: no techado
+    PorValor("cobertura_no_techado", "tipo_cobertura", lambda v: v == "No Techado"),
+    PorValor("techado_0", "porcentaje_area_techada", lambda v: v == "0%"),
+    Combinada("es_8_1", ["cobertura_no_techado", "techado_0"], _alguna),
+    mapa("porcentaje", "porcentaje_area_techada", ALMACEN_PORCENTAJE_MAP, 50),
+    mapa("cobertura", "tipo_cobertura", ALMACEN_COBERTURA_MAP, 1, str.lower),
+    mapa("cerramiento", "tipo_cerramiento", ALMACEN_CERRAMIENTO_MAP, 1, str.lower),
+    mapa("nfpa", "nivel_peligrosidad_nfpa", ALMACEN_NFPA_MAP, 0),
+    Columna("areas_admin", "tiene_areas_administrativas_techadas", int),
+    mapa("area_admin", "area_administrativa_servicios_m2", ALMACEN_AREA_ADMIN_MAP, 30),
+    # Es estacionamiento
+    contiene("uso_estacionamiento", "uso_principal", ("estacionamiento",)),
+    contiene("establecimiento_vehicular", "tipo_establecimiento", ("vehicular",)),
+    Combinada("es_estacionamiento", ["uso_estacionamiento", "establecimiento_vehicular"], _alguna)
+], salida=[
+    "es_8_3", "es_8_1", "porcentaje", "cobertura", "cerramiento", "nfpa",
+    "areas_admin", "area_admin", "es_estacionamiento"
+], dtype_vacio=np.int64)
+
+
+ESPECIFICACIONES = [SALUD, ENCUENTRO, HOSPEDAJE, EDUCACION, INDUSTRIAL, OFICINAS, COMERCIO, ALMACEN]
+
+# Compiladas una sola vez al importar
+CODIFICADORES: Dict[str, Codificador] = {spec.funcion: compilar(spec) for spec in ESPECIFICACIONES}
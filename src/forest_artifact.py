@@ -0,0 +1,182 @@
+# src/forest_artifact.py
+"""
+Artefacto compacto .npz para los bosques, abierto con memoria mapeada.
+
+`exportar_npz` guarda los arrays planos de FlatForest en un .npz SIN
+comprimir (np.savez): cada miembro queda almacenado tal cual dentro del zip,
+así que `cargar_npz` puede mapearlo directamente desde el archivo. Varios
+workers de uvicorn comparten entonces una única copia en la caché de páginas
+y cargar un modelo es leer unas cabeceras, no deserializar 100 árboles.
+
+Formato (v1):
+- feature:            int16  (índice de feature de cada nodo; 0 en hojas)
+- threshold:          float32, redondeado hacia abajo (ver _umbral_float32)
+- children:           int32  [izq0, der0, izq1, der1, ...] con índices globales
+- missing_go_to_left: bool
+- value:              float64 (exacto), float32 o uint16 cuantizado
+- roots:              int32
+- classes:            etiquetas de clase (unicode)
+- meta:               int64 [version, n_features_in_, n_estimators, max_depth, escala_valor]
+- sha256:             uint8[32], SHA-256 de los demás miembros (opcional)
+
+Por defecto las hojas se guardan en float64: es un cambio deliberado
+respecto a cuantizarlas siempre, porque así predict_proba da exactamente
+las mismas probabilidades que el .pkl. float32 y uint16 quedan como opción
+explícita de exportar_modelos.py para quien prefiera un artefacto más chico.
+
+El miembro sha256 es la huella del modelo: `huella_npz` la lee sin tocar el
+resto del archivo, así que el registro obtiene la versión sin leer todas las
+páginas que después mapea. Un .npz exportado antes de que existiera se
+sigue cargando; su versión sale del hash del archivo completo.
+"""
+import hashlib
+import os
+import struct
+import zipfile
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.forest_engine import FlatForest
+
+FORMATO_VERSION = 1
+VALORES = ("float64", "float32", "uint16")
+# Con uint16 cada fracción de hoja se guarda como round(p * ESCALA_UINT16)
+ESCALA_UINT16 = 65535
+
+
+def _umbral_float32(threshold: np.ndarray) -> np.ndarray:
+    """
+    Mayor float32 <= threshold. Como X ya se compara en float32,
+    `x <= t` con t float64 equivale exactamente a `x <= t32` con este t32,
+    así que reducir los umbrales a 4 bytes no cambia ninguna decisión.
+    """
+    t32 = threshold.astype(np.float32)
+    arriba = t32.astype(np.float64) > threshold
+    t32[arriba] = np.nextafter(t32[arriba], np.float32(-np.inf))
+    return t32
+
+def _tipo_indice(maximo: int):
+    return np.int16 if maximo <= np.iinfo(np.int16).max else np.int32
+
+def _huella(arrays: Dict[str, np.ndarray]) -> np.ndarray:
+    sha = hashlib.sha256()
+    for nombre in sorted(arrays):
+        arr = np.ascontiguousarray(arrays[nombre])
+        sha.update(f"{nombre}:{arr.dtype.str}:{arr.shape}".encode())
+        sha.update(arr.tobytes())
+    return np.frombuffer(sha.digest(), dtype=np.uint8)
+
+
+def exportar_npz(modelo, ruta: str, valores: str = "float64") -> Dict:
+    """Exporta un RandomForestClassifier entrenado; devuelve tamaños por array."""
+    if valores not in VALORES:
+        raise ValueError(f"❌ Formato de valores desconocido: {valores!r} (opciones: {', '.join(VALORES)})")
+    plano = modelo if isinstance(modelo, FlatForest) else FlatForest(modelo)
+    if plano.n_nodes * 2 > np.iinfo(np.int32).max:
+        raise ValueError("❌ El bosque tiene demasiados nodos para índices int32")
+
+    escala = 1
+    if valores == "uint16":
+        escala = ESCALA_UINT16
+        value = np.rint(plano.value * escala).astype(np.uint16)
+    else:
+        value = plano.value.astype(valores)
+
+    arrays = {
+        "feature": plano.feature.astype(_tipo_indice(plano.n_features_in_)),
+        "threshold": _umbral_float32(plano.threshold),
+        "children": plano.children.astype(np.int32),
+        "missing_go_to_left": plano.missing_go_to_left.astype(bool),
+        "value": value,
+        "roots": plano.roots.astype(np.int32),
+        "classes": np.asarray(plano.classes_).astype(str),
+        "meta": np.array(
+            [FORMATO_VERSION, plano.n_features_in_, plano.n_estimators, plano.max_depth, escala],
+            dtype=np.int64
+        )
+    }
+    arrays["sha256"] = _huella(arrays)
+    # Escritura atómica: el vigilante de recarga nunca ve un .npz a medias
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(temporal, ruta)
+    return {nombre: arr.nbytes for nombre, arr in arrays.items()}
+
+
+def _mapear_miembros(ruta: str) -> Dict[str, np.ndarray]:
+    """Mapea cada .npy de un .npz sin comprimir (np.load ignora mmap_mode en .npz)."""
+    arrays = {}
+    with zipfile.ZipFile(ruta) as zf, open(ruta, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"❌ {ruta}: el miembro {info.filename} está comprimido; exportar con np.savez")
+            # Cabecera local del zip: 30 bytes fijos + nombre + campo extra
+            f.seek(info.header_offset)
+            cabecera = f.read(30)
+            largo_nombre, largo_extra = struct.unpack("<HH", cabecera[26:30])
+            f.seek(info.header_offset + 30 + largo_nombre + largo_extra)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            nombre = info.filename[:-len(".npy")]
+            if dtype.hasobject:
+                raise ValueError(f"❌ {ruta}: el miembro {nombre} contiene objetos Python")
+            if int(np.prod(shape)) == 0:
+                arrays[nombre] = np.empty(shape, dtype=dtype)
+                continue
+            mapa = np.memmap(
+                ruta, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                order="F" if fortran else "C"
+            )
+            arrays[nombre] = mapa.view(np.ndarray)
+    return arrays
+
+
+def cargar_npz(ruta: str, mmap: bool = True) -> FlatForest:
+    """
+    FlatForest listo para predict_proba a partir de un .npz de exportar_npz.
+    Con mmap=True los arrays son vistas de solo lectura sobre el archivo.
+    """
+    if mmap:
+        arrays = _mapear_miembros(ruta)
+    else:
+        with np.load(ruta, allow_pickle=False) as datos:
+            arrays = {nombre: datos[nombre] for nombre in datos.files}
+
+    version, n_features, n_estimators, max_depth, escala = (int(v) for v in arrays["meta"])
+    if version != FORMATO_VERSION:
+        raise ValueError(f"❌ {ruta}: versión de formato {version} no soportada (se espera {FORMATO_VERSION})")
+
+    bosque = FlatForest.__new__(FlatForest)
+    bosque.classes_ = np.asarray(arrays["classes"]).astype(object)
+    bosque.n_features_in_ = n_features
+    bosque.n_estimators = n_estimators
+    bosque.max_depth = max_depth
+    bosque.escala_valor = escala
+    bosque.feature = arrays["feature"]
+    bosque.threshold = arrays["threshold"]
+    bosque.children = arrays["children"]
+    bosque.left = bosque.children[0::2]
+    bosque.right = bosque.children[1::2]
+    bosque.missing_go_to_left = arrays["missing_go_to_left"]
+    bosque.value = arrays["value"]
+    bosque.roots = arrays["roots"]
+    return bosque
+
+
+def huella_npz(ruta: str) -> Optional[str]:
+    """SHA-256 (hex) guardado en el artefacto, o None si se exportó sin él."""
+    with zipfile.ZipFile(ruta) as zf:
+        if "sha256.npy" not in zf.namelist():
+            return None
+        with zf.open("sha256.npy") as f:
+            return np.lib.format.read_array(f, allow_pickle=False).tobytes().hex()
+
+
+def ruta_npz(ruta_pkl: str) -> str:
+    """models/rf_salud.pkl -> models/rf_salud.npz"""
+    return os.path.splitext(ruta_pkl)[0] + ".npz"
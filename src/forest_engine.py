@@ -0,0 +1,126 @@
+# src/forest_engine.py
+"""
+Motor de inferencia para RandomForestClassifier sobre arrays planos.
+
+Exporta los 100 árboles de un bosque a arrays NumPy contiguos (feature,
+threshold, hijo izquierdo/derecho y distribución de clases de cada hoja) y
+recorre todos los árboles a la vez, de forma vectorizada para todo el lote.
+Evita la validación de entrada, el despacho de joblib y las llamadas Python
+por árbol de sklearn, que dominan el costo con 7-11 features por fila.
+
+Las probabilidades son idénticas bit a bit a model.predict_proba:
+- X se convierte a float32 y se compara con el threshold float64, como en sklearn;
+- los NaN siguen missing_go_to_left;
+- cada hoja devuelve tree_.value tal cual, como DecisionTreeClassifier.predict_proba;
+- los árboles se acumulan en el mismo orden y se divide por n_estimators.
+"""
+import numpy as np
+
+
+class FlatForest:
+    """Bosque aplanado con la misma interfaz mínima que usa model_loader."""
+
+    def __init__(self, model):
+        self.classes_ = model.classes_
+        self.n_features_in_ = model.n_features_in_
+        self.n_estimators = len(model.estimators_)
+
+        features, thresholds, lefts, rights, missing_left, values = [], [], [], [], [], []
+        roots = np.zeros(self.n_estimators, dtype=np.int64)
+        offset = 0
+        max_depth = 0
+        for t, estimator in enumerate(model.estimators_):
+            tree = estimator.tree_
+            n = tree.node_count
+            roots[t] = offset
+            max_depth = max(max_depth, tree.max_depth)
+
+            es_hoja = tree.children_left == -1
+            idx = np.arange(n, dtype=np.int64)
+            # Las hojas apuntan a sí mismas: recorrer max_depth pasos siempre
+            # termina en una hoja sin ramas por fila.
+            lefts.append(np.where(es_hoja, idx, tree.children_left) + offset)
+            rights.append(np.where(es_hoja, idx, tree.children_right) + offset)
+            features.append(np.where(es_hoja, 0, tree.feature))
+            thresholds.append(np.where(es_hoja, np.inf, tree.threshold))
+            missing_left.append(tree.missing_go_to_left.astype(bool))
+
+            # Igual que DecisionTreeClassifier.predict_proba (una sola salida):
+            # desde scikit-learn 1.4 tree_.value ya guarda fracciones por hoja.
+            values.append(tree.value[:, 0, :len(self.classes_)])
+            offset += n
+
+        self.feature = np.ascontiguousarray(np.concatenate(features), dtype=np.int64)
+        self.threshold = np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64)
+        self.left = np.ascontiguousarray(np.concatenate(lefts), dtype=np.int64)
+        self.right = np.ascontiguousarray(np.concatenate(rights), dtype=np.int64)
+        self.missing_go_to_left = np.ascontiguousarray(np.concatenate(missing_left))
+        self.value = np.ascontiguousarray(np.concatenate(values), dtype=np.float64)
+        self.roots = roots
+        self.max_depth = max_depth
+        self._init_children()
+
+    def _init_children(self) -> None:
+        # [izq0, der0, izq1, der1, ...]: el siguiente nodo es children[2*nodo + va_a_la_derecha]
+        self.children = np.ascontiguousarray(
+            np.stack([self.left, self.right], axis=1).ravel(), dtype=np.int64
+        )
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def _validar(self, X) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X tiene {X.shape[-1] if X.ndim else 0} features, "
+                f"pero el modelo espera {self.n_features_in_}"
+            )
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if np.isinf(X).any():
+            raise ValueError("Input X contains infinity or a value too large for dtype('float32').")
+        return X
+
+    # Filas por bloque: acota la memoria temporal (filas x árboles) y la mantiene en caché
+    TAMAÑO_BLOQUE = 512
+
+    def apply(self, X) -> np.ndarray:
+        """Índice global de la hoja alcanzada en cada árbol: (n_muestras, n_estimators)."""
+        X = self._validar(X)
+        if X.shape[0] <= self.TAMAÑO_BLOQUE:
+            return self._apply_bloque(X)
+        return np.vstack([
+            self._apply_bloque(X[i:i + self.TAMAÑO_BLOQUE])
+            for i in range(0, X.shape[0], self.TAMAÑO_BLOQUE)
+        ])
+
+    def _apply_bloque(self, X: np.ndarray) -> np.ndarray:
+        n = X.shape[0]
+        filas = (np.arange(n, dtype=np.int64) * self.n_features_in_)[:, np.newaxis]
+        X_plano = X.ravel()
+        hay_nan = np.isnan(X).any()
+
+        nodos = np.broadcast_to(self.roots, (n, self.n_estimators)).copy()
+        for _ in range(self.max_depth):
+            x = X_plano.take(filas + self.feature.take(nodos))
+            derecha = ~(x <= self.threshold.take(nodos))
+            if hay_nan:
+                derecha &= ~(np.isnan(x) & self.missing_go_to_left.take(nodos))
+            nodos = self.children.take(2 * nodos + derecha)
+        return nodos
+
+    # Divisor de value: 1 con fracciones exactas; 65535 si las hojas vienen
+    # cuantizadas a uint16 (src/forest_artifact.py).
+    escala_valor = 1
+
+    def predict_proba(self, X) -> np.ndarray:
+        hojas = self.apply(X)
+        # (n_estimators, n, n_clases): reducir sobre el eje 0 suma árbol por
+        # árbol en orden, igual que el acumulador de sklearn.
+        proba = np.add.reduce(self.value[hojas.T], axis=0, dtype=np.float64)
+        proba /= self.n_estimators * self.escala_valor
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,75 @@
+# src/keyword_matcher.py
+"""
+Banderas de palabras clave precompiladas.
+
+Reglas como `any(p in texto.lower() for p in [...])` (industrial, comercio,
+almacén y sus scripts de entrenamiento) recorren el texto una vez por
+palabra. PalabrasClave junta todas las palabras de todas las banderas de un
+campo en una sola expresión regular de alternancia y responde todas las
+banderas con una pasada. El resultado se guarda por texto distinto: estos
+campos tienen pocos valores en la práctica.
+
+Da lo mismo que `p in texto.lower()`: subcadena exacta, sin normalizar
+acentos ("pirotécnico" no coincide con "pirotecnico" ni al revés).
+"""
+import re
+from collections import namedtuple
+from typing import Callable, Dict, Sequence
+
+# Textos distintos que se guardan por buscador
+LIMITE_CACHE = 1024
+
+
+class PalabrasClave:
+    """
+    banderas: nombre -> palabras. buscador(texto) devuelve una tupla con
+    nombre (namedtuple) de 0/1 por bandera, en el orden de `banderas`.
+    """
+
+    def __init__(self, banderas: Dict[str, Sequence[str]]):
+        self.nombres = tuple(banderas)
+        self._Banderas = namedtuple("Banderas", self.nombres)
+
+        palabras = sorted({p for lista in banderas.values() for p in lista}, key=lambda p: (-len(p), p))
+        # Bits de las banderas que activa cada palabra encontrada: las suyas y
+        # las de toda palabra contenida en ella (si aparece "fuegos artificiales"
+        # también aparece "fuegos", aunque la regex solo informe la más larga).
+        self._bits = {}
+        for palabra in palabras:
+            bits = 0
+            for i, lista in enumerate(banderas.values()):
+                if any(p in palabra for p in lista):
+                    bits |= 1 << i
+            self._bits[palabra] = bits
+
+        # Lookahead: prueba en cada posición del texto, así las coincidencias
+        # que se solapan también se encuentran. En una misma posición gana la
+        # palabra más larga y las más cortas salen por los bits de arriba.
+        self._regex = re.compile("(?=(" + "|".join(re.escape(p) for p in palabras) + "))") if palabras else None
+        self._ninguna = self._Banderas(*[0] * len(self.nombres))
+        self._cache = {}
+
+    def __call__(self, texto: str):
+        resultado = self._cache.get(texto)
+        if resultado is None:
+            resultado = self._buscar(texto)
+            if len(self._cache) < LIMITE_CACHE:
+                self._cache[texto] = resultado
+        return resultado
+
+    def _buscar(self, texto: str):
+        if self._regex is None:
+            return self._ninguna
+        bits = 0
+        for palabra in self._regex.findall(texto.lower()):
+            bits |= self._bits[palabra]
+        return self._Banderas(*[(bits >> i) & 1 for i in range(len(self.nombres))])
+
+    def bandera(self, nombre: str) -> Callable[[str], int]:
+        """Regla de una sola bandera: texto -> 0/1."""
+        i = self.nombres.index(nombre)
+        return lambda texto: self(texto)[i]
+
+    def alguna(self, texto: str) -> int:
+        """1 si se activa cualquiera de las banderas."""
+        return 1 if any(self(texto)) else 0
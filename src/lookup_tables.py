@@ -0,0 +1,167 @@
+# src/lookup_tables.py
+"""
+Tablas de predicción exhaustivas para funciones con espacio de features finito.
+
+Tras el preprocesamiento, INDUSTRIAL, ALMACÉN y COMERCIO solo producen
+valores discretos. Para ellas se enumeran al cargar todos los vectores
+alcanzables, se predice (clase, confianza) una sola vez y luego cada
+predicción es una búsqueda O(1) por índice de base mixta.
+
+Las funciones con entradas no acotadas (area_construida, cantidad_aulas,
+año_conformidad_obra, ...) no tienen tabla y siguen usando el bosque.
+Un vector fuera de la tabla también cae al bosque.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.feature_maps import (
+    INDUSTRIAL_AREA_MAP, INDUSTRIAL_TRAB_MAP, INDUSTRIAL_ESCALA_MAP, INDUSTRIAL_PELIGRO_MAP,
+    ALMACEN_PORCENTAJE_MAP, ALMACEN_COBERTURA_MAP, ALMACEN_CERRAMIENTO_MAP,
+    ALMACEN_NFPA_MAP, ALMACEN_AREA_ADMIN_MAP,
+    COMERCIO_AREA_TOTAL_MAP, COMERCIO_AREA_VENTA_MAP, COMERCIO_LOCALES_MAP
+)
+
+
+def _valores(mapa: Dict, default) -> List[int]:
+    """Valores posibles de `mapa.get(x, default)`."""
+    return sorted(set(mapa.values()) | {default})
+
+
+# === Dominio de cada feature (en el orden de preprocess_*) ===
+BINARIO = [0, 1]
+
+DOMINIO_INDUSTRIAL = [
+    BINARIO,                                  # es_artesanal
+    BINARIO,                                  # es_explosivo
+    _valores(INDUSTRIAL_ESCALA_MAP, 2),       # escala_num
+    _valores(INDUSTRIAL_AREA_MAP, 125),       # area_num
+    _valores(INDUSTRIAL_TRAB_MAP, 8),         # trab_num
+    _valores(INDUSTRIAL_PELIGRO_MAP, 1),      # peligro_num
+    BINARIO                                   # tiene_comercializacion
+]
+
+DOMINIO_ALMACEN = [
+    BINARIO,                                  # es_8_3
+    BINARIO,                                  # es_8_1
+    _valores(ALMACEN_PORCENTAJE_MAP, 50),     # porcentaje_num
+    _valores(ALMACEN_COBERTURA_MAP, 1),       # cobertura_num
+    _valores(ALMACEN_CERRAMIENTO_MAP, 1),     # cerramiento_num
+    _valores(ALMACEN_NFPA_MAP, 0),            # nfpa_num
+    BINARIO,                                  # tiene_areas_admin
+    _valores(ALMACEN_AREA_ADMIN_MAP, 30),     # area_admin_num
+    BINARIO                                   # es_estacionamiento
+]
+
+def _almacen_alcanzable(X: np.ndarray) -> np.ndarray:
+    es_8_1, porcentaje, cobertura = X[:, 1], X[:, 2], X[:, 3]
+    # "0%" siempre marca es_8_1; es_8_1 exige "0%" o cobertura "No Techado" (→ 0)
+    return ((porcentaje != 0) | (es_8_1 == 1)) & ((es_8_1 == 0) | (porcentaje == 0) | (cobertura == 0))
+
+DOMINIO_COMERCIO = [
+    BINARIO,                                  # cumple_7_1
+    BINARIO,                                  # es_7_3
+    BINARIO,                                  # es_7_2
+    BINARIO,                                  # es_7_4
+    BINARIO,                                  # es_7_5
+    BINARIO,                                  # es_7_6
+    _valores(COMERCIO_AREA_TOTAL_MAP, 525),   # area_total_num
+    [1, 2, 3, 5],                             # pisos_num
+    _valores(COMERCIO_AREA_VENTA_MAP, 350),   # area_venta_num
+    _valores(COMERCIO_LOCALES_MAP, 1),        # locales_num
+    [0, 1, 2]                                 # modalidad_num
+]
+
+def _comercio_alcanzable(X: np.ndarray) -> np.ndarray:
+    cumple_7_1, es_7_3, area_total, pisos = X[:, 0], X[:, 1], X[:, 6], X[:, 7]
+    return (
+        (cumple_7_1 == ((pisos <= 3) & (area_total <= 750))) &
+        (es_7_3 == ((pisos > 3) | (area_total > 750)))
+    )
+
+# funcion -> (dominios, filtro de alcanzables)
+ESPACIOS_FINITOS: Dict[str, Tuple[List[List[int]], Optional[Callable]]] = {
+    "industrial": (DOMINIO_INDUSTRIAL, None),
+    "almacen": (DOMINIO_ALMACEN, _almacen_alcanzable),
+    "comercio": (DOMINIO_COMERCIO, _comercio_alcanzable)
+}
+
+
+# === Tabla ===
+class TablaPrediccion:
+    """(clase, confianza) precalculadas para cada vector del producto de dominios."""
+
+    def __init__(self, dominios: Sequence[Sequence[int]], predictor,
+                 alcanzable: Optional[Callable] = None):
+        inicio = time.perf_counter()
+        self.dominios = [np.asarray(d, dtype=np.int64) for d in dominios]
+        self.posiciones = [{v: i for i, v in enumerate(d)} for d in dominios]
+        tamaños = [len(d) for d in dominios]
+        self.strides = [int(np.prod(tamaños[j + 1:], dtype=np.int64)) for j in range(len(tamaños))]
+        self.n_celdas = int(np.prod(tamaños, dtype=np.int64))
+
+        # Todas las combinaciones en orden C: la fila i tiene índice plano i
+        malla = np.indices(tamaños).reshape(len(tamaños), -1).T
+        X = np.column_stack([d[malla[:, j]] for j, d in enumerate(self.dominios)])
+        mascara = alcanzable(X) if alcanzable is not None else np.ones(len(X), dtype=bool)
+
+        self.classes_ = predictor.classes_
+        self._clases = [str(c) for c in self.classes_]
+        self.indice_clase = np.full(self.n_celdas, -1, dtype=np.int16)
+        self.confianza = np.zeros(self.n_celdas, dtype=np.float64)
+        if mascara.any():
+            probas = predictor.predict_proba(X[mascara])
+            idx = np.argmax(probas, axis=1)
+            self.indice_clase[mascara] = idx
+            self.confianza[mascara] = probas[np.arange(len(idx)), idx]
+
+        self.n_alcanzables = int(mascara.sum())
+        self.tiempo_construccion_s = time.perf_counter() - inicio
+
+    @property
+    def nbytes(self) -> int:
+        return self.indice_clase.nbytes + self.confianza.nbytes
+
+    def buscar(self, fila: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Búsqueda de una fila; None si el vector no está en la tabla."""
+        plano = 0
+        for valor, posiciones, stride in zip(fila.tolist(), self.posiciones, self.strides):
+            pos = posiciones.get(valor)
+            if pos is None:
+                return None
+            plano += pos * stride
+        c = self.indice_clase[plano]
+        if c < 0:
+            return None
+        return self._clases[c], float(self.confianza[plano])
+
+    def buscar_lote(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Índices de clase, confianzas y máscara de aciertos para todo el lote."""
+        n = X.shape[0]
+        plano = np.zeros(n, dtype=np.int64)
+        dentro = np.ones(n, dtype=bool)
+        for j, dominio in enumerate(self.dominios):
+            col = X[:, j]
+            pos = np.minimum(np.searchsorted(dominio, col), len(dominio) - 1)
+            dentro &= dominio[pos] == col
+            plano += pos * self.strides[j]
+        plano[~dentro] = 0
+        idx = np.where(dentro, self.indice_clase[plano], -1).astype(np.int64)
+        acierto = idx >= 0
+        conf = np.where(acierto, self.confianza[plano], 0.0)
+        return idx, conf, acierto
+
+
+def construir_tabla(funcion: str, predictor) -> Optional[TablaPrediccion]:
+    """Tabla de la función si su espacio es finito (None si no); informa tamaño y tiempo."""
+    if funcion not in ESPACIOS_FINITOS:
+        return None
+    dominios, alcanzable = ESPACIOS_FINITOS[funcion]
+    tabla = TablaPrediccion(dominios, predictor, alcanzable)
+    print(
+        f"📋 Tabla {funcion.upper()}: {tabla.n_alcanzables:,} vectores alcanzables "
+        f"de {tabla.n_celdas:,}, {tabla.nbytes / 1024:.0f} KB, "
+        f"construida en {tabla.tiempo_construccion_s * 1000:.0f} ms"
+    )
+    return tabla
@@ -0,0 +1,103 @@
+# src/matrix_protocol.py
+"""
+Formato binario de /funcion-{funcion}/matriz: features ya codificadas.
+
+Para tráfico masivo desde un ETL que ya calcula las features, el JSON y la
+validación de Funcion*Input cuestan más que el bosque. Este endpoint recibe
+directamente la matriz float32, con las columnas en el orden exacto que
+produce preprocess_* (GET /funcion-{funcion}/matriz lo informa), y responde
+en binario.
+
+Petición, una de dos:
+- .npy (np.save), dtype float32 en orden C, forma (n, n_features).
+- Crudo: cabecera de 12 bytes `<4sII` = (b"MTZ1", n_filas, n_columnas)
+  seguida de n_filas × n_columnas float32 little-endian por filas.
+
+En ambos casos la matriz se decodifica con np.frombuffer sobre el mismo
+buffer del cuerpo, sin copiarla.
+
+Respuesta (application/octet-stream): cabecera de 8 bytes `<4sI` =
+(b"RSP1", n), luego n confianzas float32 y n índices de clase uint16, todo
+little-endian. Los índices refieren a la lista JSON del header X-Clases; la
+versión del modelo va en X-Version-Modelo.
+
+Lectura de la respuesta en el cliente:
+    magia, n = struct.unpack_from("<4sI", cuerpo)
+    confianzas = np.frombuffer(cuerpo, "<f4", n, offset=8)
+    indices = np.frombuffer(cuerpo, "<u2", n, offset=8 + 4 * n)
+"""
+import ast
+import struct
+
+import numpy as np
+
+MEDIA_TYPE = "application/octet-stream"
+
+CABECERA = struct.Struct("<4sII")
+MAGIA = b"MTZ1"
+CABECERA_RESPUESTA = struct.Struct("<4sI")
+MAGIA_RESPUESTA = b"RSP1"
+
+_MAGIA_NPY = b"\x93NUMPY"
+_FLOAT32 = np.dtype("<f4")
+
+
+class MatrizInvalida(ValueError):
+    """El cuerpo no es una matriz float32 válida para el modelo."""
+
+
+def _cabecera_npy(cuerpo: bytes):
+    """(forma, dtype, orden fortran, offset de los datos) de un .npy."""
+    if len(cuerpo) < 10:
+        raise MatrizInvalida(".npy truncado")
+    mayor = cuerpo[6]
+    if mayor == 1:
+        largo, inicio = struct.unpack_from("<H", cuerpo, 8)[0], 10
+    elif mayor in (2, 3):
+        largo, inicio = struct.unpack_from("<I", cuerpo, 8)[0], 12
+    else:
+        raise MatrizInvalida(f"versión de .npy no soportada: {mayor}")
+    try:
+        cabecera = ast.literal_eval(cuerpo[inicio:inicio + largo].decode("latin1"))
+        return tuple(cabecera["shape"]), np.dtype(cabecera["descr"]), cabecera["fortran_order"], inicio + largo
+    except (ValueError, SyntaxError, KeyError, TypeError) as exc:
+        raise MatrizInvalida(f"cabecera .npy inválida: {exc}") from exc
+
+
+def decodificar(cuerpo: bytes, n_features: int) -> np.ndarray:
+    """Vista (n, n_features) float32 sobre `cuerpo`, de solo lectura."""
+    if cuerpo.startswith(_MAGIA_NPY):
+        forma, dtype, fortran, offset = _cabecera_npy(cuerpo)
+        if dtype != _FLOAT32:
+            raise MatrizInvalida(f"dtype {dtype.str} no soportado: se espera float32 little-endian (<f4)")
+        if fortran:
+            raise MatrizInvalida("la matriz debe estar en orden C (fortran_order=False)")
+        if len(forma) != 2:
+            raise MatrizInvalida(f"se espera una matriz 2D, llegó forma {forma}")
+        filas, columnas = forma
+    elif cuerpo.startswith(MAGIA):
+        if len(cuerpo) < CABECERA.size:
+            raise MatrizInvalida("cabecera MTZ1 truncada")
+        _, filas, columnas = CABECERA.unpack_from(cuerpo)
+        offset = CABECERA.size
+    else:
+        raise MatrizInvalida("cuerpo desconocido: se espera .npy o cabecera MTZ1")
+
+    if columnas != n_features:
+        raise MatrizInvalida(f"se esperan {n_features} columnas, llegaron {columnas}")
+    esperado = offset + filas * columnas * _FLOAT32.itemsize
+    if len(cuerpo) != esperado:
+        raise MatrizInvalida(f"tamaño del cuerpo {len(cuerpo)} bytes, se esperaban {esperado}")
+    X = np.frombuffer(cuerpo, dtype=_FLOAT32, count=filas * columnas, offset=offset).reshape(filas, columnas)
+    if not np.isfinite(X).all():
+        raise MatrizInvalida("la matriz tiene valores NaN o infinitos")
+    return X
+
+
+def codificar_respuesta(indices: np.ndarray, confianzas: np.ndarray) -> bytes:
+    n = len(indices)
+    return b"".join((
+        CABECERA_RESPUESTA.pack(MAGIA_RESPUESTA, n),
+        np.asarray(confianzas, dtype="<f4").tobytes(),
+        np.asarray(indices, dtype="<u2").tobytes()
+    ))
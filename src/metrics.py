@@ -0,0 +1,395 @@
+# src/metrics.py
+"""
+Métricas en formato de texto de Prometheus para GET /metrics, sin
+dependencias externas.
+
+Por función (y tipo de endpoint: individual, batch, arrow, stream, matriz):
+- ml_peticiones_total y ml_errores_total (codigo = estado HTTP >= 400, o
+  "excepcion" si el endpoint falló sin responder)
+- ml_peticion_segundos: histograma de la duración completa de la petición
+- ml_etapa_segundos{etapa}: histograma por etapa
+    validacion     desde que llega la petición hasta que empieza el endpoint:
+                   lectura del cuerpo, JSON y validación pydantic; en /batch
+                   suma además la validación por columnas, que corre dentro
+                   del endpoint (bloque `with etapa("validacion")`)
+    preprocess     codificación (preprocess_* o el codificador por lotes)
+    predict_proba  predicción: tabla exhaustiva, caché LRU o bosque
+    serializacion  desde que el endpoint devuelve hasta enviar el último byte
+- ml_registros_total: registros predichos (un /batch suma varios)
+
+Con ML_MICROBATCH=1, por función, los histogramas del coalescedor:
+ml_microbatch_lote_registros (tamaño de cada lote) y
+ml_microbatch_espera_segundos (espera en cola de cada petición).
+
+Al leerse se agregan la caché de predicciones (aciertos, fallos, tasa) y el
+estado de cada modelo (tiempo de carga, versión, memoria, recargas).
+
+validacion y serializacion salen de MetricasHTTP (middleware ASGI) y de
+RutaMedida, que marca inicio y fin del endpoint en la medición de la
+petición; preprocess y predict_proba las observa src/model_loader.py. Cada
+observación es un bisect y unas sumas bajo un lock sin contención: el costo
+total por petición es de pocos microsegundos.
+
+Con la misma medición (perf_counter_ns) cada respuesta de /funcion-* lleva la
+cabecera Server-Timing con el desglose validacion, codificacion, cache,
+modelo, serializacion y total (o microbatch si la predicción pasó por el
+coalescedor); con X-Detalle-Tiempos: 1 el endpoint lo agrega también en el
+cuerpo como "tiempos_ns". cache es la búsqueda en la tabla exhaustiva y la
+caché LRU; en /batch la tabla va dentro de modelo.
+
+Las métricas son por proceso: con varios workers, Prometheus debe leer cada
+uno (o agregarse en el scrape).
+"""
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi.routing import APIRoute
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Límites de los histogramas, en segundos (100 µs a 10 s)
+LIMITES_S = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Sufijo de la ruta /funcion-{funcion}... -> tipo de endpoint
+TIPOS = {"": "individual", "batch": "batch", "batch/arrow": "arrow", "stream": "stream", "matriz": "matriz"}
+
+
+class Histograma:
+    """
+    Histograma de buckets fijos (límites superiores inclusivos; el último
+    bucket es +Inf). Sin lock propio: lo protege quien lo usa.
+    """
+    __slots__ = ("limites", "cuentas", "suma")
+
+    def __init__(self, limites: Sequence[float] = LIMITES_S):
+        self.limites = tuple(limites)
+        self.cuentas = [0] * (len(self.limites) + 1)
+        self.suma = 0.0
+
+    def observar(self, valor: float) -> None:
+        self.cuentas[bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+
+    def valores(self) -> Tuple[tuple, List[int], float]:
+        """Copia (límites, cuentas por bucket, suma) para exponer."""
+        return self.limites, list(self.cuentas), self.suma
+
+    def snapshot(self) -> Dict:
+        limites, cuentas, suma = self.valores()
+        total = sum(cuentas)
+        buckets = {str(l): c for l, c in zip(limites, cuentas)}
+        buckets["+Inf"] = cuentas[-1]
+        return {
+            "buckets": buckets,
+            "suma": suma,
+            "total": total,
+            "promedio": (suma / total) if total else 0.0
+        }
+
+
+class Metricas:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.peticiones: Dict[tuple, int] = defaultdict(int)
+        self.errores: Dict[tuple, int] = defaultdict(int)
+        self.registros: Dict[str, int] = defaultdict(int)
+        self.duracion: Dict[tuple, Histograma] = defaultdict(Histograma)
+        self.etapas: Dict[tuple, Histograma] = defaultdict(Histograma)
+
+    def observar_prediccion(self, funcion: str, preprocess_s: Optional[float], prediccion_s: float,
+                            registros: int) -> None:
+        with self._lock:
+            if preprocess_s is not None:
+                self.etapas[funcion, "preprocess"].observar(preprocess_s)
+            self.etapas[funcion, "predict_proba"].observar(prediccion_s)
+            self.registros[funcion] += registros
+
+    def observar_peticion(self, funcion: str, tipo: str, codigo: Optional[str], total_s: float,
+                          validacion_s: Optional[float], serializacion_s: Optional[float]) -> None:
+        with self._lock:
+            self.peticiones[funcion, tipo] += 1
+            if codigo is not None:
+                self.errores[funcion, tipo, codigo] += 1
+            self.duracion[funcion, tipo].observar(total_s)
+            if validacion_s is not None:
+                self.etapas[funcion, "validacion"].observar(validacion_s)
+            if serializacion_s is not None:
+                self.etapas[funcion, "serializacion"].observar(serializacion_s)
+
+    # --- Exposición ---
+    def exponer(self, cache: Dict[str, Dict], modelos: Dict[str, Dict],
+                microbatch: Optional[Dict[str, Dict[str, tuple]]] = None) -> str:
+        """
+        `microbatch`: por función, los histogramas "tamaño_lote" y
+        "espera_cola_s" de MicroBatcher.histogramas().
+        """
+        with self._lock:
+            peticiones = dict(self.peticiones)
+            errores = dict(self.errores)
+            registros = dict(self.registros)
+            duracion = {k: h.valores() for k, h in self.duracion.items()}
+            etapas = {k: h.valores() for k, h in self.etapas.items()}
+        microbatch = microbatch or {}
+
+        lineas: List[str] = []
+        _contador(lineas, "ml_peticiones_total", "Peticiones por función y tipo de endpoint.",
+                  (({"funcion": f, "tipo": t}, v) for (f, t), v in sorted(peticiones.items())))
+        _contador(lineas, "ml_errores_total", "Peticiones con error (estado HTTP >= 400 o excepción).",
+                  (({"funcion": f, "tipo": t, "codigo": c}, v) for (f, t, c), v in sorted(errores.items())))
+        _contador(lineas, "ml_registros_total", "Registros predichos.",
+                  (({"funcion": f}, v) for f, v in sorted(registros.items())))
+        _histograma(lineas, "ml_peticion_segundos", "Duración completa de la petición.",
+                    (({"funcion": f, "tipo": t}, h) for (f, t), h in sorted(duracion.items())))
+        _histograma(lineas, "ml_etapa_segundos",
+                    "Duración por etapa: validacion, preprocess, predict_proba, serializacion.",
+                    (({"funcion": f, "etapa": e}, h) for (f, e), h in sorted(etapas.items())))
+        if microbatch:
+            _histograma(lineas, "ml_microbatch_lote_registros", "Peticiones por lote del micro-batching.",
+                        (({"funcion": f}, h["tamaño_lote"]) for f, h in sorted(microbatch.items())))
+            _histograma(lineas, "ml_microbatch_espera_segundos", "Espera en cola del micro-batching.",
+                        (({"funcion": f}, h["espera_cola_s"]) for f, h in sorted(microbatch.items())))
+
+        _contador(lineas, "ml_cache_aciertos_total", "Aciertos de la caché LRU de predicciones.",
+                  (({"funcion": f}, s["aciertos"]) for f, s in sorted(cache.items())))
+        _contador(lineas, "ml_cache_fallos_total", "Fallos de la caché LRU de predicciones.",
+                  (({"funcion": f}, s["fallos"]) for f, s in sorted(cache.items())))
+        _gauge(lineas, "ml_cache_tasa_aciertos", "Aciertos / consultas de la caché LRU.",
+               (({"funcion": f}, s["tasa_aciertos"]) for f, s in sorted(cache.items())))
+        _gauge(lineas, "ml_cache_entradas", "Entradas en la caché LRU.",
+               (({"funcion": f}, s["tamaño"]) for f, s in sorted(cache.items())))
+
+        cargados = sorted((f, m) for f, m in modelos.items() if m.get("cargado"))
+        _gauge(lineas, "ml_modelo_cargado", "1 si el modelo de la función está cargado.",
+               (({"funcion": f}, 1 if m.get("cargado") else 0) for f, m in sorted(modelos.items())))
+        _gauge(lineas, "ml_modelo_carga_segundos", "Tiempo de carga del modelo en uso.",
+               (({"funcion": f, "version": m["version"]}, m["tiempo_carga_ms"] / 1000) for f, m in cargados))
+        _gauge(lineas, "ml_modelo_memoria_bytes", "Memoria estimada del modelo en uso (bosque y tabla).",
+               (({"funcion": f}, m["memoria_bytes"]) for f, m in cargados))
+        _contador(lineas, "ml_modelo_recargas_total", "Recargas en caliente del modelo.",
+                  (({"funcion": f}, m.get("recargas", 0)) for f, m in cargados))
+        return "\n".join(lineas) + "\n"
+
+
+def _etiquetas(etiquetas: Dict[str, str]) -> str:
+    partes = []
+    for nombre, valor in etiquetas.items():
+        valor = str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        partes.append(f'{nombre}="{valor}"')
+    return "{" + ",".join(partes) + "}"
+
+def _numero(valor) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+def _serie(lineas: List[str], nombre: str, ayuda: str, tipo: str, valores: Iterable) -> None:
+    lineas.append(f"# HELP {nombre} {ayuda}")
+    lineas.append(f"# TYPE {nombre} {tipo}")
+    for etiquetas, valor in valores:
+        lineas.append(f"{nombre}{_etiquetas(etiquetas)} {_numero(valor)}")
+
+def _contador(lineas, nombre, ayuda, valores) -> None:
+    _serie(lineas, nombre, ayuda, "counter", valores)
+
+def _gauge(lineas, nombre, ayuda, valores) -> None:
+    _serie(lineas, nombre, ayuda, "gauge", valores)
+
+def _histograma(lineas: List[str], nombre: str, ayuda: str, valores: Iterable) -> None:
+    lineas.append(f"# HELP {nombre} {ayuda}")
+    lineas.append(f"# TYPE {nombre} histogram")
+    for etiquetas, (limites, cuentas, suma) in valores:
+        acumulado = 0
+        for limite, cuenta in zip(limites + (float("inf"),), cuentas):
+            acumulado += cuenta
+            le = "+Inf" if limite == float("inf") else repr(limite)
+            lineas.append(f"{nombre}_bucket{_etiquetas({**etiquetas, 'le': le})} {acumulado}")
+        lineas.append(f"{nombre}_sum{_etiquetas(etiquetas)} {repr(suma)}")
+        lineas.append(f"{nombre}_count{_etiquetas(etiquetas)} {acumulado}")
+
+
+METRICAS = Metricas()
+
+
+# === Medición por petición ===
+# Orden de las etapas en Server-Timing y en el bloque "tiempos_ns"
+ETAPAS_DESGLOSE = ("validacion", "codificacion", "cache", "modelo", "microbatch", "serializacion")
+
+
+class Medicion:
+    """
+    Tiempos de una petición en nanosegundos (perf_counter_ns). El middleware
+    la crea, RutaMedida marca inicio y fin del endpoint y el camino de
+    predicción suma sus etapas con `sumar` (codificacion, cache, modelo) y
+    anota la matriz codificada y la versión del modelo (para src/slow_log.py).
+    """
+    __slots__ = ("inicio_ns", "inicio_endpoint_ns", "fin_endpoint_ns", "etapas_ns", "detalle", "X", "version")
+
+    def __init__(self, inicio_ns: int, detalle: bool = False):
+        self.inicio_ns = inicio_ns
+        self.inicio_endpoint_ns = None
+        self.fin_endpoint_ns = None
+        self.etapas_ns: Dict[str, int] = {}
+        self.detalle = detalle
+        self.X = None
+        self.version = None
+
+    def sumar(self, etapa: str, ns: int) -> None:
+        self.etapas_ns[etapa] = self.etapas_ns.get(etapa, 0) + ns
+
+    def anotar(self, X, version: str) -> None:
+        self.X, self.version = X, version
+
+    def validacion_ns(self, ahora_ns: int) -> int:
+        """Antes del endpoint más lo que el endpoint sumó como "validacion" (/batch)."""
+        # Sin endpoint todavía la petición no pasó la validación (422)
+        fin_validacion = self.inicio_endpoint_ns if self.inicio_endpoint_ns is not None else ahora_ns
+        return fin_validacion - self.inicio_ns + self.etapas_ns.get("validacion", 0)
+
+    def desglose(self, ahora_ns: int) -> Dict[str, int]:
+        """Etapas medidas hasta `ahora_ns`, más endpoint y total."""
+        etapas = {"validacion": self.validacion_ns(ahora_ns)}
+        for nombre in ETAPAS_DESGLOSE[1:]:
+            if nombre in self.etapas_ns:
+                etapas[nombre] = self.etapas_ns[nombre]
+        if self.fin_endpoint_ns is not None:
+            etapas["endpoint"] = self.fin_endpoint_ns - self.inicio_endpoint_ns
+            etapas["serializacion"] = ahora_ns - self.fin_endpoint_ns
+        etapas["total"] = ahora_ns - self.inicio_ns
+        return etapas
+
+_MEDICION: ContextVar[Optional[Medicion]] = ContextVar("ml_medicion", default=None)
+
+
+def medicion_actual() -> Optional[Medicion]:
+    """Medición de la petición en curso (None fuera de una petición medida)."""
+    return _MEDICION.get()
+
+
+@contextmanager
+def etapa(nombre: str):
+    """Suma a la medición de la petición en curso lo que tarda el bloque."""
+    medicion = _MEDICION.get()
+    if medicion is None:
+        yield
+        return
+    inicio = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        medicion.sumar(nombre, time.perf_counter_ns() - inicio)
+
+
+def server_timing(etapas: Dict[str, int]) -> str:
+    """Cabecera Server-Timing: una métrica por etapa, dur en ms con resolución de µs."""
+    return ", ".join(f"{etapa};dur={ns / 1e6:.3f}" for etapa, ns in etapas.items())
+
+
+def _marcar(endpoint):
+    """Envuelve el endpoint para anotar cuándo empieza y termina (misma firma)."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def envoltura(*args, **kwargs):
+            medicion = _MEDICION.get()
+            if medicion is not None:
+                medicion.inicio_endpoint_ns = time.perf_counter_ns()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if medicion is not None:
+                    medicion.fin_endpoint_ns = time.perf_counter_ns()
+    else:
+        @functools.wraps(endpoint)
+        def envoltura(*args, **kwargs):
+            # Corre en el pool de hilos, con una copia del contexto: la
+            # medición es el mismo objeto que creó el middleware.
+            medicion = _MEDICION.get()
+            if medicion is not None:
+                medicion.inicio_endpoint_ns = time.perf_counter_ns()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                if medicion is not None:
+                    medicion.fin_endpoint_ns = time.perf_counter_ns()
+    return envoltura
+
+
+class RutaMedida(APIRoute):
+    """APIRoute cuyo endpoint marca su inicio y fin (app.router.route_class)."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _marcar(endpoint), **kwargs)
+
+
+class MetricasHTTP:
+    """
+    Middleware ASGI: mide los POST a /funcion-{funcion}... de las funciones
+    conocidas y agrega a su respuesta la cabecera Server-Timing con el
+    desglose por etapa hasta ese momento. Con la cabecera de petición
+    X-Detalle-Tiempos: 1 el endpoint agrega además el bloque "tiempos_ns".
+    El resto de las rutas pasa sin tocar.
+    """
+
+    def __init__(self, app, funciones: Iterable[str], metricas: Metricas = METRICAS):
+        self.app = app
+        self.funciones = frozenset(funciones)
+        self.metricas = metricas
+
+    def _clasificar(self, ruta: str):
+        if not ruta.startswith("/funcion-"):
+            return None
+        funcion, _, sufijo = ruta[len("/funcion-"):].partition("/")
+        tipo = TIPOS.get(sufijo)
+        if tipo is None or funcion not in self.funciones:
+            return None
+        return funcion, tipo
+
+    async def __call__(self, scope, receive, send):
+        clave = self._clasificar(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if clave is None:
+            await self.app(scope, receive, send)
+            return
+
+        detalle = any(k == b"x-detalle-tiempos" and v not in (b"", b"0") for k, v in scope["headers"])
+        medicion = Medicion(time.perf_counter_ns(), detalle)
+        token = _MEDICION.set(medicion)
+        estado, fin_ns = None, None
+
+        async def enviar(mensaje):
+            nonlocal estado, fin_ns
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+                cabecera = server_timing(medicion.desglose(time.perf_counter_ns())).encode("latin-1")
+                mensaje = {**mensaje, "headers": [*mensaje.get("headers", ()), (b"server-timing", cabecera)]}
+            await send(mensaje)
+            if mensaje["type"] == "http.response.body" and not mensaje.get("more_body", False):
+                fin_ns = time.perf_counter_ns()
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _MEDICION.reset(token)
+            fin_ns = fin_ns or time.perf_counter_ns()
+            funcion, tipo = clave
+            if estado is None:
+                codigo = "excepcion"
+            else:
+                codigo = str(estado) if estado >= 400 else None
+            validacion = medicion.validacion_ns(fin_ns)
+            if medicion.inicio_endpoint_ns is None:
+                # Rechazada antes del endpoint (422): todo fue validación
+                serializacion = None
+            else:
+                # En stream la respuesta se genera mientras se envía: no es serialización
+                serializacion = (
+                    fin_ns - medicion.fin_endpoint_ns
+                    if medicion.fin_endpoint_ns is not None and tipo != "stream" else None
+                )
+            self.metricas.observar_peticion(
+                funcion, tipo, codigo, (fin_ns - medicion.inicio_ns) / 1e9,
+                validacion / 1e9, None if serializacion is None else serializacion / 1e9
+            )
@@ -0,0 +1,89 @@
+# src/model_manifest.py
+"""
+Manifiesto de integridad de los artefactos: models/manifest.json.
+
+Por archivo (rf_salud.pkl, rf_salud.npz, ...) guarda el tamaño en bytes y el
+SHA-256 del contenido. El registro de modelos lo comprueba antes de
+deserializar. Un artefacto truncado o distinto al publicado se rechaza: su
+función queda deshabilitada y las demás siguen.
+
+entrenar_*.py y exportar_modelos.py actualizan la entrada del archivo que
+escriben. Para regenerarlo entero con los artefactos actuales:
+    python -m src.model_manifest
+"""
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+RUTA_MANIFIESTO = os.path.join("models", "manifest.json")
+
+
+class ArtefactoCorrupto(ValueError):
+    """El artefacto no coincide con su entrada del manifiesto."""
+
+
+def entrada(contenido: bytes) -> Dict:
+    return {"bytes": len(contenido), "sha256": hashlib.sha256(contenido).hexdigest()}
+
+
+def leer(ruta: str = RUTA_MANIFIESTO) -> Optional[Dict[str, Dict]]:
+    """Entradas por nombre de archivo, o None si no hay manifiesto."""
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def escribir(entradas: Dict[str, Dict], ruta: str = RUTA_MANIFIESTO) -> None:
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(entradas.items())), f, indent=2)
+        f.write("\n")
+    os.replace(temporal, ruta)
+
+
+def actualizar_manifiesto(ruta_artefacto: str, ruta: str = RUTA_MANIFIESTO) -> None:
+    """Registra (o reemplaza) la entrada de un artefacto recién escrito."""
+    with open(ruta_artefacto, "rb") as f:
+        contenido = f.read()
+    entradas = leer(ruta) or {}
+    entradas[os.path.basename(ruta_artefacto)] = entrada(contenido)
+    escribir(entradas, ruta)
+
+
+def verificar(manifiesto: Optional[Dict[str, Dict]], ruta_artefacto: str, contenido: bytes,
+              sha256: str) -> bool:
+    """
+    Compara tamaño y hash con el manifiesto. True si se verificó, False si
+    el archivo no figura en él; ArtefactoCorrupto si no coincide.
+    """
+    if manifiesto is None:
+        return False
+    esperado = manifiesto.get(os.path.basename(ruta_artefacto))
+    if esperado is None:
+        return False
+    if len(contenido) != esperado["bytes"]:
+        raise ArtefactoCorrupto(
+            f"❌ {ruta_artefacto}: {len(contenido)} bytes, el manifiesto indica {esperado['bytes']}"
+        )
+    if sha256 != esperado["sha256"]:
+        raise ArtefactoCorrupto(f"❌ {ruta_artefacto}: el SHA-256 no coincide con el manifiesto")
+    return True
+
+
+def generar(directorio: str = "models") -> Dict[str, Dict]:
+    entradas = {}
+    for ruta in sorted(glob.glob(os.path.join(directorio, "rf_*.pkl")) + glob.glob(os.path.join(directorio, "rf_*.npz"))):
+        with open(ruta, "rb") as f:
+            entradas[os.path.basename(ruta)] = entrada(f.read())
+    return entradas
+
+
+if __name__ == "__main__":
+    entradas = generar()
+    escribir(entradas)
+    for nombre, datos in entradas.items():
+        print(f"📦 {nombre:<20} {datos['bytes']:>10,} bytes  {datos['sha256'][:12]}")
+    print(f"✅ Manifiesto escrito en {RUTA_MANIFIESTO} ({len(entradas)} artefactos)")
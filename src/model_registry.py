@@ -0,0 +1,424 @@
+# src/model_registry.py
+"""
+Registro de modelos con carga bajo demanda.
+
+Cada función se carga la primera vez que se usa (o en segundo plano si así
+se configura), de modo que uvicorn acepta conexiones sin esperar a los ocho
+bosques y una réplica puede servir solo un subconjunto de funciones
+(ML_FUNCIONES). Por cada modelo se registra el tiempo de carga y la memoria.
+
+Lo que se instala por función es un ModeloCargado inmutable: cambiarlo es
+un simple reemplazo de referencia y las peticiones en curso terminan con la
+instancia que ya tenían. Eso permite la recarga en caliente: un hilo vigila
+models/rf_*.pkl y, cuando un artefacto cambia, lo carga, lo calienta y lo
+instala sin reiniciar el proceso.
+
+Con formato "npz" se carga el artefacto compacto models/rf_*.npz (ver
+src/forest_artifact.py) con memoria mapeada en lugar del .pkl; si una
+función todavía no tiene .npz exportado se usa su .pkl.
+
+cargar_todas carga las funciones en paralelo (un pool de hilos: la lectura,
+el hash y parte de la deserialización sueltan el GIL) y comprueba cada
+artefacto contra models/manifest.json (src/model_manifest.py). Una función
+que no carga, aquí o en su primer uso (archivo faltante, tamaño o hash
+distinto al del manifiesto, pickle roto), queda deshabilitada: sus
+peticiones reciben 503 sin volver a leer el archivo hasta que una recarga
+(POST /modelos/{funcion}/recargar) funcione. Las demás funciones se sirven
+con normalidad.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+from src.forest_engine import FlatForest
+from src.forest_artifact import cargar_npz, huella_npz, ruta_npz
+from src.lookup_tables import construir_tabla
+from src.model_manifest import RUTA_MANIFIESTO, leer as leer_manifiesto, verificar
+
+BACKENDS = ("sklearn", "flat")
+FORMATOS = ("pkl", "npz")
+
+
+class ModeloNoDisponible(RuntimeError):
+    """El modelo de la función no se pudo cargar."""
+
+
+class FuncionNoHabilitada(ModeloNoDisponible):
+    """La función no se sirve en esta réplica (ML_FUNCIONES)."""
+
+
+def _firma(ruta: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, tamaño) del archivo, o None si no existe."""
+    try:
+        st = os.stat(ruta)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def memoria_modelo(modelo) -> int:
+    """Bytes de los arrays de nodos y hojas de todos los árboles."""
+    if isinstance(modelo, FlatForest):
+        return _memoria_predictor(modelo)
+    total = 0
+    for estimator in modelo.estimators_:
+        estado = estimator.tree_.__getstate__()
+        total += estado["nodes"].nbytes + estado["values"].nbytes
+    return total
+
+def _memoria_predictor(predictor) -> int:
+    if isinstance(predictor, FlatForest):
+        return sum(getattr(predictor, a).nbytes for a in (
+            "feature", "threshold", "left", "right", "children", "missing_go_to_left", "value", "roots"
+        ))
+    return 0
+
+
+class ModeloCargado:
+    """Instantánea inmutable de todo lo necesario para predecir una función."""
+
+    def __init__(self, funcion: str, ruta: str, modelo, predictor, tabla,
+                 tiempo_carga_s: float, rss_delta_bytes: Optional[int],
+                 version: str = "", firma: Optional[Tuple[int, int]] = None, verificado: bool = False):
+        self.funcion = funcion
+        self.ruta = ruta
+        # Hash SHA-256 (12 hex) del artefacto: identifica el modelo que respondió
+        self.version = version
+        self.firma = firma
+        self.modelo = modelo
+        self.predictor = predictor
+        self.tabla = tabla
+        self.classes_ = predictor.classes_
+        self.tiempo_carga_s = tiempo_carga_s
+        self.rss_delta_bytes = rss_delta_bytes
+        # True si el artefacto coincidió con su entrada de models/manifest.json
+        self.verificado = verificado
+        # Un .npz ya es un FlatForest: modelo y predictor son el mismo objeto
+        self.memoria_bytes = (
+            memoria_modelo(modelo) + (_memoria_predictor(predictor) if predictor is not modelo else 0)
+            + (tabla.nbytes if tabla else 0)
+        )
+
+    def info(self) -> Dict:
+        return {
+            "ruta": self.ruta,
+            "version": self.version,
+            "mtime_ns": self.firma[0] if self.firma else None,
+            "tamaño_artefacto_bytes": self.firma[1] if self.firma else None,
+            "tiempo_carga_ms": round(self.tiempo_carga_s * 1000, 1),
+            "memoria_bytes": self.memoria_bytes,
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "formato": os.path.splitext(self.ruta)[1].lstrip("."),
+            "tabla": self.tabla is not None,
+            "verificado": self.verificado
+        }
+
+
+class ModelRegistry:
+    def __init__(self, rutas: Dict[str, str], habilitadas: Optional[Iterable[str]] = None,
+                 backend: str = "sklearn", tablas: bool = True, formato: str = "pkl",
+                 manifiesto: Optional[str] = RUTA_MANIFIESTO, hilos_carga: int = 4):
+        if backend not in BACKENDS:
+            raise ValueError(f"❌ Backend desconocido: {backend!r} (opciones: {', '.join(BACKENDS)})")
+        if formato not in FORMATOS:
+            raise ValueError(f"❌ Formato de artefacto desconocido: {formato!r} (opciones: {', '.join(FORMATOS)})")
+        self.rutas = dict(rutas)
+        if habilitadas is not None:
+            habilitadas = set(habilitadas)
+            for desconocida in sorted(habilitadas - set(self.rutas)):
+                print(f"⚠️  Función desconocida en ML_FUNCIONES: {desconocida!r}")
+        self.habilitadas = [f for f in self.rutas if habilitadas is None or f in habilitadas]
+        self.backend = backend
+        self.tablas = tablas
+        self.formato = formato
+        self.manifiesto = manifiesto
+        self.hilos_carga = max(1, hilos_carga)
+        self._cargados: Dict[str, ModeloCargado] = {}
+        self._errores: Dict[str, str] = {}
+        # Funciones cuya carga falló: no se reintentan por petición, solo con recargar
+        self._fallidas: set = set()
+        self._locks = {funcion: threading.Lock() for funcion in self.rutas}
+        self._oyentes: List[Callable[[str], None]] = []
+        self._recargas: Dict[str, int] = {funcion: 0 for funcion in self.rutas}
+        # Firma que el vigilante ya revisó sin instalar un modelo nuevo (mismo
+        # hash o recarga fallida): no se vuelve a leer hasta que cambie
+        self._firmas_vistas: Dict[str, Tuple[int, int]] = {}
+        self._vigilante: Optional[threading.Thread] = None
+
+    # --- Instalación ---
+    def al_reemplazar(self, callback: Callable[[str], None]) -> None:
+        """`callback(funcion)` se llama cada vez que cambia el modelo ya instalado de una función."""
+        self._oyentes.append(callback)
+
+    def _instalar(self, funcion: str, cargado: ModeloCargado) -> None:
+        reemplazo = funcion in self._cargados
+        self._cargados[funcion] = cargado
+        self._errores.pop(funcion, None)
+        self._fallidas.discard(funcion)
+        self._firmas_vistas.pop(funcion, None)
+        if reemplazo:
+            for callback in self._oyentes:
+                callback(funcion)
+
+    # --- Carga ---
+    def _predictor(self, modelo):
+        # Un artefacto .npz solo puede servirse con el motor plano
+        if isinstance(modelo, FlatForest):
+            return modelo
+        return FlatForest(modelo) if self.backend == "flat" else modelo
+
+    def _ruta_artefacto(self, funcion: str) -> str:
+        ruta = self.rutas[funcion]
+        if self.formato == "npz":
+            if os.path.exists(ruta_npz(ruta)):
+                return ruta_npz(ruta)
+            print(f"⚠️  Modelo {funcion.upper()} sin .npz exportado (python exportar_modelos.py); se usa {ruta}")
+        return ruta
+
+    @staticmethod
+    def _version(ruta: str) -> str:
+        """Misma versión que asigna _cargar: la huella del .npz o el hash del archivo."""
+        huella = huella_npz(ruta) if ruta.endswith(".npz") else None
+        if huella is None:
+            with open(ruta, "rb") as f:
+                huella = hashlib.sha256(f.read()).hexdigest()
+        return huella[:12]
+
+    def _construir(self, funcion: str, modelo, ruta: str, inicio: float, rss_inicio,
+                   version: str, firma, verificado: bool,
+                   original: Optional[ModeloCargado] = None) -> ModeloCargado:
+        predictor = self._predictor(modelo)
+        tabla = construir_tabla(funcion, predictor) if self.tablas else None
+        if original is not None:
+            # El tiempo y la memoria de carga siguen siendo los del artefacto original
+            tiempo_carga_s, rss_delta = original.tiempo_carga_s, original.rss_delta_bytes
+        else:
+            rss_fin = _rss_bytes()
+            tiempo_carga_s = time.perf_counter() - inicio
+            rss_delta = (rss_fin - rss_inicio) if rss_inicio is not None and rss_fin is not None else None
+        return ModeloCargado(
+            funcion, ruta, modelo, predictor, tabla, tiempo_carga_s, rss_delta, version, firma, verificado
+        )
+
+    def _cargar(self, funcion: str, medir_rss: bool = True) -> ModeloCargado:
+        ruta = self._ruta_artefacto(funcion)
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(f"❌ Modelo {funcion.upper()} no encontrado: {ruta}")
+        # Con cargas en paralelo el RSS del proceso mezcla todos los modelos
+        rss_inicio = _rss_bytes() if medir_rss else None
+        inicio = time.perf_counter()
+        firma = _firma(ruta)
+        manifiesto = leer_manifiesto(self.manifiesto) if self.manifiesto else None
+        en_manifiesto = manifiesto is not None and os.path.basename(ruta) in manifiesto
+        # Un .npz trae su huella: solo se lee entero si hay que verificarlo
+        # contra el manifiesto, así el mmap no arranca con todas las páginas leídas
+        huella = huella_npz(ruta) if ruta.endswith(".npz") else None
+        contenido = sha256 = None
+        if huella is None or en_manifiesto:
+            # Se hashea, se verifica y se deserializa el mismo contenido leído una sola vez
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+            sha256 = hashlib.sha256(contenido).hexdigest()
+        version = (huella or sha256)[:12]
+        verificado = verificar(manifiesto, ruta, contenido, sha256) if en_manifiesto else False
+        if manifiesto is not None and not en_manifiesto:
+            print(f"⚠️  {ruta} no figura en {self.manifiesto}: se carga sin verificar")
+        if ruta.endswith(".npz"):
+            # Los arrays quedan mapeados al archivo, compartidos entre workers
+            modelo = cargar_npz(ruta)
+        else:
+            modelo = joblib.load(io.BytesIO(contenido))
+        del contenido
+        cargado = self._construir(funcion, modelo, ruta, inicio, rss_inicio, version, firma, verificado)
+        print(
+            f"📦 Modelo {funcion.upper()} {version} cargado en {cargado.tiempo_carga_s * 1000:.0f} ms "
+            f"({cargado.memoria_bytes / 1e6:.1f} MB)"
+        )
+        return cargado
+
+    @staticmethod
+    def _calentar(cargado: ModeloCargado) -> None:
+        """Primera llamada a predict_proba fuera del camino de las peticiones."""
+        n_features = cargado.modelo.n_features_in_
+        cargado.predictor.predict_proba(np.zeros((1, n_features)))
+
+    def obtener(self, funcion: str, medir_rss: bool = True) -> ModeloCargado:
+        cargado = self._cargados.get(funcion)
+        if cargado is not None:
+            return cargado
+        if funcion not in self.habilitadas:
+            raise FuncionNoHabilitada(f"La función {funcion!r} no está habilitada en esta réplica")
+        if funcion in self._fallidas:
+            raise ModeloNoDisponible(self._errores[funcion])
+        with self._locks[funcion]:
+            cargado = self._cargados.get(funcion)
+            if cargado is None:
+                try:
+                    cargado = self._cargar(funcion, medir_rss)
+                except Exception as exc:
+                    self._errores[funcion] = str(exc)
+                    self._fallidas.add(funcion)
+                    raise ModeloNoDisponible(str(exc)) from exc
+                self._instalar(funcion, cargado)
+        return cargado
+
+    def cargados(self) -> Dict[str, ModeloCargado]:
+        return dict(self._cargados)
+
+    def cargar_todas(self, silencioso: bool = False) -> Dict[str, Optional[str]]:
+        """
+        Carga en paralelo las funciones habilitadas y muestra la tabla de
+        tiempos. Devuelve el error de cada función (None si cargó). Las que
+        fallan quedan deshabilitadas; con silencioso=False, además, se lanza
+        ModeloNoDisponible al terminar si alguna falló.
+        """
+        inicio = time.perf_counter()
+        hilos = min(self.hilos_carga, len(self.habilitadas)) or 1
+        medir_rss = hilos == 1
+
+        def cargar(funcion: str) -> Optional[str]:
+            try:
+                self.obtener(funcion, medir_rss)
+                return None
+            except ModeloNoDisponible as exc:
+                return str(exc)
+
+        with ThreadPoolExecutor(hilos, thread_name_prefix="carga-modelo") as pool:
+            errores = dict(zip(self.habilitadas, pool.map(cargar, self.habilitadas)))
+        self._imprimir_tabla(errores, hilos, time.perf_counter() - inicio)
+        fallidas = [f for f, error in errores.items() if error is not None]
+        if fallidas and not silencioso:
+            raise ModeloNoDisponible(f"No cargaron: {', '.join(fallidas)}")
+        return errores
+
+    def _imprimir_tabla(self, errores: Dict[str, Optional[str]], hilos: int, total_s: float) -> None:
+        print(f"📋 Modelos: {len(errores)} funciones con {hilos} hilo(s) en {total_s * 1000:.0f} ms")
+        print(f"   {'función':<11} {'versión':<12} {'ms':>7} {'MB':>6}  verificado")
+        for funcion, error in errores.items():
+            cargado = self._cargados.get(funcion)
+            if error is None and cargado is not None:
+                print(
+                    f"   {funcion:<11} {cargado.version:<12} {cargado.tiempo_carga_s * 1000:7.0f} "
+                    f"{cargado.memoria_bytes / 1e6:6.1f}  {'sí' if cargado.verificado else 'no'}"
+                )
+            else:
+                print(f"   {funcion:<11} deshabilitada: {error}")
+
+    def cargar_en_segundo_plano(self) -> threading.Thread:
+        hilo = threading.Thread(
+            target=self.cargar_todas, kwargs={"silencioso": True},
+            name="carga-modelos", daemon=True
+        )
+        hilo.start()
+        return hilo
+
+    def calentar_todas(self) -> None:
+        """Una predicción con cada modelo cargado (carga perezosa de sklearn/NumPy incluida)."""
+        for cargado in self.cargados().values():
+            self._calentar(cargado)
+
+    # --- Backend ---
+    def usar_backend(self, nombre: str) -> None:
+        if nombre not in BACKENDS:
+            raise ValueError(f"❌ Backend desconocido: {nombre!r} (opciones: {', '.join(BACKENDS)})")
+        self.backend = nombre
+        for funcion, anterior in self.cargados().items():
+            with self._locks[funcion]:
+                nuevo = self._construir(
+                    funcion, anterior.modelo, anterior.ruta, time.perf_counter(), None,
+                    anterior.version, anterior.firma, anterior.verificado, original=anterior
+                )
+                self._instalar(funcion, nuevo)
+
+    # --- Recarga en caliente ---
+    def recargar(self, funcion: str) -> ModeloCargado:
+        """Carga de nuevo el artefacto, lo calienta y lo instala atómicamente."""
+        if funcion not in self.habilitadas:
+            raise FuncionNoHabilitada(f"La función {funcion!r} no está habilitada en esta réplica")
+        with self._locks[funcion]:
+            try:
+                nuevo = self._cargar(funcion)
+                self._calentar(nuevo)
+            except Exception as exc:
+                # El modelo anterior (si lo hay) sigue atendiendo
+                self._errores[funcion] = f"recarga fallida: {exc}"
+                raise ModeloNoDisponible(str(exc)) from exc
+            anterior = self._cargados.get(funcion)
+            self._instalar(funcion, nuevo)
+            self._recargas[funcion] += 1
+        if anterior is not None:
+            print(f"🔄 Modelo {funcion.upper()} recargado: {anterior.version} → {nuevo.version}")
+        return nuevo
+
+    def revisar_cambios(self, pendientes: Dict[str, Tuple[int, int]]) -> None:
+        """
+        Una pasada del vigilante. Un artefacto se recarga cuando su firma
+        (mtime, tamaño) cambió y además se mantuvo igual desde la pasada
+        anterior, para no leer un .pkl a medio escribir por entrenar_*.py.
+        Solo se recarga si el contenido (hash) es realmente distinto.
+
+        Una firma ya revisada no se vuelve a leer: si el hash no cambió (touch,
+        reentrenamiento idéntico) o la recarga falló, queda como vista y el
+        archivo se relee solo cuando cambie otra vez.
+        """
+        for funcion, cargado in self.cargados().items():
+            firma = _firma(cargado.ruta)
+            if firma is None or firma == cargado.firma or firma == self._firmas_vistas.get(funcion):
+                pendientes.pop(funcion, None)
+                continue
+            if pendientes.get(funcion) != firma:
+                pendientes[funcion] = firma
+                continue
+            pendientes.pop(funcion, None)
+            try:
+                if self._version(cargado.ruta) == cargado.version:
+                    self._firmas_vistas[funcion] = firma
+                    continue
+                self.recargar(funcion)
+            except Exception as exc:
+                self._firmas_vistas[funcion] = firma
+                print(f"❌ Recarga de {funcion.upper()} fallida: {exc}")
+
+    def vigilar(self, intervalo_s: float = 5.0) -> threading.Thread:
+        """Arranca (una sola vez) el hilo que vigila los artefactos cargados."""
+        if self._vigilante is not None and self._vigilante.is_alive():
+            return self._vigilante
+
+        def bucle():
+            pendientes: Dict[str, Tuple[int, int]] = {}
+            while True:
+                time.sleep(intervalo_s)
+                self.revisar_cambios(pendientes)
+
+        self._vigilante = threading.Thread(target=bucle, name="vigilante-modelos", daemon=True)
+        self._vigilante.start()
+        return self._vigilante
+
+    # --- Estado ---
+    def estado(self) -> Dict[str, Dict]:
+        estado = {}
+        for funcion in self.rutas:
+            cargado = self._cargados.get(funcion)
+            info = {"habilitada": funcion in self.habilitadas, "cargado": cargado is not None}
+            if cargado is not None:
+                info.update(cargado.info())
+                info["recargas"] = self._recargas[funcion]
+            if funcion in self._errores:
+                info["error"] = self._errores[funcion]
+            if funcion in self._fallidas:
+                info["deshabilitada_por_error"] = True
+            estado[funcion] = info
+        return estado
@@ -0,0 +1,118 @@
+# src/ndjson_stream.py
+"""
+Clasificación en streaming de NDJSON (un registro JSON por línea).
+
+El cuerpo de la petición se lee a medida que llega y los resultados se
+envían a medida que se calculan, sin acumular ni la petición ni la
+respuesta. Las líneas completas de cada trozo recibido se agrupan en
+micro-lotes de hasta ML_STREAM_LOTE registros que se validan (Funcion*Input),
+codifican y puntúan juntos en el pool de hilos. Lo que queda al final de un
+trozo se puntúa enseguida, sin esperar a llenar el lote: un cliente lento
+recibe sus resultados sin demora.
+
+Contrapresión en ambos sentidos: el siguiente trozo del cuerpo se pide
+recién cuando los resultados anteriores se entregaron al socket (el `send`
+del servidor espera si el cliente no lee) y, mientras tanto, uvicorn deja de
+leer del socket cuando su búfer de entrada se llena.
+
+Cada línea de salida lleva el índice del registro ("fila"): o bien el
+resultado con las mismas claves que /batch, o bien "error" con los errores
+de validación de ese registro, que no interrumpen el resto.
+"""
+import json
+from typing import AsyncIterator, Callable, List
+
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.model_registry import ModeloNoDisponible
+from src.schemas import ESQUEMAS
+
+MEDIA_TYPE = "application/x-ndjson"
+
+# Una línea más larga que esto sin salto de línea corta el stream con un error
+LIMITE_LINEA = 1 << 20
+
+
+class RespuestaNDJSON(StreamingResponse):
+    """
+    StreamingResponse sin la escucha de desconexión en paralelo: esa tarea
+    llama a receive() y se quedaría con los trozos del cuerpo que el propio
+    generador está leyendo. La desconexión se detecta igual, porque
+    request.stream() lanza ClientDisconnect.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _linea(objeto: dict) -> bytes:
+    return json.dumps(objeto, ensure_ascii=False).encode("utf-8") + b"\n"
+
+def _errores(exc: Exception) -> list:
+    if isinstance(exc, ValidationError):
+        return [
+            {"campo": ".".join(str(p) for p in e["loc"]), "mensaje": e["msg"]}
+            for e in exc.errors(include_url=False)
+        ]
+    return [{"campo": None, "mensaje": str(exc)}]
+
+
+def _puntuar(funcion: str, predecir_lote: Callable, clave: str, inicio: int, lineas: List[bytes]) -> bytes:
+    """Valida, predice y formatea un micro-lote; corre en el pool de hilos."""
+    esquema = ESQUEMAS[funcion]
+    validos, filas, salida = [], [], {}
+    for i, linea in enumerate(lineas, start=inicio):
+        try:
+            validos.append(esquema.model_validate_json(linea))
+            filas.append(i)
+        except ValidationError as exc:
+            salida[i] = _linea({"fila": i, "error": _errores(exc)})
+    if validos:
+        resultados, version = predecir_lote(funcion, validos)
+        for i, (resultado, confianza) in zip(filas, resultados):
+            salida[i] = _linea({
+                "fila": i, clave: resultado, "confianza": round(confianza * 100), "version_modelo": version
+            })
+    return b"".join(salida[i] for i in range(inicio, inicio + len(lineas)))
+
+
+async def _lineas(trozos: AsyncIterator[bytes]) -> AsyncIterator[List[bytes]]:
+    """Las líneas completas de cada trozo recibido, sin las vacías."""
+    resto = b""
+    async for trozo in trozos:
+        if not trozo:
+            continue
+        partes = (resto + trozo).split(b"\n")
+        resto = partes.pop()
+        if len(resto) > LIMITE_LINEA:
+            raise ValueError(f"línea de más de {LIMITE_LINEA} bytes sin salto de línea")
+        yield [p for p in partes if p.strip()]
+    if resto.strip():
+        yield [resto]
+
+
+async def clasificar_stream(funcion: str, trozos: AsyncIterator[bytes], predecir_lote: Callable,
+                            tamaño_lote: int) -> AsyncIterator[bytes]:
+    """
+    Generador de la respuesta. `predecir_lote(funcion, modelos)` devuelve
+    ([(subfunción, confianza)], versión), como predict_batch_with_version.
+    """
+    clave = f"subfuncion_{funcion}"
+    fila = 0
+    try:
+        async for lineas in _lineas(trozos):
+            for desde in range(0, len(lineas), tamaño_lote):
+                lote = lineas[desde:desde + tamaño_lote]
+                yield await run_in_threadpool(_puntuar, funcion, predecir_lote, clave, fila, lote)
+                fila += len(lote)
+    except ClientDisconnect:
+        return
+    except (ValueError, ModeloNoDisponible) as exc:
+        # La respuesta ya empezó (200): el error va como última línea
+        yield _linea({"fila": fila, "error": _errores(exc)})
@@ -0,0 +1,68 @@
+# src/prediction_cache.py
+"""
+Caché LRU acotada de predicciones, indexada por el dtype y los bytes del
+vector ya codificado (después de preprocess_*). Muchas entradas distintas (p. ej.
+cualquier tipo_hospedaje que no sea ecolodge/albergue) producen el mismo
+vector, así que cachear tras el preprocesamiento acierta mucho más que
+cachear el payload crudo.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+
+class LRUCache:
+    """LRU segura entre hilos con contadores de aciertos, fallos y expulsiones."""
+
+    def __init__(self, capacidad: int):
+        self.capacidad = capacidad
+        self._datos: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.invalidaciones = 0
+        # Cambia con cada invalidación: un put calculado con el modelo anterior se descarta
+        self.generacion = 0
+
+    def get(self, clave: Hashable):
+        with self._lock:
+            valor = self._datos.get(clave)
+            if valor is None:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def put(self, clave: Hashable, valor, generacion: Optional[int] = None) -> None:
+        with self._lock:
+            if generacion is not None and generacion != self.generacion:
+                return
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            if len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+                self.expulsiones += 1
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self.generacion += 1
+            self.invalidaciones += 1
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "capacidad": self.capacidad,
+                "tamaño": len(self._datos),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "expulsiones": self.expulsiones,
+                "invalidaciones": self.invalidaciones,
+                "tasa_aciertos": (self.aciertos / consultas) if consultas else 0.0
+            }
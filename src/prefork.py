@@ -0,0 +1,152 @@
+# src/prefork.py
+"""
+Servidor pre-fork: varios workers uvicorn que comparten los modelos.
+
+El proceso maestro importa la API, carga los ocho bosques (y sus tablas) una
+sola vez, los calienta y congela el GC (gc.freeze) antes de hacer fork de los
+workers. Los workers heredan esas páginas copy-on-write; como el recolector
+ya no recorre los objetos congelados, no escribe en sus cabeceras y las
+páginas siguen compartidas. Con ML_ARTEFACTO=npz los arrays además están
+mapeados desde el archivo. Con ML_CALENTAR=1 el maestro corre el
+calentamiento completo de src/warmup.py: los workers nacen listos y no lo
+repiten.
+
+Todos los workers aceptan conexiones del mismo socket, abierto por el
+maestro. Si un worker muere se lanza otro; SIGTERM/SIGINT detiene a todos.
+`kill -USR1 <maestro>` imprime la memoria (USS/PSS) de cada worker, que
+también está en GET /memoria.
+
+Uso:
+    ML_WORKERS=4 python -m src.prefork --host 0.0.0.0 --port $PORT
+
+Es un modo opcional: el Procfile sigue con un solo proceso uvicorn. Para
+usarlo en el despliegue hay que cambiar la línea web del Procfile por el
+comando de arriba, teniendo en cuenta que cada worker suma su memoria propia
+y su concurrencia (ML_WORKERS, 2 por defecto).
+"""
+import argparse
+import gc
+import os
+import signal
+import time
+
+import uvicorn
+
+from src import config
+from src.process_memory import reporte_memoria
+
+# Variable de entorno con la que los workers encuentran al maestro (GET /memoria)
+ENV_MAESTRO = "ML_PREFORK_MAESTRO"
+
+
+def _cargar_aplicacion():
+    """Importa la API con todos los modelos cargados y calentados en el maestro."""
+    recarga = config.RECARGA_AUTOMATICA
+    # Sin hilos en el maestro: no sobreviven al fork. La carga es síncrona
+    # aquí y el vigilante de recarga (si está activo) se arranca en cada worker.
+    config.MODO_CARGA = "lazy"
+    config.RECARGA_AUTOMATICA = False
+
+    from api.main import app
+    from src.model_loader import REGISTRY
+    from src.warmup import CALENTAMIENTO
+
+    inicio = time.perf_counter()
+    if config.CALENTAR:
+        # Una sola vez, antes de gc.freeze: los workers heredan el estado
+        # "listo" y no escriben en las páginas compartidas calentando de nuevo
+        CALENTAMIENTO.ejecutar()
+    else:
+        REGISTRY.cargar_todas(silencioso=True)
+        REGISTRY.calentar_todas()
+    print(f"✅ Modelos cargados en el maestro en {time.perf_counter() - inicio:.1f} s")
+    return app, REGISTRY, recarga
+
+
+def _imprimir_memoria(pid_maestro: int) -> None:
+    reporte = reporte_memoria(pid_maestro)
+    maestro = reporte["maestro"]["memoria"] or {}
+    print(f"📋 Maestro {pid_maestro}: RSS {maestro.get('rss', 0) / 1e6:.1f} MB")
+    for pid, memoria in reporte["workers"].items():
+        if memoria:
+            print(
+                f"   Worker {pid}: RSS {memoria['rss'] / 1e6:6.1f} MB | "
+                f"PSS {memoria['pss'] / 1e6:6.1f} MB | USS {memoria['uss'] / 1e6:6.1f} MB"
+            )
+
+
+def _worker(app_config: uvicorn.Config, sock, registry, recarga: bool) -> None:
+    # Los handlers del maestro no aplican al worker: uvicorn instala los suyos
+    # para SIGTERM/SIGINT, y SIGUSR1 (reporte de memoria) es solo del maestro.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+    if recarga:
+        registry.vigilar(config.RECARGA_INTERVALO_S)
+    uvicorn.Server(app_config).run(sockets=[sock])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor pre-fork de la API de clasificación")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("ML_WORKERS", "2")))
+    args = parser.parse_args()
+
+    app, registry, recarga = _cargar_aplicacion()
+
+    # Todo lo creado hasta aquí (modelos, tablas, módulos) pasa a la
+    # generación permanente: el GC de los workers no lo toca.
+    gc.collect()
+    gc.freeze()
+
+    app_config = uvicorn.Config(app, host=args.host, port=args.port)
+    sock = app_config.bind_socket()
+    pid_maestro = os.getpid()
+    os.environ[ENV_MAESTRO] = str(pid_maestro)
+
+    workers = set()
+    deteniendo = False
+
+    def lanzar() -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _worker(app_config, sock, registry, recarga)
+            finally:
+                os._exit(0)
+        workers.add(pid)
+
+    def detener(senal, frame) -> None:
+        nonlocal deteniendo
+        deteniendo = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, detener)
+    signal.signal(signal.SIGINT, detener)
+    signal.signal(signal.SIGUSR1, lambda senal, frame: _imprimir_memoria(pid_maestro))
+
+    for _ in range(args.workers):
+        lanzar()
+    print(f"🚀 {args.workers} workers en http://{args.host}:{args.port} (maestro {pid_maestro})")
+
+    while workers:
+        try:
+            pid, estado = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        workers.discard(pid)
+        if not deteniendo:
+            print(f"⚠️  Worker {pid} terminó (estado {estado}); se lanza otro")
+            lanzar()
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
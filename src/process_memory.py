@@ -0,0 +1,69 @@
+# src/process_memory.py
+"""
+Memoria por proceso leída de /proc/<pid>/smaps_rollup (Linux).
+
+- rss: páginas residentes, incluidas las compartidas con otros procesos.
+- pss: rss repartiendo cada página compartida entre los procesos que la usan.
+- uss: solo las páginas privadas del proceso (Private_Clean + Private_Dirty).
+
+Con el servidor pre-fork (src/prefork.py) los modelos se comparten
+copy-on-write: el USS de cada worker debería ser mucho menor que su RSS.
+"""
+import os
+from typing import Dict, List, Optional, Union
+
+_CAMPOS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "compartida_limpia",
+    "Shared_Dirty": "compartida_sucia",
+    "Private_Clean": "privada_limpia",
+    "Private_Dirty": "privada_sucia",
+    "Swap": "swap"
+}
+
+
+def memoria_proceso(pid: Union[int, str] = "self") -> Optional[Dict[str, int]]:
+    """Bytes de rss, pss, uss y desglose; None si /proc no está disponible."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            lineas = f.readlines()
+    except OSError:
+        return None
+    memoria = {}
+    for linea in lineas:
+        partes = linea.split()
+        if len(partes) == 3 and partes[0].rstrip(":") in _CAMPOS:
+            memoria[_CAMPOS[partes[0].rstrip(":")]] = int(partes[1]) * 1024
+    memoria["uss"] = memoria.get("privada_limpia", 0) + memoria.get("privada_sucia", 0)
+    return memoria
+
+
+def hijos(pid: int) -> List[int]:
+    """PIDs cuyo proceso padre es `pid`."""
+    encontrados = []
+    for entrada in os.listdir("/proc"):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entrada}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # El nombre del comando va entre paréntesis y puede contener espacios
+        campos = stat[stat.rfind(")") + 2:].split()
+        if int(campos[1]) == pid:
+            encontrados.append(int(entrada))
+    return sorted(encontrados)
+
+
+def reporte_memoria(pid_maestro: Optional[int] = None) -> Dict:
+    """Memoria de este proceso y, bajo pre-fork, la del maestro y cada worker."""
+    reporte = {"pid": os.getpid(), "proceso": memoria_proceso()}
+    if pid_maestro is not None:
+        reporte["maestro"] = {"pid": pid_maestro, "memoria": memoria_proceso(pid_maestro)}
+        workers = {pid: memoria_proceso(pid) for pid in hijos(pid_maestro)}
+        reporte["workers"] = workers
+        reporte["uss_total_workers"] = sum(m["uss"] for m in workers.values() if m)
+        reporte["pss_total_workers"] = sum(m["pss"] for m in workers.values() if m)
+    return reporte
@@ -0,0 +1,219 @@
+# src/profiler.py
+"""
+Perfilado por muestreo de peticiones en vivo, sin reiniciar el servicio.
+
+Una sesión (POST /perfil/iniciar) elige una fracción de las peticiones POST a
+las funciones indicadas; mientras alguna de esas peticiones está en curso, un
+hilo toma cada `intervalo_ms` las pilas de Python de todos los hilos
+(sys._current_frames) y cuenta cada pila como módulo:función, de la raíz a la
+hoja. Al detenerse (POST /perfil/detener, o al vencer `duracion_s`) el
+conteo se escribe en formato de pilas colapsadas ("a;b;c N", el de
+flamegraph.pl, speedscope o inferno) en ML_PERFIL_DIR.
+
+La raíz de cada pila es la función perfilada ("funcion-salud"); si había
+peticiones de varias funciones en curso se unen con "+". Así se ve si el
+tiempo está en pydantic, en preprocess_*, en la validación de sklearn
+(sklearn.utils.validation) o en el recorrido de los árboles.
+
+Se usa un muestreador de pilas y no cProfile: cProfile mide solo el hilo
+que lo activa, y una petición pasa por el event loop (validación,
+serialización) y por el pool de hilos (predicción). Consecuencias:
+- Se muestrean todos los hilos, así que las peticiones no elegidas que
+  corren a la vez también suman. Con fraccion=1 y poca concurrencia el
+  perfil es el de las funciones elegidas.
+- Los hilos ociosos (esperando en select, una cola o un lock) no se
+  cuentan.
+- Bajo src/prefork.py cada worker tiene su propia sesión: se perfila el
+  worker que recibió /perfil/iniciar.
+
+Con una sesión activa, la cabecera X-Perfilar: 1 fuerza el muestreo de esa
+petición aunque no le toque por la fracción.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from src.config import PERFIL_DIRECTORIO
+
+# Hojas de pila de un hilo que espera (no consume CPU)
+OCIOSAS = frozenset({
+    "threading:wait", "selectors:select", "queue:get", "threading:_wait_for_tstate_lock",
+    "concurrent.futures.thread:_worker", "anyio._backends._asyncio:run"
+})
+PROFUNDIDAD_MAXIMA = 128
+
+
+class SesionInvalida(RuntimeError):
+    """Iniciar con una sesión activa, o detener sin ninguna."""
+
+
+def _pila(frame) -> Optional[str]:
+    """Pila colapsada raíz;...;hoja, o None si el hilo está ocioso."""
+    marcos: List[str] = []
+    while frame is not None and len(marcos) < PROFUNDIDAD_MAXIMA:
+        codigo = frame.f_code
+        marcos.append(f"{frame.f_globals.get('__name__', '?')}:{codigo.co_name}")
+        frame = frame.f_back
+    if not marcos or marcos[0] in OCIOSAS:
+        return None
+    marcos.reverse()
+    return ";".join(marcos)
+
+
+class Perfilador:
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        self._lock = threading.Lock()
+        self._sesion: Optional[Dict] = None
+        self._en_curso: Counter = Counter()
+        self._pilas: Counter = Counter()
+        self._parar = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._archivos: List[str] = []
+
+    @property
+    def activo(self) -> bool:
+        return self._sesion is not None
+
+    # --- Control de la sesión ---
+    def iniciar(self, fraccion: float, funciones: Iterable[str], intervalo_ms: float = 5.0,
+                duracion_s: float = 60.0) -> Dict:
+        if not 0 < fraccion <= 1:
+            raise ValueError("fraccion debe estar en (0, 1]")
+        if intervalo_ms <= 0 or duracion_s <= 0:
+            raise ValueError("intervalo_ms y duracion_s deben ser positivos")
+        with self._lock:
+            if self._sesion is not None:
+                raise SesionInvalida("ya hay una sesión de perfilado activa")
+            self._sesion = {
+                "fraccion": fraccion,
+                "funciones": sorted(set(funciones)),
+                "intervalo_ms": intervalo_ms,
+                "duracion_s": duracion_s,
+                "inicio": time.time(),
+                "peticiones": 0,
+                "muestras": 0
+            }
+            self._pilas = Counter()
+            self._en_curso = Counter()
+            self._parar = threading.Event()
+            self._hilo = threading.Thread(target=self._bucle, name="perfilador", daemon=True)
+            self._hilo.start()
+            return self.estado()
+
+    def detener(self) -> Dict:
+        """Termina la sesión y escribe el perfil; devuelve el resumen."""
+        with self._lock:
+            sesion, hilo, pilas = self._sesion, self._hilo, self._pilas
+            if sesion is None:
+                raise SesionInvalida("no hay una sesión de perfilado activa")
+            self._sesion = None
+            self._parar.set()
+        if hilo is not threading.current_thread():
+            hilo.join()
+        return self._escribir(sesion, pilas)
+
+    def estado(self) -> Dict:
+        sesion = self._sesion
+        return {
+            "activo": sesion is not None,
+            "sesion": dict(sesion) if sesion is not None else None,
+            "directorio": self.directorio,
+            "archivos": list(self._archivos)
+        }
+
+    # --- Peticiones ---
+    def elegir(self, funcion: str, forzar: bool) -> bool:
+        """¿Se perfila esta petición? Si sí, queda en curso hasta `salir`."""
+        sesion = self._sesion
+        if sesion is None or funcion not in sesion["funciones"]:
+            return False
+        if not forzar and random.random() >= sesion["fraccion"]:
+            return False
+        with self._lock:
+            if self._sesion is not sesion:
+                return False
+            sesion["peticiones"] += 1
+            self._en_curso[funcion] += 1
+        return True
+
+    def salir(self, funcion: str) -> None:
+        with self._lock:
+            self._en_curso[funcion] -= 1
+            if self._en_curso[funcion] <= 0:
+                del self._en_curso[funcion]
+
+    # --- Muestreo ---
+    def _bucle(self) -> None:
+        sesion = self._sesion
+        intervalo = sesion["intervalo_ms"] / 1000.0
+        fin = time.monotonic() + sesion["duracion_s"]
+        propio = threading.get_ident()
+        while not self._parar.wait(intervalo):
+            if time.monotonic() >= fin:
+                try:
+                    self.detener()
+                except SesionInvalida:
+                    pass
+                return
+            with self._lock:
+                if not self._en_curso:
+                    continue
+                raiz = "+".join(f"funcion-{f}" for f in sorted(self._en_curso))
+            for ident, frame in sys._current_frames().items():
+                if ident == propio:
+                    continue
+                pila = _pila(frame)
+                if pila is not None:
+                    self._pilas[f"{raiz};{pila}"] += 1
+                    sesion["muestras"] += 1
+
+    def _escribir(self, sesion: Dict, pilas: Counter) -> Dict:
+        os.makedirs(self.directorio, exist_ok=True)
+        marca = time.strftime("%Y%m%d-%H%M%S", time.localtime(sesion["inicio"]))
+        ruta = os.path.join(self.directorio, f"perfil-{marca}-{os.getpid()}.collapsed")
+        with open(ruta, "w", encoding="utf-8") as f:
+            for pila, cuenta in pilas.most_common():
+                f.write(f"{pila} {cuenta}\n")
+        self._archivos.append(ruta)
+        print(f"📋 Perfil escrito en {ruta}: {sesion['muestras']} muestras de {sesion['peticiones']} peticiones")
+        return {**sesion, "archivo": ruta, "pilas_distintas": len(pilas)}
+
+
+PERFILADOR = Perfilador(PERFIL_DIRECTORIO)
+
+
+class PerfilHTTP:
+    """
+    Middleware ASGI: con una sesión activa, marca en curso las peticiones
+    elegidas a /funcion-{funcion}...; sin sesión solo cuesta una comparación.
+    """
+
+    def __init__(self, app, perfilador: Perfilador = PERFILADOR, token: str = ""):
+        self.app = app
+        self.perfilador = perfilador
+        self.token = token.encode()
+
+    def _forzada(self, scope) -> bool:
+        cabeceras = dict(scope["headers"])
+        if cabeceras.get(b"x-perfilar", b"") in (b"", b"0"):
+            return False
+        return not self.token or cabeceras.get(b"x-token-admin") == self.token
+
+    async def __call__(self, scope, receive, send):
+        if (not self.perfilador.activo or scope["type"] != "http" or scope["method"] != "POST"
+                or not scope["path"].startswith("/funcion-")):
+            await self.app(scope, receive, send)
+            return
+        funcion = scope["path"][len("/funcion-"):].partition("/")[0]
+        if not self.perfilador.elegir(funcion, self._forzada(scope)):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.perfilador.salir(funcion)
@@ -0,0 +1,453 @@
+# src/sample_payloads.py
+"""
+Registros de entrada de ejemplo para benchmarks y pruebas de carga.
+
+Los datasets de data/raw ya están codificados; aquí se generan registros
+crudos, con la forma de los Funcion*Input de src/schemas.py, mezclando los
+valores conocidos de cada campo con algunos nuevos (que los preprocess_*
+aceptan y mapean al valor por defecto).
+
+`generar` elige cada valor de manera uniforme. `generar_entrenamiento` sigue
+en cambio las mismas distribuciones que los generadores de entrenar_*.py
+(probabilidades por categoría, rangos numéricos y dependencias entre
+campos), para que los benchmarks vean la mezcla de categorías realista.
+"""
+import random
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+from src.schemas import ESQUEMAS
+
+BOOL = [True, False]
+
+def _entero(a: int, b: int) -> Callable:
+    return lambda rng: rng.randint(a, b)
+
+def _real(a: float, b: float) -> Callable:
+    return lambda rng: round(rng.uniform(a, b), 1)
+
+def _servicios(rng: random.Random) -> List[str]:
+    return rng.sample(["Urgencias", "Laboratorio", "Farmacia", "Radiología", "UCI", "Otro"], rng.randint(0, 5))
+
+# campo -> lista de opciones o función(rng)
+CAMPOS: Dict[str, Dict[str, Union[list, Callable]]] = {
+    "salud": {
+        "nivel_atencion": ["Primer", "Segundo", "Tercer"],
+        "tipo_establecimiento": ["Puesto", "Consultorio médico", "Centro médico", "Hospital general", "Instituto", "Otro"],
+        "camas_internamiento": ["0", "1-10", "11-50", ">50"],
+        "usuarios_no_autosuficientes": BOOL,
+        "capacidad_atencion": ["Baja", "Media", "Alta"],
+        "servicios_disponibles": _servicios,
+        "urgencias_24h": BOOL,
+        "num_especialidades": ["0", "1-5", ">5"],
+        "num_pisos": ["1", "2", ">3"],
+        "area_construida": _real(50, 20000),
+        "personal_medico_total": _entero(1, 300)
+    },
+    "encuentro": {
+        "tipo_actividad": ["salon_eventos", "discoteca", "cine", "estadio", "bar", "Teatro "],
+        "carga_ocupantes": _entero(10, 5000),
+        "ubicado_en_sotano": BOOL,
+        "num_pisos": _entero(1, 10),
+        "area_total_m2": _real(50, 9000),
+        "evento_recurrente": BOOL,
+        "horario_funcionamiento": ["diurno", "nocturno", "mixto"]
+    },
+    "hospedaje": {
+        "categoria_estrellas": _entero(0, 5),
+        "tipo_hospedaje": ["hotel", "hostal", "ecolodge", "albergue", "apart-hotel"],
+        "num_pisos": _entero(1, 15),
+        "tiene_sotano": BOOL,
+        "num_habitaciones": _entero(3, 400),
+        "capacidad_ocupantes": _entero(5, 800),
+        "uso_mixto": BOOL,
+        "tiene_estacionamiento": BOOL,
+        "estacionamiento_en_sotano": BOOL
+    },
+    "educacion": {
+        "nivel_educativo": ["Inicial", "Primaria", "Secundaria", "Superior Técnico", "Superior Universitario"],
+        "tipo_institucion": ["CEBE", "Colegio Regular", "Instituto", "Universidad"],
+        "numero_pisos": ["1", "2", "3", "4", "5", "6-10", ">10"],
+        "area_construida_m2": ["<500", "500-1500", "1500-5000", "5000-15000", ">15000"],
+        "atiende_personas_discapacidad": BOOL,
+        "capacidad_alumnos": ["<100", "100-300", "300-800", "800-2000", ">2000"],
+        "cantidad_aulas": _entero(1, 100),
+        "tipo_edificacion": ["Construida como Educativa", "Remodelada/Acondicionada para Educación"]
+    },
+    "industrial": {
+        "tipo_proceso_productivo": ["Manual/Artesanal", "Semi-mecanizado", "Mecanizado", "Automatizado"],
+        "tipo_maquinaria_principal": ["Herramientas Manuales", "Maquinaria Eléctrica Portátil", "Robots/CNC"],
+        "escala_produccion": ["Unitaria/Por Pedido", "Pequeña Serie", "Mediana Serie", "Gran Serie", "Producción Continua"],
+        "trabaja_materiales_explosivos": BOOL,
+        "tipo_producto_fabricado": ["Artesanía/Manualidades", "Productos Industriales Generales", "Explosivos",
+                                    "Pirotécnicos", "Municiones", "Textiles"],
+        "nivel_peligrosidad_insumos": ["Bajo (no inflamables)", "Medio (inflamables Clase IIIA)",
+                                       "Alto (inflamables Clase I-II)", "Muy Alto (explosivos/reactivos)"],
+        "area_produccion_m2": ["<50", "50-200", "200-1000", "1000-5000", ">5000"],
+        "numero_trabajadores": ["1-5", "6-10", "11-50", "51-200", ">200"],
+        "tiene_area_comercializacion_integrada": BOOL,
+        "tipo_establecimiento": ["Taller Artesanal", "Taller Industrial", "Fábrica de Explosivos", "Planta Industrial"]
+    },
+    "oficinas": {
+        "numero_pisos_edificacion": ["1", "2", "3", "4", "5-10", "11-20", ">20"],
+        "area_techada_por_piso_m2": ["<200", "200-400", "400-560", "560-1000", "1000-2500", ">2500"],
+        "area_techada_total_m2": ["<500", "500-2000", "2000-5000", "5000-15000", ">15000"],
+        "año_conformidad_obra": _entero(1990, 2025),
+        "antigüedad_conformidad_años": ["0-1", "2-3", "4-5", ">5"],
+        "tiene_conformidad_obra_vigente": BOOL,
+        "tipo_conformidad": ["Obra Nueva", "Remodelación", "Ampliación"],
+        "tipo_ocupacion_edificio": ["Uso Exclusivo", "Uso Compartido"],
+        "areas_comunes_tienen_itse_vigente": ["Sí", "No", "No Aplica"],
+        "piso_ubicacion_establecimiento": ["PB", "1", "2", "3"],
+        "uso_diseño_original": ["Oficinas desde origen", "Adaptado a oficinas"],
+        "ha_tenido_remodelaciones_ampliaciones": BOOL
+    },
+    "comercio": {
+        "numero_pisos_edificacion": ["1", "2", "3", "4", "5-10", ">10"],
+        "area_techada_total_m2": ["<300", "300-750", "750-2000", "2000-10000", ">10000"],
+        "area_venta_m2": ["<200", "200-500", "500-1500", "1500-5000", ">5000"],
+        "tipo_establecimiento_comercial": ["Tienda Individual", "Módulo en galería", "Stand", "Puesto de mercado",
+                                           "Supermercado", "Centro Comercial", "Mercado Minorista"],
+        "modalidad_operacion": ["Independiente", "Módulo", "Franquicia"],
+        "uso_edificacion": ["Comercial Exclusivo", "Mixto", "Con Áreas Comunes"],
+        "tipo_licencia_funcionamiento": ["Individual", "Corporativa (galería/mercado)"],
+        "edificio_tiene_licencia_corporativa": ["Sí", "No"],
+        "comercializa_productos_explosivos_pirotecnicos": BOOL,
+        "tipo_productos_peligrosos": ["Ninguno", "Explosivos", "Pirotécnicos", "Pólvora", "Fuegos artificiales"],
+        "formato_comercial": ["Tienda pequeña", "Gran formato"],
+        "numero_locales_comerciales_edificio": ["1", "2-5", "6-20", "21-100", ">100"]
+    },
+    "almacen": {
+        "tipo_cobertura": ["No Techado", "Parcialmente Techado", "Totalmente Techado"],
+        "porcentaje_area_techada": ["0%", "1-25%", "26-50%", "51-75%", "76-99%", "100%"],
+        "tipo_cerramiento": ["Abierto", "Semi-abierto (muros parciales)", "Cerrado (muros completos)"],
+        "tipo_establecimiento": ["Almacén General", "Depósito", "Playa vehicular"],
+        "uso_principal": ["Almacenamiento de mercancías", "Estacionamiento"],
+        "almacena_productos_explosivos_pirotecnicos": BOOL,
+        "tipo_productos_almacenados": ["Ninguno (vacío/vehículos)", "Mercancía general", "Explosivos", "Pólvora"],
+        "nivel_peligrosidad_nfpa": ["0 (mínimo)", "1 (ligero)", "2 (moderado)", "3 (serio)", "4 (severo)"],
+        "tiene_areas_administrativas_techadas": BOOL,
+        "area_administrativa_servicios_m2": ["0", "1-50", "51-200", "201-500", ">500"]
+    }
+}
+
+
+def generar(funcion: str, n: int, semilla: int = 0) -> List[Dict]:
+    """n registros crudos (dicts) de la función, reproducibles con `semilla`."""
+    rng = random.Random(semilla)
+    campos = CAMPOS[funcion]
+    return [
+        {campo: (opciones(rng) if callable(opciones) else rng.choice(opciones)) for campo, opciones in campos.items()}
+        for _ in range(n)
+    ]
+
+def generar_modelos(funcion: str, n: int, semilla: int = 0) -> list:
+    """Como `generar`, pero ya validados como Funcion*Input."""
+    esquema = ESQUEMAS[funcion]
+    return [esquema(**registro) for registro in generar(funcion, n, semilla)]
+
+
+# === Distribuciones de entrenar_*.py ===
+# Cada muestreador reproduce el bucle de su script de entrenamiento hasta los
+# valores crudos (antes de codificar) y los devuelve con la forma del
+# Funcion*Input. salud genera códigos en el script: aquí se traducen de
+# vuelta a los textos que aceptan los mapas de src/feature_maps.py.
+def _elegir(rng: np.random.Generator, opciones: list, p: list = None):
+    return opciones[rng.choice(len(opciones), p=p)]
+
+def _si(rng: np.random.Generator, p_si: float) -> bool:
+    return bool(rng.random() < p_si)
+
+_SALUD_TIPOS = {
+    1: ["Puesto", "Posta"],
+    2: ["Consultorio", "Consultorio médico"],
+    3: ["Centro de salud", "Centro médico", "Policlínico", "Centro médico especializado"],
+    4: ["Hospital general"],
+    5: ["Hospital especializado"],
+    6: ["Instituto"],
+    7: ["Clínica móvil", "Hospital naval", "Unidad comunitaria", "Centro geriátrico", "Dispensario"]
+}
+_SALUD_SERVICIOS = ["Urgencias", "Laboratorio", "Farmacia", "Radiología", "UCI"]
+
+def _muestra_salud(rng: np.random.Generator) -> Dict:
+    clase = _elegir(rng, ["I-1", "I-2", "I-3", "I-4", "II", "III"], [0.18, 0.18, 0.18, 0.14, 0.18, 0.14])
+    u, r, e = rng.uniform, lambda a, b: int(rng.integers(a, b)), lambda o: _elegir(rng, o)
+    if rng.random() < 0.08:  # "Otros"
+        tipo = 7
+        nivel, camas, no_autosuf, capacidad, servicios, urg24, esp, pisos, area, personal = {
+            "I-1": lambda: (1, 0, False, e([1, 2]), r(1, 3), False, 0, 1, u(50, 200), r(1, 5)),
+            "I-2": lambda: (1, 0, _si(rng, 0.3), e([1, 2]), r(1, 3), False, 0, 1, u(50, 200), r(1, 5)),
+            "I-3": lambda: (1, 0, True, 3, r(2, 5), True, 1, e([1, 2]), u(300, 1500), r(5, 20)),
+            "I-4": lambda: (1, e([1, 2]), True, 3, r(3, 5), True, 1, 2, u(800, 2500), r(10, 30)),
+            "II": lambda: (2, e([2, 3]), True, 3, 4, True, 1, e([2, 3]), u(2000, 8000), r(20, 100)),
+            "III": lambda: (3, 3, True, 3, 5, True, 2, 3, u(5000, 20000), r(50, 300))
+        }[clase]()
+    else:
+        nivel, tipo, camas, no_autosuf, capacidad, servicios, urg24, esp, pisos, area, personal = {
+            "I-1": lambda: (1, 1, 0, False, e([1, 2]), r(0, 2), False, 0, 1, u(40, 100), r(1, 3)),
+            "I-2": lambda: (1, 2, 0, False, e([2, 3]), r(1, 3), _si(rng, 0.3), 0, 1, u(60, 120), 1),
+            "I-3": lambda: (1, 3, 0, True, 3, r(2, 5), True, 1, e([1, 2]), u(500, 1500), r(8, 20)),
+            "I-4": lambda: (1, 3, e([1, 2]), True, 3, r(3, 5), True, 1, 2, u(1000, 2500), r(15, 30)),
+            "II": lambda: (2, 4, e([2, 3]), True, 3, 4, True, 1, e([2, 3]), u(3000, 8000), r(40, 100)),
+            "III": lambda: (3, e([5, 6]), 3, True, 3, 5, True, 2, 3, u(8000, 20000), r(100, 300))
+        }[clase]()
+    return {
+        "nivel_atencion": ["Primer", "Segundo", "Tercer"][nivel - 1],
+        "tipo_establecimiento": e(_SALUD_TIPOS[tipo]),
+        "camas_internamiento": ["0", "1-10", "11-50", ">50"][camas],
+        "usuarios_no_autosuficientes": no_autosuf,
+        "capacidad_atencion": ["Baja", "Media", "Alta"][capacidad - 1],
+        "servicios_disponibles": [_SALUD_SERVICIOS[i] for i in sorted(rng.choice(5, servicios, replace=False))],
+        "urgencias_24h": urg24,
+        "num_especialidades": ["0", "1-5", ">5"][esp],
+        "num_pisos": ["1", "2", ">3"][pisos - 1],
+        "area_construida": round(float(area), 1),
+        "personal_medico_total": personal
+    }
+
+_ENCUENTRO_2_4 = [
+    "discoteca", "casino", "tragamonedas", "teatro", "cine", "sala_concierto", "anfiteatro", "auditorio",
+    "centro_convenciones", "club", "estadio", "plaza_toro", "coliseo", "hipodromo", "velodromo", "autodromo",
+    "polideportivo", "parque_diversion", "zoologico", "templo", "iglesia"
+]
+
+def _muestra_encuentro(rng: np.random.Generator) -> Dict:
+    r = rng.random()
+    if r < 0.55:
+        tipo, es_2_4 = _elegir(rng, _ENCUENTRO_2_4), True
+    elif r < 0.85:
+        tipo, es_2_4 = _elegir(rng, ["salon_eventos", "auditorio_escolar", "comunidad", "salon_comunal",
+                                     "gimnasio", "biblioteca"]), False
+    else:
+        tipo, es_2_4 = _elegir(rng, ["arena_virtual", "centro_espiritual", "lounge_ejecutivo",
+                                     "parque_tecnologico", "museo_interactivo", "centro_cultural"]), False
+    return {
+        "tipo_actividad": tipo,
+        "carga_ocupantes": int(rng.integers(10, 600)),
+        "ubicado_en_sotano": _si(rng, 0.15),
+        "num_pisos": int(rng.integers(1, 7)),
+        "area_total_m2": round(float(rng.uniform(50, 12000)), 1),
+        "evento_recurrente": es_2_4 or bool(rng.random() > 0.4),
+        "horario_funcionamiento": _elegir(rng, ["diurno", "nocturno", "mixto"])
+    }
+
+def _muestra_hospedaje(rng: np.random.Generator) -> Dict:
+    tiene_estacionamiento = _si(rng, 0.6)
+    return {
+        "categoria_estrellas": _elegir(rng, [0, 1, 2, 3, 4, 5], [0.1, 0.2, 0.25, 0.25, 0.1, 0.1]),
+        "tipo_hospedaje": _elegir(rng, ["hotel", "hostal", "albergue", "ecolodge", "apart_hotel"]),
+        "num_pisos": int(rng.integers(1, 10)),
+        "tiene_sotano": _si(rng, 0.3),
+        "num_habitaciones": int(rng.integers(5, 300)),
+        "capacidad_ocupantes": int(rng.integers(10, 800)),
+        "uso_mixto": _si(rng, 0.4),
+        "tiene_estacionamiento": tiene_estacionamiento,
+        "estacionamiento_en_sotano": tiene_estacionamiento and _si(rng, 0.7)
+    }
+
+def _rango(valor: float, limites: list, etiquetas: list) -> str:
+    """Etiqueta del primer límite que `valor` no supera (la última si supera todos)."""
+    for limite, etiqueta in zip(limites, etiquetas):
+        if valor < limite:
+            return etiqueta
+    return etiquetas[-1]
+
+def _muestra_educacion(rng: np.random.Generator) -> Dict:
+    nivel = _elegir(rng, [
+        "Inicial", "Primaria", "Secundaria", "Superior Técnico", "Superior Universitario",
+        "Bachillerato Internacional", "Centro de idiomas", "Academia técnica", "Escuela vocacional"
+    ], [0.18, 0.18, 0.18, 0.12, 0.12, 0.07, 0.05, 0.05, 0.05])
+    institucion = _elegir(rng, [
+        "CEBE", "Colegio Regular", "Instituto", "Escuela Superior", "Centro Superior", "Universidad",
+        "Academia privada", "Centro cultural", "Institución técnica", "Colegio internacional"
+    ], [0.12, 0.20, 0.12, 0.10, 0.10, 0.12, 0.06, 0.04, 0.08, 0.06])
+    pisos = int(rng.integers(1, 13))
+    area = rng.uniform(100, 25000)
+    discapacidad = (
+        (institucion == "CEBE" and rng.random() > 0.3) or
+        (institucion == "Colegio Regular" and rng.random() > 0.7) or
+        bool(rng.random() > 0.85)
+    )
+    superior = "Superior" in nivel or institucion in ["Universidad", "Instituto", "Escuela Superior", "Centro Superior"]
+    capacidad = int(rng.integers(200, 5000)) if superior else int(rng.integers(30, 1500))
+    return {
+        "nivel_educativo": nivel,
+        "tipo_institucion": institucion,
+        "numero_pisos": str(pisos) if pisos <= 5 else ("6-10" if pisos <= 10 else ">10"),
+        "area_construida_m2": _rango(area, [500, 1500, 5000, 15000], ["<500", "500-1500", "1500-5000", "5000-15000", ">15000"]),
+        "atiende_personas_discapacidad": discapacidad,
+        "capacidad_alumnos": _rango(capacidad, [100, 300, 800, 2000], ["<100", "100-300", "300-800", "800-2000", ">2000"]),
+        "cantidad_aulas": int(rng.integers(5, 120)),
+        "tipo_edificacion": _elegir(rng, ["Construida como Educativa", "Remodelada/Acondicionada para Educación"],
+                                    [0.75, 0.25])
+    }
+
+def _muestra_industrial(rng: np.random.Generator) -> Dict:
+    proceso = _elegir(rng, [
+        "Manual/Artesanal", "Semi-mecanizado", "Mecanizado", "Automatizado", "Altamente Automatizado",
+        "Artesanal digital", "Fabricación aditiva"
+    ], [0.3, 0.2, 0.2, 0.15, 0.1, 0.03, 0.02])
+    maquinaria = _elegir(rng, [
+        "Herramientas Manuales", "Maquinaria Eléctrica Portátil", "Maquinaria Industrial Fija", "Línea de Producción",
+        "Robots/CNC", "Impresora 3D", "Equipo especializado"
+    ], [0.25, 0.25, 0.2, 0.15, 0.1, 0.03, 0.02])
+    escala = _elegir(rng, ["Unitaria/Por Pedido", "Pequeña Serie", "Mediana Serie", "Gran Serie", "Producción Continua"],
+                     [0.3, 0.25, 0.2, 0.15, 0.1])
+    producto = _elegir(rng, [
+        "Artesanía/Manualidades", "Productos Industriales Generales", "Explosivos", "Pirotécnicos", "Municiones",
+        "Materiales Relacionados Explosivos", "Componentes electrónicos", "Textiles"
+    ], [0.25, 0.3, 0.1, 0.1, 0.08, 0.07, 0.05, 0.05])
+    explosivos = any(p in producto.lower() for p in ["explosivo", "pirotécnico"]) or bool(rng.random() > 0.9)
+    peligrosidad = _elegir(rng, [
+        "Bajo (no inflamables)", "Medio (inflamables Clase IIIA)", "Alto (inflamables Clase I-II)",
+        "Muy Alto (explosivos/reactivos)"
+    ], [0.4, 0.3, 0.2, 0.1])
+    area = _elegir(rng, ["<50", "50-200", "200-1000", "1000-5000", ">5000"], [0.25, 0.3, 0.25, 0.15, 0.05])
+    trabajadores = _elegir(rng, ["1-5", "6-10", "11-50", "51-200", ">200"], [0.3, 0.25, 0.25, 0.15, 0.05])
+    comercializacion = (
+        "artesanal" in proceso.lower() or "manual" in maquinaria.lower() or bool(rng.random() > 0.7)
+    )
+    establecimiento = _elegir(rng, [
+        "Taller Artesanal", "Taller Industrial", "Planta Industrial", "Fábrica", "Fábrica de Explosivos",
+        "Fábrica de Pirotécnicos", "Centro de fabricación", "Laboratorio de producción"
+    ], [0.25, 0.2, 0.2, 0.15, 0.08, 0.07, 0.03, 0.02])
+    return {
+        "tipo_proceso_productivo": proceso,
+        "tipo_maquinaria_principal": maquinaria,
+        "escala_produccion": escala,
+        "trabaja_materiales_explosivos": explosivos,
+        "tipo_producto_fabricado": producto,
+        "nivel_peligrosidad_insumos": peligrosidad,
+        "area_produccion_m2": area,
+        "numero_trabajadores": trabajadores,
+        "tiene_area_comercializacion_integrada": comercializacion,
+        "tipo_establecimiento": establecimiento
+    }
+
+def _muestra_oficinas(rng: np.random.Generator) -> Dict:
+    pisos = _elegir(rng, ["1", "2", "3", "4", "5-10", "11-20", ">20"], [0.2, 0.2, 0.2, 0.15, 0.1, 0.08, 0.07])
+    por_piso = _elegir(rng, ["<200", "200-400", "400-560", "560-1000", "1000-2500", ">2500"],
+                       [0.25, 0.25, 0.2, 0.15, 0.1, 0.05])
+    total = _elegir(rng, ["<500", "500-2000", "2000-5000", "5000-15000", ">15000"], [0.2, 0.3, 0.25, 0.15, 0.1])
+    año = int(rng.integers(2015, 2026))
+    antigüedad = _rango(2025 - año, [2, 4, 6, 11], ["0-1", "2-3", "4-5", "6-10", ">10"])
+    vigente = _si(rng, 0.8)
+    conformidad = _elegir(rng, ["Obra Nueva", "Remodelación", "Ampliación", "Cambio de Giro", "Sin Conformidad"],
+                          [0.3, 0.25, 0.2, 0.15, 0.1])
+    ocupacion = _elegir(rng, ["Uso Exclusivo (todo el edificio)", "Uso Compartido (piso/área específica)"], [0.4, 0.6])
+    itse = "No Aplica (uso exclusivo)" if "Exclusivo" in ocupacion else _elegir(rng, ["Sí", "No"], [0.6, 0.4])
+    return {
+        "numero_pisos_edificacion": pisos,
+        "area_techada_por_piso_m2": por_piso,
+        "area_techada_total_m2": total,
+        "año_conformidad_obra": año,
+        "antigüedad_conformidad_años": antigüedad,
+        "tiene_conformidad_obra_vigente": vigente,
+        "tipo_conformidad": conformidad,
+        "tipo_ocupacion_edificio": ocupacion,
+        "areas_comunes_tienen_itse_vigente": itse,
+        "piso_ubicacion_establecimiento": _elegir(rng, ["PB", "1", "2", "3", "4", "5-10", ">10", "Todo el edificio"],
+                                                  [0.15, 0.15, 0.15, 0.15, 0.1, 0.1, 0.1, 0.1]),
+        "uso_diseño_original": _elegir(rng, ["Oficinas desde origen", "Adaptado a oficinas"], [0.6, 0.4]),
+        "ha_tenido_remodelaciones_ampliaciones": _si(rng, 0.3)
+    }
+
+def _muestra_comercio(rng: np.random.Generator) -> Dict:
+    pisos = _elegir(rng, ["1", "2", "3", "4", "5-10", ">10"], [0.25, 0.25, 0.2, 0.1, 0.1, 0.1])
+    total = _elegir(rng, ["<300", "300-750", "750-2000", "2000-10000", ">10000"], [0.2, 0.25, 0.25, 0.2, 0.1])
+    venta = _elegir(rng, ["<200", "200-500", "500-1500", "1500-5000", ">5000"], [0.25, 0.25, 0.25, 0.15, 0.1])
+    establecimiento = _elegir(rng, [
+        "Tienda Individual", "Módulo/Stand/Puesto", "Mercado Minorista", "Mercado Mayorista", "Supermercado",
+        "Tienda por Departamentos", "Galería Comercial", "Centro Comercial", "Complejo Comercial",
+        "Tienda especializada", "Local de servicios"
+    ], [0.2, 0.15, 0.1, 0.08, 0.12, 0.08, 0.07, 0.08, 0.07, 0.03, 0.02])
+    modalidad = _elegir(rng, ["Independiente", "Módulo en edificio corporativo", "Áreas comunes edificio mixto"],
+                        [0.5, 0.3, 0.2])
+    uso = _elegir(rng, ["Comercial Exclusivo", "Mixto (comercio + vivienda/oficina)", "Solo Áreas Comunes"],
+                  [0.4, 0.4, 0.2])
+    licencia = _elegir(rng, ["Individual", "Corporativa (galería/mercado)", "Sin licencia"], [0.6, 0.3, 0.1])
+    if any(p in establecimiento for p in ["Módulo", "Galería", "Centro Comercial"]):
+        licencia_edificio = _elegir(rng, ["Sí", "No"], [0.7, 0.3])
+    else:
+        licencia_edificio = "No Aplica (establecimiento independiente)"
+    productos = _elegir(rng, [
+        "Ninguno", "Explosivos", "Pirotécnicos", "Municiones", "Materiales relacionados", "Inflamables Clase I-II",
+        "Productos generales"
+    ], [0.7, 0.05, 0.05, 0.04, 0.03, 0.08, 0.05])
+    explosivos = productos in ["Explosivos", "Pirotécnicos", "Municiones", "Materiales relacionados"] or bool(rng.random() > 0.95)
+    return {
+        "numero_pisos_edificacion": pisos,
+        "area_techada_total_m2": total,
+        "area_venta_m2": venta,
+        "tipo_establecimiento_comercial": establecimiento,
+        "modalidad_operacion": modalidad,
+        "uso_edificacion": uso,
+        "tipo_licencia_funcionamiento": licencia,
+        "edificio_tiene_licencia_corporativa": licencia_edificio,
+        "comercializa_productos_explosivos_pirotecnicos": explosivos,
+        "tipo_productos_peligrosos": productos,
+        "formato_comercial": _elegir(rng, [
+            "Tienda pequeña", "Tienda mediana", "Gran superficie (>2500 m²)", "Hipermercado", "Mall/Centro Comercial",
+            "Local independiente"
+        ], [0.3, 0.25, 0.15, 0.1, 0.15, 0.05]),
+        "numero_locales_comerciales_edificio": _elegir(rng, ["1", "2-5", "6-20", "21-100", ">100"],
+                                                       [0.3, 0.25, 0.2, 0.15, 0.1])
+    }
+
+def _muestra_almacen(rng: np.random.Generator) -> Dict:
+    cobertura = _elegir(rng, ["No Techado", "Parcialmente Techado", "Totalmente Techado", "Cerrado y Techado"],
+                        [0.25, 0.2, 0.3, 0.25])
+    techado = _elegir(rng, ["0%", "1-25%", "26-50%", "51-75%", "76-99%", "100%"], [0.2, 0.15, 0.15, 0.15, 0.15, 0.2])
+    cerramiento = _elegir(rng, [
+        "Abierto", "Semi-abierto (muros parciales)", "Cerrado (muros completos)", "Con climatización"
+    ], [0.25, 0.25, 0.3, 0.2])
+    establecimiento = _elegir(rng, [
+        "Almacén General", "Depósito", "Centro de Distribución", "Estacionamiento Vehicular", "Almacén Especializado",
+        "Bodega", "Terminal logístico"
+    ], [0.25, 0.2, 0.15, 0.15, 0.1, 0.1, 0.05])
+    uso = _elegir(rng, [
+        "Almacenamiento de mercancías", "Estacionamiento de vehículos", "Mixto (almacén + estacionamiento)",
+        "Depósito temporal", "Centro logístico"
+    ], [0.4, 0.25, 0.2, 0.1, 0.05])
+    productos = _elegir(rng, [
+        "Ninguno (vacío/vehículos)", "Productos no peligrosos", "Inflamables Clase IIIA (punto inflamación >60°C)",
+        "Inflamables Clase I-II (punto inflamación <60°C)", "Explosivos", "Pirotécnicos", "Municiones",
+        "Materiales relacionados explosivos", "Productos generales"
+    ], [0.3, 0.3, 0.15, 0.1, 0.04, 0.04, 0.03, 0.02, 0.02])
+    explosivos = (
+        productos in ["Explosivos", "Pirotécnicos", "Municiones", "Materiales relacionados explosivos"]
+        or bool(rng.random() > 0.95)
+    )
+    return {
+        "tipo_cobertura": cobertura,
+        "porcentaje_area_techada": techado,
+        "tipo_cerramiento": cerramiento,
+        "tipo_establecimiento": establecimiento,
+        "uso_principal": uso,
+        "almacena_productos_explosivos_pirotecnicos": explosivos,
+        "tipo_productos_almacenados": productos,
+        "nivel_peligrosidad_nfpa": _elegir(rng, ["0 (mínimo)", "1 (ligero)", "2 (moderado)", "3 (serio)", "4 (severo)"],
+                                           [0.4, 0.25, 0.2, 0.1, 0.05]),
+        "tiene_areas_administrativas_techadas": _si(rng, 0.6),
+        "area_administrativa_servicios_m2": _elegir(rng, ["0", "1-50", "51-200", "201-500", ">500"],
+                                                    [0.3, 0.25, 0.25, 0.15, 0.05])
+    }
+
+MUESTREADORES: Dict[str, Callable[[np.random.Generator], Dict]] = {
+    "salud": _muestra_salud,
+    "encuentro": _muestra_encuentro,
+    "hospedaje": _muestra_hospedaje,
+    "educacion": _muestra_educacion,
+    "industrial": _muestra_industrial,
+    "oficinas": _muestra_oficinas,
+    "comercio": _muestra_comercio,
+    "almacen": _muestra_almacen
+}
+
+
+def generar_entrenamiento(funcion: str, n: int, semilla: int = 0) -> List[Dict]:
+    """n registros crudos con las distribuciones de entrenar_<funcion>.py."""
+    rng = np.random.default_rng(semilla)
+    muestra = MUESTREADORES[funcion]
+    return [muestra(rng) for _ in range(n)]
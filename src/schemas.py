@@ -105,3 +105,15 @@ class FuncionAlmacenInput(BaseModel):
     nivel_peligrosidad_nfpa: str  # "0 (mínimo)", "1 (ligero)", etc.
     tiene_areas_administrativas_techadas: bool
     area_administrativa_servicios_m2: str  # "0", "1-50", etc.
+
+# ===== ESQUEMA DE ENTRADA POR FUNCIÓN =====
+ESQUEMAS = {
+    "salud": FuncionSaludInput,
+    "encuentro": FuncionEncuentroInput,
+    "hospedaje": FuncionHospedajeInput,
+    "educacion": FuncionEducacionInput,
+    "industrial": FuncionIndustrialInput,
+    "oficinas": FuncionOficinasInput,
+    "comercio": FuncionComercioInput,
+    "almacen": FuncionAlmacenInput
+}
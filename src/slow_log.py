@@ -0,0 +1,193 @@
+# src/slow_log.py
+"""
+Registro de peticiones lentas para reproducirlas fuera de línea.
+
+Cada POST a /funcion-* que tarda más que ML_LENTAS_UMBRAL_MS (desde que
+llega hasta el último byte de la respuesta) deja un registro con:
+- endpoint, función, estado HTTP y fecha;
+- el cuerpo tal como llegó: texto si es UTF-8 (JSON, NDJSON) o base64
+  (Arrow, matriz binaria), hasta ML_LENTAS_MAX_BYTES;
+- la matriz codificada que recibió el modelo (hasta ML_LENTAS_MAX_FILAS
+  filas) y la versión del modelo que respondió;
+- los tiempos por etapa en ns, los mismos de Server-Timing.
+
+Los registros van a un buffer circular en memoria (los últimos
+ML_LENTAS_CAPACIDAD; GET /lentas los devuelve). Si ML_LENTAS_ARCHIVO está
+definido, cada registro se agrega además como una línea JSON: ahí quedan
+también los que el buffer ya descartó. La escritura la hace un hilo aparte,
+para no sumar latencia de disco al event loop justo cuando el servicio ya
+está lento. Su cola también está acotada (ML_LENTAS_CAPACIDAD registros): si
+el disco no da abasto, los registros que no caben no se escriben y se
+cuentan en "descartadas_archivo".
+
+Para reproducir una petición: model_loader._predecir_fila(funcion,
+np.array(X, dtype=X_dtype)) con la misma versión del modelo, o volver a
+enviar el cuerpo al mismo endpoint. X_dtype es el dtype con el que el
+codificador armó la matriz; otro dtype (float32, por ejemplo) puede caer del
+otro lado de un umbral de los árboles.
+
+Con ML_MICROBATCH=1 la predicción individual corre fuera de la petición y
+X queda vacío; el cuerpo alcanza para reproducirla.
+
+Hasta decidir si la petición es lenta, el middleware solo guarda
+referencias a los trozos del cuerpo. El JSON se arma únicamente para las
+peticiones lentas.
+"""
+import base64
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.config import (
+    LENTAS_ARCHIVO, LENTAS_CAPACIDAD, LENTAS_MAX_BYTES, LENTAS_MAX_FILAS, LENTAS_UMBRAL_MS
+)
+from src.metrics import Medicion, medicion_actual
+
+
+class RegistroLentas:
+    def __init__(self, umbral_ms: float, capacidad: int, archivo: str = "",
+                 max_bytes: int = 65536, max_filas: int = 64):
+        self.umbral_ns = int(umbral_ms * 1e6)
+        self.capacidad = capacidad
+        self.archivo = archivo
+        self.max_bytes = max_bytes
+        self.max_filas = max_filas
+        self._buffer: deque = deque(maxlen=capacidad)
+        self._lock = threading.Lock()
+        self.total = 0
+        self.descartadas_archivo = 0
+        self._pendientes: queue.Queue = queue.Queue(maxsize=capacidad)
+        self._escritor: Optional[threading.Thread] = None
+
+    @property
+    def activo(self) -> bool:
+        return self.umbral_ns > 0 and self.capacidad > 0
+
+    def registrar(self, ruta: str, funcion: str, estado, trozos: List[bytes], medicion: Medicion,
+                  fin_ns: int) -> Dict:
+        cuerpo = b"".join(trozos)
+        truncado = len(cuerpo) > self.max_bytes
+        cuerpo = cuerpo[:self.max_bytes]
+        try:
+            payload, codificacion = cuerpo.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            payload, codificacion = base64.b64encode(cuerpo).decode("ascii"), "base64"
+
+        X = medicion.X
+        registro = {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "endpoint": ruta,
+            "funcion": funcion,
+            "estado": estado,
+            "version_modelo": medicion.version,
+            "tiempos_ns": medicion.desglose(fin_ns),
+            "payload": payload,
+            "payload_codificacion": codificacion,
+            "payload_truncado": truncado,
+            "X": None if X is None else np.asarray(X[:self.max_filas]).tolist(),
+            "X_filas": None if X is None else len(X),
+            "X_dtype": None if X is None else np.asarray(X).dtype.str
+        }
+        with self._lock:
+            self._buffer.append(registro)
+            self.total += 1
+            if self.archivo:
+                self._asegurar_escritor()
+        if self.archivo:
+            try:
+                self._pendientes.put_nowait(registro)
+            except queue.Full:
+                with self._lock:
+                    self.descartadas_archivo += 1
+        return registro
+
+    def _asegurar_escritor(self) -> None:
+        # Se arranca en el primer registro: bajo src/prefork.py, ya en el worker
+        if self._escritor is None or not self._escritor.is_alive():
+            self._escritor = threading.Thread(target=self._escribir, name="registro-lentas", daemon=True)
+            self._escritor.start()
+
+    def _escribir(self) -> None:
+        while True:
+            registros = [self._pendientes.get()]
+            while True:
+                try:
+                    registros.append(self._pendientes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                lineas = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in registros)
+                with open(self.archivo, "a", encoding="utf-8") as f:
+                    f.write(lineas)
+            except Exception as exc:
+                print(f"⚠️ No se pudieron escribir {len(registros)} peticiones lentas en {self.archivo}: {exc}")
+
+    def volcar(self) -> Dict:
+        with self._lock:
+            registros = list(self._buffer)
+            total = self.total
+            descartadas = self.descartadas_archivo
+        return {
+            "umbral_ms": self.umbral_ns / 1e6,
+            "capacidad": self.capacidad,
+            "archivo": self.archivo or None,
+            "total_registradas": total,
+            "descartadas_archivo": descartadas,
+            "registros": registros
+        }
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+
+
+LENTAS = RegistroLentas(LENTAS_UMBRAL_MS, LENTAS_CAPACIDAD, LENTAS_ARCHIVO, LENTAS_MAX_BYTES, LENTAS_MAX_FILAS)
+
+
+class LentasHTTP:
+    """
+    Middleware ASGI, por dentro de MetricasHTTP (usa su medición): guarda el
+    cuerpo de los POST a /funcion-* y registra las peticiones lentas.
+    """
+
+    def __init__(self, app, registro: RegistroLentas = LENTAS):
+        self.app = app
+        self.registro = registro
+
+    async def __call__(self, scope, receive, send):
+        medicion = medicion_actual()
+        if not self.registro.activo or medicion is None:
+            await self.app(scope, receive, send)
+            return
+
+        trozos: List[bytes] = []
+        guardados = 0
+        estado = None
+
+        async def recibir():
+            nonlocal guardados
+            mensaje = await receive()
+            cuerpo = mensaje.get("body")
+            if cuerpo and guardados <= self.registro.max_bytes:
+                trozos.append(cuerpo)
+                guardados += len(cuerpo)
+            return mensaje
+
+        async def enviar(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, recibir, enviar)
+        finally:
+            fin_ns = time.perf_counter_ns()
+            if fin_ns - medicion.inicio_ns >= self.registro.umbral_ns:
+                funcion = scope["path"][len("/funcion-"):].partition("/")[0]
+                self.registro.registrar(scope["path"], funcion, estado, trozos, medicion, fin_ns)
@@ -0,0 +1,155 @@
+# src/warmup.py
+"""
+Calentamiento al arrancar y estado de preparación (GET /health/ready).
+
+Las primeras peticiones después de un despliegue pagan costos de primera
+llamada: la carga del modelo, la importación perezosa de partes de
+sklearn/NumPy, el armado de los validadores de pydantic y los memos de las
+reglas del codificador, y una caché LRU vacía. Calentamiento los paga antes
+de que la réplica se declare lista. Primero carga en paralelo los modelos
+que falten (REGISTRY.cargar_todas) y después, por cada función habilitada:
+1. pasa ML_CALENTAR_FILAS registros con la distribución de entrenar_*.py
+   (src/sample_payloads.generar_entrenamiento) por el camino individual:
+   pydantic -> codificador por fila -> tabla -> predict_proba;
+2. pasa los mismos registros por el camino /batch: validación por columnas,
+   codificador por lotes, tabla y una sola predicción;
+3. predice filas de data/raw/dataset_<funcion>.csv, que ya están
+   codificadas en el orden de entrenamiento: cada fila sola y todas juntas
+   como lote. Si el CSV no está en la imagen, este paso se omite.
+
+Llama directamente a los codificadores y a la tabla y el predictor del modelo
+cargado: no pasa por la caché LRU ni por las métricas, así que /cache/stats y
+/metrics reflejan solo tráfico real.
+
+Una función cuyo modelo no carga queda con su error en el informe. Las
+demás se calientan igual y la réplica queda lista para ellas. Si el
+calentamiento se interrumpe por otra causa, el error queda en el informe y la
+réplica se declara lista igual: los modelos que falten se cargan en su primer
+uso.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src import model_loader
+from src.config import CALENTAR_FILAS
+from src.batch_validation import VALIDADORES
+from src.feature_spec import CODIFICADORES
+from src.model_registry import ModeloCargado, ModeloNoDisponible
+from src.sample_payloads import generar_entrenamiento
+
+RUTA_DATASET = os.path.join("data", "raw", "dataset_{funcion}.csv")
+
+
+def _filas_dataset(funcion: str, n: int, dtype) -> Optional[np.ndarray]:
+    """Primeras n filas del dataset, con el dtype que produce el codificador."""
+    ruta = RUTA_DATASET.format(funcion=funcion)
+    if not os.path.exists(ruta):
+        return None
+    df = pd.read_csv(ruta, nrows=n)
+    return df.drop(columns="subfuncion").to_numpy(dtype=dtype)
+
+
+def _predecir(cargado: ModeloCargado, X: np.ndarray) -> None:
+    if cargado.tabla is not None:
+        if len(X) == 1:
+            cargado.tabla.buscar(X[0])
+        else:
+            cargado.tabla.buscar_lote(X)
+    cargado.predictor.predict_proba(X)
+
+
+def calentar_funcion(funcion: str, filas: int) -> Dict:
+    """Calienta una función; devuelve tiempos (ms) y filas usadas."""
+    cargado = model_loader.REGISTRY.obtener(funcion)
+    codificador = CODIFICADORES[funcion]
+    inicio = time.perf_counter()
+
+    registros = generar_entrenamiento(funcion, filas, 0)
+    esquema = VALIDADORES[funcion].esquema
+    for registro in registros:
+        X = codificador.fila(esquema.model_validate(registro))
+        _predecir(cargado, X)
+    columnas, _, _ = VALIDADORES[funcion].validar(registros)
+    _predecir(cargado, codificador.lote(columnas))
+
+    dataset = _filas_dataset(funcion, filas, X.dtype)
+    if dataset is not None:
+        for i in range(len(dataset)):
+            _predecir(cargado, dataset[i:i + 1])
+        _predecir(cargado, dataset)
+    fin = time.perf_counter()
+
+    return {
+        "carga_ms": round(cargado.tiempo_carga_s * 1000, 1),
+        "calentamiento_ms": round((fin - inicio) * 1000, 1),
+        "registros": len(registros),
+        "filas_dataset": 0 if dataset is None else len(dataset)
+    }
+
+
+class Calentamiento:
+    """Estado del calentamiento: pendiente -> en_curso -> listo."""
+
+    def __init__(self, filas: int):
+        self.filas = filas
+        self.estado = "pendiente"
+        self.funciones: Dict[str, Dict] = {}
+        self.duracion_s: Optional[float] = None
+        self.error: Optional[str] = None
+        self._hilo: Optional[threading.Thread] = None
+
+    @property
+    def listo(self) -> bool:
+        return self.estado == "listo"
+
+    def ejecutar(self) -> None:
+        self.estado = "en_curso"
+        inicio = time.perf_counter()
+        try:
+            model_loader.REGISTRY.cargar_todas(silencioso=True)
+            for funcion in model_loader.REGISTRY.habilitadas:
+                try:
+                    self.funciones[funcion] = calentar_funcion(funcion, self.filas)
+                except ModeloNoDisponible as exc:
+                    self.funciones[funcion] = {"error": str(exc)}
+                    print(f"❌ {funcion.upper()} sin calentar: {exc}")
+                except Exception as exc:
+                    # Falló el calentamiento, no el modelo: la función sigue sirviendo
+                    self.funciones[funcion] = {"error": f"calentamiento fallido: {exc}"}
+                    print(f"⚠️ Calentamiento de {funcion.upper()} fallido: {exc}")
+        except Exception as exc:
+            self.error = f"calentamiento interrumpido: {exc!r}"
+            print(f"❌ Calentamiento interrumpido: {exc!r}")
+        finally:
+            # Nunca queda en_curso: /health/ready no puede quedar en 503 para siempre
+            self.duracion_s = round(time.perf_counter() - inicio, 2)
+            self.estado = "listo"
+        if self.error is None:
+            print(f"✅ Calentamiento terminado en {self.duracion_s:.1f} s")
+
+    def iniciar_en_segundo_plano(self) -> threading.Thread:
+        """Calienta en un hilo: el puerto atiende /health/live mientras tanto."""
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self.ejecutar, name="calentamiento", daemon=True)
+            self._hilo.start()
+        return self._hilo
+
+    def marcar_listo(self) -> None:
+        """Sin calentamiento (ML_CALENTAR=0): lista desde el arranque."""
+        self.estado = "listo"
+
+    def informe(self) -> Dict:
+        return {
+            "estado": self.estado,
+            "duracion_s": self.duracion_s,
+            "error": self.error,
+            "funciones": dict(self.funciones)
+        }
+
+
+CALENTAMIENTO = Calentamiento(CALENTAR_FILAS)
@@ -0,0 +1,46 @@
+# verificar_batch_scoring.py
+# Comprueba que una celda de lista con JSON roto en un CSV no detiene
+# src/batch_scoring.py: esa fila sale con su error y las demás con predicción.
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from src.batch_scoring import puntuar_archivo
+from src.sample_payloads import generar
+
+FILAS = 10
+FILA_ROTA = 2
+
+registros = generar("salud", FILAS, 0)
+df = pd.DataFrame(registros)
+df["servicios_disponibles"] = [json.dumps(s, ensure_ascii=False) for s in df["servicios_disponibles"]]
+df.loc[FILA_ROTA, "servicios_disponibles"] = '[Laboratorio, "UCI"]'
+
+with tempfile.TemporaryDirectory() as directorio:
+    entrada = os.path.join(directorio, "salud.csv")
+    salida = os.path.join(directorio, "resultados.csv")
+    df.to_csv(entrada, index=False)
+    reporte = puntuar_archivo("salud", entrada, salida, tamaño_bloque=4, workers=1)
+    resultado = pd.read_csv(salida)
+
+todo_ok = True
+con_error = resultado[resultado["error"].notna()]
+if reporte["filas"] != FILAS or len(resultado) != FILAS:
+    print(f"❌ Se esperaban {FILAS} filas de salida, hay {len(resultado)}")
+    todo_ok = False
+if con_error["fila"].tolist() != [FILA_ROTA]:
+    print(f"❌ Filas con error: {con_error['fila'].tolist()} (se esperaba solo la {FILA_ROTA})")
+    todo_ok = False
+elif "servicios_disponibles" not in con_error["error"].iloc[0]:
+    print(f"❌ El error no nombra el campo: {con_error['error'].iloc[0]!r}")
+    todo_ok = False
+if resultado.drop(index=con_error.index)["subfuncion"].isna().any():
+    print("❌ Hay filas válidas sin predicción")
+    todo_ok = False
+
+if not todo_ok:
+    raise SystemExit("❌ Una celda inválida afectó al resto del archivo")
+print(f"📋 {con_error['error'].iloc[0]}")
+print(f"✅ {FILAS - 1} de {FILAS} filas con predicción; la celda inválida solo marca su fila")
@@ -0,0 +1,56 @@
+# verificar_motor_plano.py
+# Comprueba que el motor FlatForest (ML_BACKEND=flat) da exactamente las mismas
+# probabilidades que predict_proba de sklearn sobre los datasets de entrenamiento.
+import glob
+import os
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.forest_engine import FlatForest
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+todo_ok = True
+for ruta_modelo in sorted(glob.glob(os.path.join("models", "rf_*.pkl"))):
+    funcion = os.path.basename(ruta_modelo)[len("rf_"):-len(".pkl")]
+    ruta_dataset = os.path.join("data", "raw", f"dataset_{funcion}.csv")
+    if not os.path.exists(ruta_dataset):
+        print(f"⚠️  {funcion}: sin dataset {ruta_dataset}, se omite")
+        continue
+
+    modelo = joblib.load(ruta_modelo)
+    X = pd.read_csv(ruta_dataset).drop(columns="subfuncion").to_numpy()
+
+    inicio = time.perf_counter()
+    motor = FlatForest(modelo)
+    t_export = time.perf_counter() - inicio
+
+    esperado = modelo.predict_proba(X)
+    obtenido = motor.predict_proba(X)
+    iguales = np.array_equal(esperado, obtenido)
+    todo_ok &= iguales
+
+    fila = X[:1]
+    inicio = time.perf_counter()
+    for _ in range(20):
+        modelo.predict_proba(fila)
+    t_sklearn = (time.perf_counter() - inicio) / 20
+    inicio = time.perf_counter()
+    for _ in range(200):
+        motor.predict_proba(fila)
+    t_flat = (time.perf_counter() - inicio) / 200
+
+    estado = "✅" if iguales else "❌"
+    print(
+        f"{estado} {funcion:<11} {len(X):>5} filas | nodos {motor.n_nodes:>6} | "
+        f"export {t_export * 1000:6.1f} ms | 1 fila: sklearn {t_sklearn * 1000:.2f} ms, "
+        f"flat {t_flat * 1000:.3f} ms"
+    )
+
+if not todo_ok:
+    raise SystemExit("❌ El motor plano NO coincide con predict_proba")
+print("✅ Motor plano idéntico a predict_proba en todos los datasets")